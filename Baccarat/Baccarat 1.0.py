@@ -11,6 +11,9 @@ Includes:
 """
 
 import pygame, sys, random, time
+from cards import (RANKS, SUITS, build_shoe, hand_total,
+                   is_perfect_pair, is_any_pair, is_player_pair, is_banker_pair)
+from rules import baccarat_round, winner
 
 # --- CONFIG ---
 WIDTH, HEIGHT = 1280, 780
@@ -30,17 +33,12 @@ PAYOUTS = {
     'Banker Pair': 11.0,
 }
 
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Baccarat — Full Functional UI")
-clock = pygame.time.Clock()
-FONT = pygame.font.SysFont("arial", 20, bold=True)
-SMALL = pygame.font.SysFont("arial", 16)
-BIG = pygame.font.SysFont("arial", 44, bold=True)
+screen = clock = None          # opened by init_display()
+FONT = SMALL = BIG = None
+CARDS, CARD_BACK = [], None
 
 SUIT_SYMBOLS = {"C":"♣","D":"♦","H":"♥","S":"♠"}
 SUIT_COLORS = {"C": (0,0,0),"S": (0,0,0),"D": (220,20,60),"H": (220,20,60)}
-RANKS = ["A","2","3","4","5","6","7","8","9","10","J","Q","K"]
 
 def make_card(rank,suit):
     surf = pygame.Surface((CARD_W,CARD_H),pygame.SRCALPHA)
@@ -60,43 +58,21 @@ def make_back():
         pygame.draw.line(surf,(60,150,70),(10,y),(CARD_W-10,y),2)
     return surf
 
-CARDS = {r+s: make_card(r,s) for r in RANKS for s in SUIT_SYMBOLS}
-CARD_BACK = make_back()
+def init_display():
+    """Open the window, load the fonts and render the card art; run before anything is drawn."""
+    global screen, clock, FONT, SMALL, BIG, CARDS, CARD_BACK
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Baccarat — Full Functional UI")
+    clock = pygame.time.Clock()
+    FONT = pygame.font.SysFont("arial", 20, bold=True)
+    SMALL = pygame.font.SysFont("arial", 16)
+    BIG = pygame.font.SysFont("arial", 44, bold=True)
+    CARDS = [make_card(r,s) for r in RANKS for s in SUITS]   # indexed by card code
+    CARD_BACK = make_back()
 
 # --- GAME LOGIC ---
-def build_deck(): return [r+s for r in RANKS for s in SUIT_SYMBOLS]*TOTAL_DECKS
-def card_value(c): r=c[:-1]; return 0 if r in ["10","J","Q","K"] else 1 if r=="A" else int(r)
-def hand_total(h): return sum(card_value(c) for c in h)%10
-def draw_card(deck): return deck.pop()
-
-def baccarat_round(deck):
-    player=[draw_card(deck),draw_card(deck)]
-    banker=[draw_card(deck),draw_card(deck)]
-    pt,bt=hand_total(player),hand_total(banker)
-    if pt>=8 or bt>=8: return player,banker
-    player_third=None
-    if pt<=5: player_third=draw_card(deck); player.append(player_third); pt=hand_total(player)
-    if player_third is None:
-        if bt<=5: banker.append(draw_card(deck))
-    else:
-        pv=card_value(player_third)
-        if bt<=2: banker.append(draw_card(deck))
-        elif bt==3 and pv!=8: banker.append(draw_card(deck))
-        elif bt==4 and pv in [2,3,4,5,6,7]: banker.append(draw_card(deck))
-        elif bt==5 and pv in [4,5,6,7]: banker.append(draw_card(deck))
-        elif bt==6 and pv in [6,7]: banker.append(draw_card(deck))
-    return player,banker
-
-def winner(player,banker):
-    pt,bt=hand_total(player),hand_total(banker)
-    if pt>bt: return "Player"
-    if bt>pt: return "Banker"
-    return "Tie"
-
-def is_perfect_pair(hand): return len(hand)>=2 and hand[0]==hand[1]
-def is_any_pair(p,b): return (len(p)>=2 and p[0][:-1]==p[1][:-1]) or (len(b)>=2 and b[0][:-1]==b[1][:-1])
-def is_player_pair(p): return len(p)>=2 and p[0][:-1]==p[1][:-1]
-def is_banker_pair(b): return len(b)>=2 and b[0][:-1]==b[1][:-1]
+def build_deck(): return build_shoe(TOTAL_DECKS)
 
 # --- UI ---
 class Button:
@@ -311,29 +287,31 @@ class BaccaratGame:
             if r.collidepoint(pos): self.select_chip(val)
         for b in self.buttons: b.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN,{'pos':pos,'button':1}))
 
-# --- INIT GAME ---
-game=BaccaratGame()
-# Buttons
-btn_clear=Button((WIDTH-180,HEIGHT-100,160,44),"Clear Bets",game.clear_bets)
-btn_max=Button((WIDTH-180,HEIGHT-50,160,44),"Max Bet",game.max_bet)
-game.buttons=[btn_clear,btn_max]
+if __name__=="__main__":
+    # --- INIT GAME ---
+    init_display()
+    game=BaccaratGame()
+    # Buttons
+    btn_clear=Button((WIDTH-180,HEIGHT-100,160,44),"Clear Bets",game.clear_bets)
+    btn_max=Button((WIDTH-180,HEIGHT-50,160,44),"Max Bet",game.max_bet)
+    game.buttons=[btn_clear,btn_max]
 
-# --- MAIN LOOP ---
-running=True
-while running:
-    clock.tick(FPS)
-    for event in pygame.event.get():
-        if event.type==pygame.QUIT: running=False
-        elif event.type==pygame.MOUSEBUTTONDOWN and event.button==1: game.handle_click(event.pos)
-        elif event.type==pygame.KEYDOWN:
-            if event.key==pygame.K_ESCAPE: running=False
-            elif event.key==pygame.K_SPACE: game.start_deal()
-            elif event.key==pygame.K_c: game.clear_bets()
-            elif event.key==pygame.K_m: game.max_bet()
-            elif event.key in [pygame.K_1,pygame.K_2,pygame.K_3,pygame.K_4,pygame.K_5]:
-                idx=event.key-pygame.K_1; game.select_chip(CHIP_VALUES[idx])
-    game.update_animation()
-    game.draw(screen)
-    pygame.display.flip()
-pygame.quit()
-sys.exit()
+    # --- MAIN LOOP ---
+    running=True
+    while running:
+        clock.tick(FPS)
+        for event in pygame.event.get():
+            if event.type==pygame.QUIT: running=False
+            elif event.type==pygame.MOUSEBUTTONDOWN and event.button==1: game.handle_click(event.pos)
+            elif event.type==pygame.KEYDOWN:
+                if event.key==pygame.K_ESCAPE: running=False
+                elif event.key==pygame.K_SPACE: game.start_deal()
+                elif event.key==pygame.K_c: game.clear_bets()
+                elif event.key==pygame.K_m: game.max_bet()
+                elif event.key in [pygame.K_1,pygame.K_2,pygame.K_3,pygame.K_4,pygame.K_5]:
+                    idx=event.key-pygame.K_1; game.select_chip(CHIP_VALUES[idx])
+        game.update_animation()
+        game.draw(screen)
+        pygame.display.flip()
+    pygame.quit()
+    sys.exit()
@@ -1,43 +1,45 @@
-import pygame, sys, random, time
+import pygame, sys, os, time, random
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gamecore.text_cache import TEXT
+from gamecore.replay import session_args, open_log
+from gamecore.journal import Journal
+from gamecore.frame_profiler import FrameProfiler, profiler_args
+from paytable import TOTAL_DECKS, PAYOUTS, BET_AREAS, SIDE_BETS
+from cards import RANKS, SUITS, hand_total
+from rules import STANDARD, PLAYER, BANKER, TIE
+from baccarat_table import BaccaratTable, STARTING_CREDITS, CHIP_VALUES
+from shoe_provider import ShoeProvider
+from scoreboard import RED, BLUE, PLAYER_PAIR, BANKER_PAIR, DERIVED_ROADS, code_winner
+from card_sprites import CardSprites
 
 # --- CONFIG ---
 WIDTH, HEIGHT = 1280, 820   # taller to fit UI
 CARD_W, CARD_H = 100, 140
 FPS = 60
-STARTING_CREDITS = 1000
-TOTAL_DECKS = 16
-CHIP_VALUES = [1, 5, 25, 100, 500]
-
-PAYOUTS = {
-    'Player': 1.0,
-    'Banker': 0.95,
-    'Tie': 8.0,
-    'Perfect Pair': 25.0,
-    'Any Pair': 5.0,
-    'Player Pair': 11.0,
-    'Banker Pair': 11.0,
-    'Double Perfect Pair': 200.0
-}
-
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Baccarat — Full Functional UI")
-clock = pygame.time.Clock()
-FONT = pygame.font.SysFont("arial", 20, bold=True)
-SMALL = pygame.font.SysFont("arial", 16)
-BIG = pygame.font.SysFont("arial", 44, bold=True)
+RULES = STANDARD
+PENETRATION = 0.5    # share of the shoe dealt before the cut card
+BURN = 0             # cards burned off a new shoe, or 'value' to burn by the first card
+DIRTY_RECTS = True   # retained-mode drawing: only changed regions are repainted
+
+ZONE_COLORS = {'Player':(30,130,200),'Tie':(200,180,40),'Banker':(180,30,40)}
+TRACKER_COLORS = {PLAYER:(30,144,255),BANKER:(220,20,60),TIE:(40,160,60)}
+MARK_COLORS = {RED:(220,20,60),BLUE:(30,144,255)}
+ROAD_CELL, DERIVED_CELL = 12, 6   # scoreboard cell sizes: bead plate / big road, derived roads
+
+screen = clock = None          # opened by init_display()
+FONT = SMALL = BIG = None
+CARDS, CARD_BACK, SPRITES = [], None, None
 
 SUIT_SYMBOLS = {"C":"♣","D":"♦","H":"♥","S":"♠"}
 SUIT_COLORS = {"C": (0,0,0),"S": (0,0,0),"D": (220,20,60),"H": (220,20,60)}
-RANKS = ["A","2","3","4","5","6","7","8","9","10","J","Q","K"]
 
 def make_card(rank,suit):
     surf = pygame.Surface((CARD_W,CARD_H),pygame.SRCALPHA)
     surf.fill((245,245,245))
     pygame.draw.rect(surf,(30,30,30),surf.get_rect(),2,border_radius=8)
-    rtxt = FONT.render(rank, True, SUIT_COLORS[suit])
+    rtxt = TEXT.render(FONT, rank, True, SUIT_COLORS[suit])
     surf.blit(rtxt,(8,8))
-    stxt = FONT.render(SUIT_SYMBOLS[suit], True, SUIT_COLORS[suit])
+    stxt = TEXT.render(FONT, SUIT_SYMBOLS[suit], True, SUIT_COLORS[suit])
     surf.blit(stxt,(CARD_W-30,CARD_H-36))
     return surf
 
@@ -49,51 +51,19 @@ def make_back():
         pygame.draw.line(surf,(60,150,70),(10,y),(CARD_W-10,y),2)
     return surf
 
-CARDS = {r+s: make_card(r,s) for r in RANKS for s in SUIT_SYMBOLS}
-CARD_BACK = make_back()
-
-def rotated_card(card_key):
-    """Return a sideways version of the card surface."""
-    return pygame.transform.rotate(CARDS[card_key], 90)
-
-def rotated_back():
-    """Sideways card back (for animations)."""
-    return pygame.transform.rotate(CARD_BACK, 90)
-
-# --- GAME LOGIC ---
-def build_deck(): return [r+s for r in RANKS for s in SUIT_SYMBOLS]*TOTAL_DECKS
-def card_value(c): r=c[:-1]; return 0 if r in ["10","J","Q","K"] else 1 if r=="A" else int(r)
-def hand_total(h): return sum(card_value(c) for c in h)%10
-def draw_card(deck): return deck.pop()
-
-def baccarat_round(deck):
-    player=[draw_card(deck),draw_card(deck)]
-    banker=[draw_card(deck),draw_card(deck)]
-    pt,bt=hand_total(player),hand_total(banker)
-    if pt>=8 or bt>=8: return player,banker
-    player_third=None
-    if pt<=5: player_third=draw_card(deck); player.append(player_third); pt=hand_total(player)
-    if player_third is None:
-        if bt<=5: banker.append(draw_card(deck))
-    else:
-        pv=card_value(player_third)
-        if bt<=2: banker.append(draw_card(deck))
-        elif bt==3 and pv!=8: banker.append(draw_card(deck))
-        elif bt==4 and pv in [2,3,4,5,6,7]: banker.append(draw_card(deck))
-        elif bt==5 and pv in [4,5,6,7]: banker.append(draw_card(deck))
-        elif bt==6 and pv in [6,7]: banker.append(draw_card(deck))
-    return player,banker
-
-def winner(player,banker):
-    pt,bt=hand_total(player),hand_total(banker)
-    if pt>bt: return "Player"
-    if bt>pt: return "Banker"
-    return "Tie"
-
-def is_perfect_pair(hand): return len(hand)>=2 and hand[0]==hand[1]
-def is_any_pair(p,b): return (len(p)>=2 and p[0][:-1]==p[1][:-1]) or (len(b)>=2 and b[0][:-1]==b[1][:-1])
-def is_player_pair(p): return len(p)>=2 and p[0][:-1]==p[1][:-1]
-def is_banker_pair(b): return len(b)>=2 and b[0][:-1]==b[1][:-1]
+def init_display():
+    """Open the window, load the fonts and render the card art; run before anything is drawn."""
+    global screen, clock, FONT, SMALL, BIG, CARDS, CARD_BACK, SPRITES
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Baccarat — Full Functional UI")
+    clock = pygame.time.Clock()
+    FONT = pygame.font.SysFont("arial", 20, bold=True)
+    SMALL = pygame.font.SysFont("arial", 16)
+    BIG = pygame.font.SysFont("arial", 44, bold=True)
+    CARDS = [make_card(r,s) for r in RANKS for s in SUITS]   # indexed by card code
+    CARD_BACK = make_back()
+    SPRITES = CardSprites(CARDS, CARD_BACK)   # rotated third cards and flip frames, rendered once
 
 # --- UI ---
 class Button:
@@ -105,63 +75,25 @@ class Button:
     def draw(self,surf):
         pygame.draw.rect(surf,self.color,self.rect,border_radius=8)
         pygame.draw.rect(surf,(0,0,0),self.rect,2,border_radius=8)
-        txt=FONT.render(self.label,True,(255,255,255))
+        txt=TEXT.render(FONT,self.label,True,(255,255,255))
         surf.blit(txt,(self.rect.centerx-txt.get_width()//2,self.rect.centery-txt.get_height()//2))
     def handle_event(self,event):
         if event.type==pygame.MOUSEBUTTONDOWN and event.button==1 and self.rect.collidepoint(event.pos):
             if self.cb: self.cb()
 
-class BaccaratGame:
-    def __init__(self):
-        self.deck=build_deck(); random.shuffle(self.deck)
-        self.reshuffle_point=len(self.deck)//2
-        self.credits=STARTING_CREDITS
-        self.bets={k:0 for k in ['Player','Banker','Tie','Perfect Pair','Any Pair','Player Pair','Banker Pair']}
-        self.selected_chip=CHIP_VALUES[1]
-        self.chips_rects=[]
-        self.bet_zone_rects={}
-        self.side_rects={}
-        self.player_hand=[]
-        self.banker_hand=[]
-        self.animating=False
+class BaccaratGame(BaccaratTable):
+    def __init__(self,seed=None):
+        shoes=ShoeProvider(TOTAL_DECKS,PENETRATION,BURN,rng=random.Random(seed),background=True)
+        super().__init__(STARTING_CREDITS,TOTAL_DECKS,RULES,PAYOUTS,shoes)
         self.animation_start=0
         self.flip_time=0.45
         self.anim_sequence=[]
-        self.tracker=[]
-        self.message=''
         self.buttons=[]
-
-    def reshuffle_if_needed(self):
-        if len(self.deck)<20 or len(self.deck)<self.reshuffle_point:
-            self.deck=build_deck(); random.shuffle(self.deck)
-            self.reshuffle_point=len(self.deck)//2
-            self.message='Deck reshuffled'
-
-    def select_chip(self,val): self.selected_chip=val; self.message=f"Selected chip {val}"
-    def place_bet(self,area):
-        if self.animating: self.message='Wait for current round to finish'; return
-        if self.credits<self.selected_chip: self.message='Not enough credits'; return
-        self.bets[area]+=self.selected_chip; self.credits-=self.selected_chip
-        self.message=f"Placed {self.selected_chip} on {area}"
-    def clear_bets(self):
-        self.credits+=sum(self.bets.values())
-        for k in self.bets: self.bets[k]=0
-        self.message='Bets cleared'
-    def max_bet(self):
-        if self.credits<=0: self.message='No credits for Max Bet'; return
-        placed=0
-        while self.credits>=self.selected_chip:
-            self.bets['Player']+=self.selected_chip
-            self.credits-=self.selected_chip
-            placed+=self.selected_chip
-        self.message=f'Max bet placed ({placed}) on Player'
+        self.background=None
+        self.layout()
 
     def start_deal(self):
-        if self.animating: return
-        if self.bets['Player']+self.bets['Banker']+self.bets['Tie']<=0:
-            self.message='Place a main bet first (Player/Banker/Tie)'; return
-        self.reshuffle_if_needed()
-        self.player_hand,self.banker_hand=baccarat_round(self.deck)
+        if not self.deal(): return
         # Build animation sequence
         left_x=WIDTH//2-380; right_x=WIDTH//2+160; cy=HEIGHT//2-40
         spacing = CARD_W + 16
@@ -178,55 +110,85 @@ class BaccaratGame:
         if len(self.banker_hand)==3:
             seq.append((self.banker_hand[2],(right_x+2*spacing,cy)))
         self.anim_sequence=seq
-        self.animation_start=time.time(); self.animating=True; self.message='Dealing...'
+        self.animation_start=time.time(); self.message='Dealing...'
 
-    def finish_round_and_payouts(self):
-        res=winner(self.player_hand,self.banker_hand)
-        self.tracker.append(res)
-        # Main bets
-        for area in ['Player','Banker','Tie']:
-            stake=self.bets[area]
-            if stake>0:
-                if area==res: self.credits+=stake+int(stake*PAYOUTS[area])
-        # Side bets - Perfect Pair covers single or double perfect
-        if self.bets['Perfect Pair']>0:
-            pp_player = is_perfect_pair(self.player_hand)
-            pp_banker = is_perfect_pair(self.banker_hand)
-            if pp_player and pp_banker:
-                self.credits+=self.bets['Perfect Pair']+int(self.bets['Perfect Pair']*PAYOUTS['Double Perfect Pair'])
-                self.message = "DOUBLE PERFECT PAIR! Payout applied."
-            elif pp_player or pp_banker:
-                self.credits+=self.bets['Perfect Pair']+int(self.bets['Perfect Pair']*PAYOUTS['Perfect Pair'])
-        if self.bets['Any Pair']>0 and is_any_pair(self.player_hand,self.banker_hand):
-            self.credits+=self.bets['Any Pair']+int(self.bets['Any Pair']*PAYOUTS['Any Pair'])
-        if self.bets['Player Pair']>0 and is_player_pair(self.player_hand):
-            self.credits+=self.bets['Player Pair']+int(self.bets['Player Pair']*PAYOUTS['Player Pair'])
-        if self.bets['Banker Pair']>0 and is_banker_pair(self.banker_hand):
-            self.credits+=self.bets['Banker Pair']+int(self.bets['Banker Pair']*PAYOUTS['Banker Pair'])
-        # Clear bets
-        for k in self.bets: self.bets[k]=0
-        self.animating=False
-        if not self.message.startswith("DOUBLE PERFECT PAIR"):
-            self.message=f"{res} Wins!"
+    def finish_round_and_payouts(self): self.settle()
 
     def update_animation(self):
-        if not self.animating: return
+        if not self.dealing: return
         elapsed=time.time()-self.animation_start
         index=int(elapsed//self.flip_time)
         if index>=len(self.anim_sequence):
             self.finish_round_and_payouts()
 
-    def draw(self,surf):
+    def layout(self):
+        """Fixed screen regions, shared by click handling and both draw paths."""
+        bet_y=HEIGHT-280; zone_w,zone_h=220,90
+        self.bet_zone_rects={'Player':pygame.Rect(WIDTH//2-zone_w-240,bet_y,zone_w,zone_h),
+                             'Tie':pygame.Rect(WIDTH//2-zone_w//2,bet_y,zone_w,zone_h),
+                             'Banker':pygame.Rect(WIDTH//2+240,bet_y,zone_w,zone_h)}
+        side_start_x=WIDTH//2-(len(SIDE_BETS)*180)//2; side_y=bet_y+zone_h+12
+        self.side_rects={name:pygame.Rect(side_start_x+i*180,side_y,170,44) for i,name in enumerate(SIDE_BETS)}
+        tray_y=HEIGHT-100; tray_x=WIDTH//2-(len(CHIP_VALUES)*100)//2
+        self.chips_rects=[(pygame.Rect(tray_x+i*100,tray_y,72,72),val) for i,val in enumerate(CHIP_VALUES)]
+        self.chip_tray_rect=pygame.Rect(tray_x-4,tray_y-4,len(CHIP_VALUES)*100,82)
+        # Scoreboard down the left edge, side bet EV panel top right
+        x,y=16,100
+        self.road_rects={}
+        for name,road in self.scoreboard.roads().items():
+            cell=DERIVED_CELL if name in DERIVED_ROADS else ROAD_CELL
+            self.road_rects[name]=pygame.Rect(x,y+16,road.cols*cell,road.rows*cell)
+            y+=16+road.rows*cell+6
+        self.streak_rect=pygame.Rect(x,y,230,20)
+        self.scoreboard_rect=pygame.Rect(x,100,230,y-100)
+        tx=WIDTH-312
+        self.side_ev_rect=pygame.Rect(tx,100,WIDTH-tx,5*18+4)
+        left_x=WIDTH//2-380; right_x=WIDTH//2+160; cy=HEIGHT//2-40
+        # sideways third cards overhang their slot: the back by CARD_H-CARD_W, the face by 30px down
+        self.card_area_rect=pygame.Rect(left_x-24,cy-40,right_x-left_x+2*(CARD_W+16)+CARD_H+28,CARD_H+56)
+        self.message_rect=pygame.Rect(0,20,WIDTH//2-120,32)
+        self.credits_rect=pygame.Rect(WIDTH//2-200,60,400,30)
+
+    # --- Drawing: a static layer plus one painter per dynamic region ---
+    def draw_static(self,surf):
         surf.fill((8,80,30))
-        # Top: title & credits
-        title=BIG.render("Baccarat",True,(255,215,0))
+        title=TEXT.render(BIG,"Baccarat",True,(255,215,0))
         surf.blit(title,(WIDTH//2-title.get_width()//2,8))
-        credits_txt=FONT.render(f"Credits: {self.credits}",True,(255,215,0))
+        for name,rect in self.bet_zone_rects.items():
+            pygame.draw.rect(surf,ZONE_COLORS[name],rect,border_radius=10)
+            pygame.draw.rect(surf,(255,255,255),rect,2,border_radius=10)
+            surf.blit(TEXT.render(BIG,name.upper(),True,(255,255,255)),(rect.centerx-50,rect.top+8))
+        for name,r in self.side_rects.items():
+            pygame.draw.rect(surf,(45,70,45),r,border_radius=8)
+            pygame.draw.rect(surf,(255,255,255),r,2,border_radius=8)
+            surf.blit(TEXT.render(FONT,name,True,(255,255,255)),(r.left+8,r.top+8))
+        for r,val in self.chips_rects:
+            pygame.draw.circle(surf,(210,170,60),r.center,34)
+            pygame.draw.circle(surf,(0,0,0),r.center,36,2)
+            txt=TEXT.render(FONT,str(val),True,(0,0,0))
+            surf.blit(txt,(r.centerx-txt.get_width()//2,r.centery-txt.get_height()//2))
+        for name,rect in self.road_rects.items():
+            surf.blit(TEXT.render(SMALL,name,True,(255,255,255)),(rect.left,rect.top-17))
+            pygame.draw.rect(surf,(235,235,235),rect)
+            cell=rect.width//self.scoreboard.roads()[name].cols
+            for gx in range(rect.left,rect.right+1,cell): pygame.draw.line(surf,(200,200,200),(gx,rect.top),(gx,rect.bottom))
+            for gy in range(rect.top,rect.bottom+1,cell): pygame.draw.line(surf,(200,200,200),(rect.left,gy),(rect.right,gy))
+        surf.blit(TEXT.render(SMALL,'Side bet EV (next hand):',True,(255,255,255)),self.side_ev_rect.topleft)
+        # Buttons (Clear / Max) - drawn at right
+        for b in self.buttons:
+            b.draw(surf)
+
+    def draw_credits(self,surf):
+        credits_txt=TEXT.render(FONT,f"Credits: {self.credits}",True,(255,215,0))
         surf.blit(credits_txt,(WIDTH//2-credits_txt.get_width()//2,64))
-        # CARD AREA
+
+    def draw_message(self,surf):
+        surf.blit(TEXT.render(FONT,self.message,True,(255,215,0)),(24,24))
+
+    def draw_cards(self,surf):
         left_x=WIDTH//2-380; right_x=WIDTH//2+160; cy=HEIGHT//2-40
         spacing = CARD_W + 16
-        elapsed=time.time()-self.animation_start if self.animating else 999
+        elapsed=time.time()-self.animation_start if self.dealing else 999
 
         # Player cards
         for i in range(3):
@@ -236,46 +198,39 @@ class BaccaratGame:
             if seq_idx < len(self.anim_sequence):
                 start_t = seq_idx * self.flip_time
                 # Fully revealed (after flip animation)
-                if not self.animating or elapsed >= start_t + self.flip_time:
+                if not self.dealing or elapsed >= start_t + self.flip_time:
                     if i < len(self.player_hand):
                         if i == 2:
-                            img = rotated_card(self.player_hand[i])
+                            img = SPRITES.face(self.player_hand[i], sideways=True)
                             r = img.get_rect(center=(rect.centerx, rect.centery+30))  # shift down a little
                             surf.blit(img, r.topleft)
                         else:
-                            surf.blit(CARDS[self.player_hand[i]], rect.topleft)
+                            surf.blit(SPRITES.face(self.player_hand[i]), rect.topleft)
                     else:
                         pygame.draw.rect(surf,(200,200,200),rect,2,border_radius=6)
                 # Still waiting to start flip: show back
                 elif elapsed < start_t:
                     if i == 2:
-                        surf.blit(rotated_back(), rect.topleft)
+                        surf.blit(SPRITES.back_image(sideways=True), rect.topleft)
                     else:
-                        surf.blit(CARD_BACK, rect.topleft)
+                        surf.blit(SPRITES.back, rect.topleft)
                 # In the middle of flip animation
                 else:
                     prog = (elapsed - start_t) / self.flip_time
                     # scale width from full to thin to full (flip)
-                    scale = int(CARD_W * (1 - 2*prog)) if prog < 0.5 else int(CARD_W * (2*prog))
-                    scale = max(2, scale)
+                    card = self.player_hand[i] if i < len(self.player_hand) else None
                     # pick base image: rotated for third card
-                    if i == 2 and i < len(self.player_hand):
-                        base_img = rotated_card(self.player_hand[i])
-                    elif i < len(self.player_hand):
-                        base_img = CARDS[self.player_hand[i]]
-                    else:
-                        base_img = CARD_BACK
-                    img = pygame.transform.smoothscale(base_img, (scale, CARD_H))
+                    img = SPRITES.flip_frame(card, prog, sideways=(i == 2 and card is not None))
                     surf.blit(img, img.get_rect(center=rect.center).topleft)
             else:
                 # no animation for this slot (cards already shown / empty)
                 if i < len(self.player_hand):
                     if i == 2:
-                        img = rotated_card(self.player_hand[i])
+                        img = SPRITES.face(self.player_hand[i], sideways=True)
                         r = img.get_rect(center=(rect.centerx, rect.centery+30))
                         surf.blit(img, r.topleft)
                     else:
-                        surf.blit(CARDS[self.player_hand[i]], rect.topleft)
+                        surf.blit(SPRITES.face(self.player_hand[i]), rect.topleft)
                 else:
                     pygame.draw.rect(surf,(200,200,200),rect,2,border_radius=6)
 
@@ -286,106 +241,182 @@ class BaccaratGame:
             seq_idx=2+i if i<2 else 5
             if seq_idx < len(self.anim_sequence):
                 start_t = seq_idx * self.flip_time
-                if not self.animating or elapsed >= start_t + self.flip_time:
+                if not self.dealing or elapsed >= start_t + self.flip_time:
                     if i < len(self.banker_hand):
                         if i == 2:
-                            img = rotated_card(self.banker_hand[i])
+                            img = SPRITES.face(self.banker_hand[i], sideways=True)
                             r = img.get_rect(center=(rect.centerx, rect.centery+30))
                             surf.blit(img, r.topleft)
                         else:
-                            surf.blit(CARDS[self.banker_hand[i]], rect.topleft)
+                            surf.blit(SPRITES.face(self.banker_hand[i]), rect.topleft)
                     else:
                         pygame.draw.rect(surf,(200,200,200),rect,2,border_radius=6)
                 elif elapsed < start_t:
                     if i == 2:
-                        surf.blit(rotated_back(), rect.topleft)
+                        surf.blit(SPRITES.back_image(sideways=True), rect.topleft)
                     else:
-                        surf.blit(CARD_BACK, rect.topleft)
+                        surf.blit(SPRITES.back, rect.topleft)
                 else:
                     prog = (elapsed - start_t) / self.flip_time
-                    scale = int(CARD_W * (1 - 2*prog)) if prog < 0.5 else int(CARD_W * (2*prog))
-                    scale = max(2, scale)
-                    if i == 2 and i < len(self.banker_hand):
-                        base_img = rotated_card(self.banker_hand[i])
-                    elif i < len(self.banker_hand):
-                        base_img = CARDS[self.banker_hand[i]]
-                    else:
-                        base_img = CARD_BACK
-                    img = pygame.transform.smoothscale(base_img, (scale, CARD_H))
+                    card = self.banker_hand[i] if i < len(self.banker_hand) else None
+                    img = SPRITES.flip_frame(card, prog, sideways=(i == 2 and card is not None))
                     surf.blit(img, img.get_rect(center=rect.center).topleft)
             else:
                 if i < len(self.banker_hand):
                     if i == 2:
-                        img = rotated_card(self.banker_hand[i])
+                        img = SPRITES.face(self.banker_hand[i], sideways=True)
                         r = img.get_rect(center=(rect.centerx, rect.centery+30))
                         surf.blit(img, r.topleft)
                     else:
-                        surf.blit(CARDS[self.banker_hand[i]], rect.topleft)
+                        surf.blit(SPRITES.face(self.banker_hand[i]), rect.topleft)
                 else:
                     pygame.draw.rect(surf,(200,200,200),rect,2,border_radius=6)
 
         # Scores
-        surf.blit(FONT.render(f"Player: {hand_total(self.player_hand) if self.player_hand else '-'}",True,(255,255,255)),(left_x,cy-36))
-        surf.blit(FONT.render(f"Banker: {hand_total(self.banker_hand) if self.banker_hand else '-'}",True,(255,255,255)),(right_x,cy-36))
-
-        # Main bets
-        bet_y=HEIGHT-280; zone_w,zone_h=220,90
-        zones={'Player':pygame.Rect(WIDTH//2-zone_w-240,bet_y,zone_w,zone_h),
-               'Tie':pygame.Rect(WIDTH//2-zone_w//2,bet_y,zone_w,zone_h),
-               'Banker':pygame.Rect(WIDTH//2+240,bet_y,zone_w,zone_h)}
-        colors={'Player':(30,130,200),'Tie':(200,180,40),'Banker':(180,30,40)}
-        for name,rect in zones.items():
-            pygame.draw.rect(surf,colors[name],rect,border_radius=10)
-            pygame.draw.rect(surf,(255,255,255),rect,2,border_radius=10)
-            surf.blit(BIG.render(name.upper(),True,(255,255,255)),(rect.centerx-50,rect.top+8))
-            surf.blit(FONT.render(f"Bet: {self.bets[name]}",True,(255,255,255)),(rect.left+8,rect.bottom-32))
-            self.bet_zone_rects[name]=rect
-
-        # Side bets
-        side_names=['Perfect Pair','Any Pair','Player Pair','Banker Pair']
-        side_start_x=WIDTH//2-(len(side_names)*180)//2; side_y=bet_y+zone_h+12
-        for i,name in enumerate(side_names):
-            r=pygame.Rect(side_start_x+i*180,side_y,170,44)
-            pygame.draw.rect(surf,(45,70,45),r,border_radius=8)
-            pygame.draw.rect(surf,(255,255,255),r,2,border_radius=8)
-            surf.blit(FONT.render(name,True,(255,255,255)),(r.left+8,r.top+8))
-            surf.blit(FONT.render(str(self.bets[name]),True,(255,215,0)),(r.right-60,r.top+8))
-            self.side_rects[name]=r
-
-        # Chip tray
-        tray_y=HEIGHT-100; tray_x=WIDTH//2-(len(CHIP_VALUES)*100)//2
-        self.chips_rects=[]
-        for i,val in enumerate(CHIP_VALUES):
-            r=pygame.Rect(tray_x+i*100,tray_y,72,72)
-            pygame.draw.circle(surf,(210,170,60),r.center,34)
-            pygame.draw.circle(surf,(0,0,0),r.center,36,2)
-            txt=FONT.render(str(val),True,(0,0,0))
-            surf.blit(txt,(r.centerx-txt.get_width()//2,r.centery-txt.get_height()//2))
+        surf.blit(TEXT.render(FONT,f"Player: {hand_total(self.player_hand) if self.player_hand else '-'}",True,(255,255,255)),(left_x,cy-36))
+        surf.blit(TEXT.render(FONT,f"Banker: {hand_total(self.banker_hand) if self.banker_hand else '-'}",True,(255,255,255)),(right_x,cy-36))
+
+    def draw_bet(self,surf,name):
+        if name in self.bet_zone_rects:
+            rect=self.bet_zone_rects[name]
+            surf.blit(TEXT.render(FONT,f"Bet: {self.bets[name]}",True,(255,255,255)),(rect.left+8,rect.bottom-32))
+        else:
+            r=self.side_rects[name]
+            surf.blit(TEXT.render(FONT,str(self.bets[name]),True,(255,215,0)),(r.right-60,r.top+8))
+
+    def draw_chip_ring(self,surf):
+        for r,val in self.chips_rects:
             if val==self.selected_chip: pygame.draw.circle(surf,(255,255,255),r.center,38,3)
-            self.chips_rects.append((r,val))
-
-        # Tracker top right
-        cols,rows=12,4
-        cell=20
-        margin=24
-        tx=WIDTH - (cols*(cell+4)) - margin
-        ty=120  # just below credits
-        surf.blit(FONT.render('Tracker:',True,(255,255,255)),(tx,ty-28))
-        for i,res in enumerate(self.tracker[-cols*rows:]):
-            x=i%cols; y=i//cols
-            rect=pygame.Rect(tx+x*(cell+4),ty+y*(cell+6),cell,cell)
-            color=(200,200,200)
-            if res=='Player': color=(30,144,255)
-            elif res=='Banker': color=(220,20,60)
-            elif res=='Tie': color=(200,180,40)
-            pygame.draw.rect(surf,color,rect)
 
-        # Buttons (Clear / Max) - drawn at right
-        for b in self.buttons:
-            b.draw(surf)
+    def road_cell(self,name,vx,vy):
+        rect=self.road_rects[name]
+        cell=rect.width//self.scoreboard.roads()[name].cols
+        return pygame.Rect(rect.left+vx*cell+1,rect.top+vy*cell+1,cell-1,cell-1)
+
+    def draw_road_cell(self,surf,name,vx,vy):
+        value=self.scoreboard.roads()[name].cell(vx,vy)
+        if value is None: return
+        r=self.road_cell(name,vx,vy); rad=r.width//2
+        slash=((r.left+1,r.bottom-2),(r.right-2,r.top+1))
+        if name=='Bead Plate':
+            pygame.draw.circle(surf,TRACKER_COLORS[code_winner(value)],r.center,rad)
+            if value&BANKER_PAIR: pygame.draw.circle(surf,TRACKER_COLORS[BANKER],(r.left+2,r.top+2),2)
+            if value&PLAYER_PAIR: pygame.draw.circle(surf,TRACKER_COLORS[PLAYER],(r.right-3,r.bottom-3),2)
+        elif name=='Big Road':
+            pygame.draw.circle(surf,TRACKER_COLORS[value[0]],r.center,rad,2)
+            if value[1]: pygame.draw.line(surf,TRACKER_COLORS[TIE],*slash,2)
+        elif name=='Big Eye Boy': pygame.draw.circle(surf,MARK_COLORS[value[0]],r.center,rad,1)
+        elif name=='Small Road': pygame.draw.circle(surf,MARK_COLORS[value[0]],r.center,rad)
+        else: pygame.draw.line(surf,MARK_COLORS[value[0]],*slash)
+
+    def draw_road(self,surf,name):
+        for vx,vy,_ in self.scoreboard.roads()[name].visible(): self.draw_road_cell(surf,name,vx,vy)
+
+    def draw_scoreboard(self,surf):
+        for name in self.road_rects: self.draw_road(surf,name)
+
+    def draw_streak(self,surf):
+        sb=self.scoreboard
+        if sb.streak_side is None: return
+        text=f"Streak {'PB'[sb.streak_side]} x{sb.streak}   Longest P {sb.longest[PLAYER]} / B {sb.longest[BANKER]}"
+        surf.blit(TEXT.render(SMALL,text,True,(255,255,255)),self.streak_rect.topleft)
+
+    def draw_side_ev(self,surf):
+        # Side bet EV for the rest of the shoe (positive = player advantage)
+        tx,ev_y=self.side_ev_rect.topleft
+        for i,(name,ev) in enumerate(self.side_ev.expected_values().items()):
+            color=(120,255,120) if ev>0 else (200,200,200)
+            surf.blit(TEXT.render(SMALL,f"{name}: {ev*100:+.2f}%",True,color),(tx,ev_y+(i+1)*18))
 
-        # Message
-        surf.blit(FONT.render(self.message,True,(255,215,0)),(24,24))
+    def draw(self,surf):
+        """Immediate mode: repaint the whole table."""
+        self.draw_static(surf)
+        self.draw_dynamic(surf)
+
+    def draw_dynamic(self,surf):
+        self.draw_credits(surf)
+        self.draw_cards(surf)
+        for name in BET_AREAS: self.draw_bet(surf,name)
+        self.draw_chip_ring(surf)
+        self.draw_scoreboard(surf)
+        self.draw_streak(surf)
+        self.draw_side_ev(surf)
+        self.draw_message(surf)
+
+    def invalidate(self):
+        self.background=None
+
+    def draw_dirty(self,surf):
+        """Retained mode: repaint only the regions whose state changed since the last call.
+
+        Static layers are composed once into self.background; a changed region is
+        restored from it and repainted.  Returns the rects for display.update().
+        """
+        if self.background is None:
+            self.background=pygame.Surface(surf.get_size()).convert()
+            self.draw_static(self.background)
+            surf.blit(self.background,(0,0))
+            self.draw_dynamic(surf)
+            for road in self.scoreboard.roads().values(): road.take_changes()
+            self._shown=self._region_state()
+            return [surf.get_rect()]
+        state=self._region_state()
+        dirty=[]
+        for key,value in state.items():
+            old=self._shown.get(key)
+            if old==value: continue
+            if key=='scoreboard':
+                dirty.extend(self._repaint_roads(surf))
+                continue
+            rect=self._region_rect(key)
+            surf.blit(self.background,rect,rect)
+            self._paint_region(surf,key)
+            dirty.append(rect)
+        self._shown=state
+        return dirty
+
+    def _region_state(self):
+        state={'message':self.message,'credits':self.credits,
+               'cards':(tuple(self.player_hand),tuple(self.banker_hand),self.dealing and time.time()),
+               'chips':self.selected_chip,
+               'scoreboard':len(self.scoreboard),
+               'streak':(self.scoreboard.streak_side,self.scoreboard.streak,tuple(self.scoreboard.longest)),
+               'side_ev':tuple(self.side_ev.expected_values().values())}
+        for name in BET_AREAS: state[name]=self.bets[name]
+        return state
+
+    def _region_rect(self,key):
+        if key in self.bet_zone_rects: return self.bet_zone_rects[key]
+        if key in self.side_rects: return self.side_rects[key]
+        return {'message':self.message_rect,'credits':self.credits_rect,'cards':self.card_area_rect,
+                'chips':self.chip_tray_rect,'streak':self.streak_rect,'side_ev':self.side_ev_rect}[key]
+
+    def _repaint_roads(self,surf):
+        """Repaint the road cells that changed since the last frame (a whole road once it scrolls)."""
+        dirty=[]
+        for name,road in self.scoreboard.roads().items():
+            scrolled,cells=road.take_changes()
+            if scrolled:
+                rect=self.road_rects[name]
+                surf.blit(self.background,rect,rect)
+                self.draw_road(surf,name)
+                dirty.append(rect)
+                continue
+            for vx,vy in cells:
+                r=self.road_cell(name,vx,vy)
+                surf.blit(self.background,r,r)
+                self.draw_road_cell(surf,name,vx,vy)
+                dirty.append(r)
+        return dirty
+
+    def _paint_region(self,surf,key):
+        if key in BET_AREAS: return self.draw_bet(surf,key)
+        if key in ('message','streak'):
+            rect=self._region_rect(key)
+            surf.set_clip(rect); (self.draw_message if key=='message' else self.draw_streak)(surf); surf.set_clip(None)
+            return
+        {'credits':self.draw_credits,'cards':self.draw_cards,'chips':self.draw_chip_ring,
+         'side_ev':self.draw_side_ev}[key](surf)
 
     def handle_click(self,pos):
         # Main bets
@@ -397,29 +428,58 @@ class BaccaratGame:
             if r.collidepoint(pos): self.select_chip(val)
         for b in self.buttons: b.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN,{'pos':pos,'button':1}))
 
-# --- INIT GAME ---
-game=BaccaratGame()
-# Buttons
-btn_clear=Button((WIDTH-180,HEIGHT-100,160,44),"Clear Bets",game.clear_bets)
-btn_max=Button((WIDTH-180,HEIGHT-50,160,44),"Max Bet",game.max_bet)
-game.buttons=[btn_clear,btn_max]
-
-# --- MAIN LOOP ---
-running=True
-while running:
-    clock.tick(FPS)
-    for event in pygame.event.get():
-        if event.type==pygame.QUIT: running=False
-        elif event.type==pygame.MOUSEBUTTONDOWN and event.button==1: game.handle_click(event.pos)
-        elif event.type==pygame.KEYDOWN:
-            if event.key==pygame.K_ESCAPE: running=False
-            elif event.key==pygame.K_SPACE: game.start_deal()
-            elif event.key==pygame.K_c: game.clear_bets()
-            elif event.key==pygame.K_m: game.max_bet()
-            elif event.key in [pygame.K_1,pygame.K_2,pygame.K_3,pygame.K_4,pygame.K_5]:
-                idx=event.key-pygame.K_1; game.select_chip(CHIP_VALUES[idx])
-    game.update_animation()
-    game.draw(screen)
-    pygame.display.flip()
-pygame.quit()
-sys.exit()
+if __name__=="__main__":
+    # --- INIT GAME ---
+    init_display()
+    seed,record=session_args()
+    game=BaccaratGame(seed)
+    game.journal=Journal("baccarat")
+    game.journal.warn_dropped()
+    game.restore(game.journal)
+    game.log=open_log("baccarat",seed,record,**game.session_config())
+    # Buttons
+    btn_clear=Button((WIDTH-180,HEIGHT-100,160,44),"Clear Bets",game.clear_bets)
+    btn_max=Button((WIDTH-180,HEIGHT-50,160,44),"Max Bet",game.max_bet)
+    game.buttons=[btn_clear,btn_max]
+
+    # --- MAIN LOOP ---
+    overlay,trace=profiler_args()
+    PROFILE=FrameProfiler(1000/FPS,overlay=overlay,trace=trace)
+    running=True
+    while running:
+        PROFILE.frame()
+        clock.tick(FPS)
+        PROFILE.mark('wait')
+        for event in pygame.event.get():
+            if event.type==pygame.QUIT: running=False
+            elif event.type==pygame.MOUSEBUTTONDOWN and event.button==1: game.handle_click(event.pos)
+            elif event.type==pygame.KEYDOWN:
+                if event.key==pygame.K_ESCAPE: running=False
+                elif event.key==pygame.K_F3: PROFILE.toggle_overlay(); game.invalidate()
+                elif event.key==pygame.K_SPACE: game.start_deal()
+                elif event.key==pygame.K_c: game.clear_bets()
+                elif event.key==pygame.K_m: game.max_bet()
+                elif event.key in [pygame.K_1,pygame.K_2,pygame.K_3,pygame.K_4,pygame.K_5]:
+                    idx=event.key-pygame.K_1; game.select_chip(CHIP_VALUES[idx])
+        PROFILE.mark('events')
+        game.update_animation()
+        game.journal.tick()
+        PROFILE.mark('update')
+        if DIRTY_RECTS:
+            dirty=game.draw_dirty(screen)
+            overlay_rect=PROFILE.draw_overlay(screen)
+            if overlay_rect: dirty.append(overlay_rect)
+            PROFILE.mark('draw')
+            pygame.display.update(dirty)
+        else:
+            game.draw(screen)
+            PROFILE.draw_overlay(screen)
+            PROFILE.mark('draw')
+            pygame.display.flip()
+        PROFILE.mark('flip')
+    PROFILE.close()
+    game.log.close()
+    game.journal.close()
+    game.shoes.close()
+    pygame.quit()
+    sys.exit()
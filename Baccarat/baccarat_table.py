@@ -0,0 +1,257 @@
+"""
+Display-free Baccarat table: shoe, credits, bets, settlement and scoreboard.
+
+Baccarat 1.1.py draws one of these; simulators, services and tests can
+drive it directly without importing pygame or opening a window:
+
+    table = BaccaratTable()
+    table.place_bet('Banker')
+    if table.deal(): table.settle()
+
+Every public action is written to the session log (gamecore.replay) when the
+table has one, and each settled round adds a checkpoint of the hands and the
+credit balance; replay_session() rebuilds a table from a log's header with
+the same seeded shoes so the recorded inputs can be re-run headlessly.
+A table with a journal (gamecore.journal) appends every settled round to it,
+and restore() brings back the credits and scoreboard of earlier sessions.
+"""
+
+import random
+
+from paytable import TOTAL_DECKS, PAYOUTS, MAIN_BETS, BET_AREAS
+from cards import is_perfect_pair, is_any_pair, is_player_pair, is_banker_pair
+from rules import STANDARD, VARIANTS, OUTCOME_NAMES, baccarat_round, winner, banker_ratio
+from side_bet_tracker import SideBetTracker
+from scoreboard import Scoreboard, outcome_code, code_winner, PLAYER_PAIR, BANKER_PAIR
+from shoe_provider import ShoeProvider
+
+STARTING_CREDITS = 1000
+CHIP_VALUES = [1, 5, 25, 100, 500]
+
+
+def settle_bets(bets, player, banker, rules=STANDARD, payouts=PAYOUTS):
+    """Credits returned to each bet area (stake plus winnings, 0 when lost) for a dealt round.
+
+    Perfect Pair covers one or both hands; both pays the Double Perfect Pair ratio.
+    """
+    res = winner(player, banker)
+    ppp, bpp = is_perfect_pair(player), is_perfect_pair(banker)
+    wins = {
+        'Player': res == 'Player',
+        'Banker': res == 'Banker',
+        'Tie': res == 'Tie',
+        'Perfect Pair': ppp or bpp,
+        'Any Pair': is_any_pair(player, banker),
+        'Player Pair': is_player_pair(player),
+        'Banker Pair': is_banker_pair(banker),
+    }
+    returned = {}
+    for area, stake in bets.items():
+        if stake <= 0 or not wins[area]:
+            returned[area] = 0
+            continue
+        if area == 'Banker': ratio = banker_ratio(banker, rules)
+        elif area == 'Perfect Pair' and ppp and bpp: ratio = payouts['Double Perfect Pair']
+        else: ratio = payouts[area]
+        returned[area] = stake + int(stake*ratio)
+    return returned
+
+
+def round_detail(code, player, banker):
+    """Journal detail of a round: outcome code, hand sizes, then the cards."""
+    return bytes([code, len(player), len(banker), *player, *banker])
+
+
+class BaccaratTable:
+    INPUTS = frozenset({'select_chip', 'place_bet', 'clear_bets', 'max_bet', 'deal', 'settle'})   # ops a session log may replay
+
+    def __init__(self, credits=STARTING_CREDITS, decks=TOTAL_DECKS, rules=STANDARD,
+                 payouts=PAYOUTS, shoes=None, log=None):
+        self.rules = rules
+        self.log = log
+        self.payouts = payouts
+        self.shoes = shoes or ShoeProvider(decks)
+        self.side_ev = SideBetTracker((), payouts)
+        self.new_shoe()
+        self.credits = credits
+        self.bets = {k: 0 for k in BET_AREAS}
+        self.selected_chip = CHIP_VALUES[1]
+        self.player_hand = []
+        self.banker_hand = []
+        self.dealing = False
+        self.scoreboard = Scoreboard()
+        self.message = ''
+        self.rounds = 0
+        self.journal = None
+
+    def _record(self, op, *args):
+        if self.log: self.log.input(op, *args)
+
+    def restore(self, journal):
+        """Credits and scoreboard from the journal of earlier sessions (as many rounds as the scoreboard keeps)."""
+        for e in journal.tail(self.scoreboard.results.capacity):
+            code = e.detail[0]
+            self.scoreboard.record(code_winner(code), code & PLAYER_PAIR, code & BANKER_PAIR)
+        self.credits = int(journal.credits(self.credits))
+
+    def new_shoe(self):
+        self.shoe = self.shoes.next_shoe()
+        self.deck = self.shoe.cards
+        self.side_ev.reset(self.shoe.unseen())
+
+    def reshuffle_if_needed(self):
+        if self.shoe.finished():
+            self.new_shoe()
+            self.message = 'Deck reshuffled'
+
+    def select_chip(self, val):
+        self._record('select_chip', val)
+        self.selected_chip = val; self.message = f"Selected chip {val}"
+
+    def place_bet(self, area):
+        self._record('place_bet', area)
+        if self.dealing: self.message = 'Wait for current round to finish'; return
+        if self.credits < self.selected_chip: self.message = 'Not enough credits'; return
+        self.bets[area] += self.selected_chip; self.credits -= self.selected_chip
+        self.message = f"Placed {self.selected_chip} on {area}"
+
+    def clear_bets(self):
+        self._record('clear_bets')
+        self.credits += sum(self.bets.values())
+        for k in self.bets: self.bets[k] = 0
+        self.message = 'Bets cleared'
+
+    def max_bet(self):
+        self._record('max_bet')
+        if self.credits <= 0: self.message = 'No credits for Max Bet'; return
+        placed = 0
+        while self.credits >= self.selected_chip:
+            self.bets['Player'] += self.selected_chip
+            self.credits -= self.selected_chip
+            placed += self.selected_chip
+        self.message = f'Max bet placed ({placed}) on Player'
+
+    def deal(self):
+        """Deal the next round; False (with a message) when it cannot start yet."""
+        self._record('deal')
+        if self.dealing: return False
+        if sum(self.bets[k] for k in MAIN_BETS) <= 0:
+            self.message = 'Place a main bet first (Player/Banker/Tie)'; return False
+        self.reshuffle_if_needed()
+        self.player_hand, self.banker_hand = baccarat_round(self.deck, self.rules)
+        self.side_ev.remove_all(self.player_hand+self.banker_hand)
+        self.dealing = True
+        return True
+
+    def settle(self):
+        """Pay the dealt round, record it on the scoreboard and clear the bets; returns the result."""
+        res = winner(self.player_hand, self.banker_hand)
+        code = self.scoreboard.record(OUTCOME_NAMES.index(res), is_player_pair(self.player_hand),
+                                      is_banker_pair(self.banker_hand))
+        returned = settle_bets(self.bets, self.player_hand, self.banker_hand, self.rules, self.payouts)
+        self.credits += sum(returned.values())
+        if self.journal:
+            self.journal.round(sum(self.bets.values()), sum(returned.values()), self.credits,
+                               round_detail(code, self.player_hand, self.banker_hand))
+        double = (returned['Perfect Pair'] and is_perfect_pair(self.player_hand)
+                  and is_perfect_pair(self.banker_hand))
+        for k in self.bets: self.bets[k] = 0
+        self.dealing = False
+        self.rounds += 1
+        self.message = "DOUBLE PERFECT PAIR! Payout applied." if double else f"{res} Wins!"
+        if self.log:
+            self._record('settle')
+            self.log.check(self.checkpoint())
+        return res
+
+    def checkpoint(self):
+        return {'round': self.rounds, 'player': bytes(self.player_hand).hex(),
+                'banker': bytes(self.banker_hand).hex(), 'credits': self.credits}
+
+    def session_config(self):
+        """Header config for a session log of this table."""
+        return {'credits': self.credits, 'decks': self.shoes.decks, 'penetration': self.shoes.penetration,
+                'burn': self.shoes.burn, 'rules': self.rules.name, 'payouts': self.payouts}
+
+
+class FlatBetTable:
+    """Baccarat.py's quick game: one main bet and any side bets, each a flat stake, per hand.
+
+    Wins pay stake*ratio, a losing bet costs the stake; the credits never
+    leave the balance while a bet is open.
+    """
+    INPUTS = frozenset({'choose', 'add_side_bet', 'deal'})
+
+    def __init__(self, credits=STARTING_CREDITS, stake=50, decks=TOTAL_DECKS, rules=STANDARD,
+                 payouts=PAYOUTS, shoes=None, log=None):
+        self.credits, self.stake = credits, stake
+        self.rules, self.payouts = rules, payouts
+        self.shoes = shoes or ShoeProvider(decks)
+        self.shoe = self.shoes.next_shoe()
+        self.log = log
+        self.main_bet = None
+        self.side_bets = []
+        self.player_hand, self.banker_hand = [], []
+        self.result = ''
+        self.rounds = 0
+        self.journal = None
+
+    def _record(self, op, *args):
+        if self.log: self.log.input(op, *args)
+
+    def restore(self, journal):
+        self.credits = int(journal.credits(self.credits))
+
+    def choose(self, area):
+        self._record('choose', area)
+        self.main_bet = area
+
+    def add_side_bet(self, area):
+        self._record('add_side_bet', area)
+        self.side_bets.append(area)
+
+    def deal(self):
+        """Deal and settle one hand; returns True when the shoe was replaced first."""
+        self._record('deal')
+        if not self.main_bet: return False
+        reshuffled = self.shoe.finished()
+        if reshuffled: self.shoe = self.shoes.next_shoe()
+        p, b = self.player_hand, self.banker_hand = baccarat_round(self.shoe.cards, self.rules)
+        self.result = winner(p, b)
+        before = self.credits
+        if self.result == self.main_bet:
+            ratio = banker_ratio(b, self.rules) if self.result == 'Banker' else self.payouts[self.result]
+            self.credits += int(self.stake*ratio)
+        else:
+            self.credits -= self.stake
+        wins = {'Perfect Pair': is_perfect_pair(p) or is_perfect_pair(b), 'Any Pair': is_any_pair(p, b),
+                'Player Pair': is_player_pair(p), 'Banker Pair': is_banker_pair(b)}
+        for area in self.side_bets:
+            self.credits += int(self.stake*self.payouts[area]) if wins[area] else -self.stake
+        if self.journal:
+            wager = self.stake*(1+len(self.side_bets))
+            code = outcome_code(OUTCOME_NAMES.index(self.result), is_player_pair(p), is_banker_pair(b))
+            self.journal.round(wager, self.credits-before+wager, self.credits, round_detail(code, p, b))
+        self.main_bet = None; self.side_bets = []
+        self.rounds += 1
+        if self.log: self.log.check(self.checkpoint())
+        return reshuffled
+
+    def checkpoint(self):
+        return {'round': self.rounds, 'player': bytes(self.player_hand).hex(),
+                'banker': bytes(self.banker_hand).hex(), 'credits': self.credits}
+
+    def session_config(self):
+        return {'credits': self.credits, 'stake': self.stake, 'decks': self.shoes.decks,
+                'penetration': self.shoes.penetration, 'burn': self.shoes.burn, 'rules': self.rules.name,
+                'payouts': self.payouts}
+
+
+def replay_session(header):
+    """A table rebuilt from a session log header, dealing the same seeded shoes inline."""
+    c = header['config']
+    shoes = ShoeProvider(c['decks'], c['penetration'], c['burn'], rng=random.Random(header['seed']),
+                         background=False)
+    if header['game'] == 'baccarat-simulator':
+        return FlatBetTable(c['credits'], c['stake'], c['decks'], VARIANTS[c['rules']], c['payouts'], shoes)
+    return BaccaratTable(c['credits'], c['decks'], VARIANTS[c['rules']], c['payouts'], shoes)
@@ -0,0 +1,181 @@
+"""
+Headless backtester for Baccarat betting systems.
+
+Every player is one bankroll path through a stream of simulated shoes.  The
+shoes are dealt with montecarlo.deal_outcomes and laid end to end per
+player; the systems then run in lock step over the hands, so one Python
+iteration settles the same hand for every player at once and a path is a
+row of arrays, never an object per hand.
+
+A player stops when the bankroll can no longer cover the system's next
+stake (busted) or when the session length is reached.  Player and Banker
+bets lose on a Tie, as at the table; the Banker pays the RuleSet's ratio.
+
+    python backtest.py --system martingale --players 100000 --hands 2000 --bankroll 1000 --unit 5
+"""
+
+import argparse, time
+import numpy as np
+
+from paytable import TOTAL_DECKS, PAYOUTS
+from rules import STANDARD, VARIANTS, PLAYER, BANKER, TIE
+from montecarlo import NO_HAND, shuffled_shoes, deal_outcomes
+
+TABLE_MAX = 10_000
+NO_RESULT = -1   # previous-result value before the first hand of a shoe
+
+
+class FlatBet:
+    """The same unit on the same area every hand."""
+    def __init__(self, unit=5, area=BANKER):
+        self.unit, self.area = unit, area
+
+    def start(self, players): pass
+
+    def bets(self, bankroll, previous, won):
+        n = bankroll.size
+        return np.full(n, self.area), np.full(n, self.unit, dtype=np.float64)
+
+
+class Martingale:
+    """Double the stake after a loss, back to one unit after a win, up to the table limit."""
+    def __init__(self, unit=5, area=PLAYER, limit=TABLE_MAX):
+        self.unit, self.area, self.limit = unit, area, limit
+
+    def start(self, players):
+        self.stake = None
+
+    def bets(self, bankroll, previous, won):
+        if self.stake is None: self.stake = np.full(bankroll.size, float(self.unit))
+        else: self.stake = np.where(won, self.unit, np.minimum(self.stake*2, self.limit))
+        return np.full(bankroll.size, self.area), self.stake
+
+
+class FollowTheShoe:
+    """Bet on whichever side won the last decided hand of this shoe (Banker to open)."""
+    def __init__(self, unit=5):
+        self.unit = unit
+
+    def start(self, players):
+        self.side = np.full(players, BANKER)
+
+    def bets(self, bankroll, previous, won):
+        self.side = np.where(previous == NO_RESULT, BANKER,
+                             np.where((previous == PLAYER) | (previous == BANKER), previous, self.side))
+        return self.side, np.full(bankroll.size, self.unit, dtype=np.float64)
+
+
+class MaxBet:
+    """The table's Max Bet: the whole bankroll in chips of `chip`, on one area."""
+    def __init__(self, chip=5, area=BANKER, limit=TABLE_MAX):
+        self.unit, self.area, self.limit = chip, area, limit
+
+    def start(self, players): pass
+
+    def bets(self, bankroll, previous, won):
+        stake = np.minimum(bankroll//self.unit*self.unit, self.limit)
+        return np.full(bankroll.size, self.area), np.maximum(stake, self.unit)
+
+
+SYSTEMS = {'flat': FlatBet, 'martingale': Martingale, 'follow': FollowTheShoe, 'max-bet': MaxBet}
+
+
+class BacktestResult:
+    def __init__(self, bankroll, final, busted_at, max_drawdown, paths, hands):
+        self.bankroll = bankroll
+        self.final = final
+        self.busted_at = busted_at          # hand index of the bust, -1 if the player survived
+        self.max_drawdown = max_drawdown    # largest peak-to-trough fall of each path
+        self.paths = paths                  # (kept players, hands+1) bankroll trajectories
+        self.hands = hands
+
+    def risk_of_ruin(self):
+        return float(np.mean(self.busted_at >= 0))
+
+    def time_to_bust(self):
+        return self.busted_at[self.busted_at >= 0]
+
+    def summary(self):
+        q = (5, 25, 50, 75, 95)
+        fmt = lambda a: "  ".join(f"{v:>10,.1f}" for v in np.percentile(a, q)) if a.size else "-"
+        lines = [f"{self.final.size:,} players, {self.hands:,} hands, bankroll {self.bankroll:,.0f}",
+                 f"risk of ruin        {self.risk_of_ruin()*100:.2f}%",
+                 f"{'percentile':<20}" + "  ".join(f"{p:>10}" for p in q),
+                 f"{'final bankroll':<20}{fmt(self.final)}",
+                 f"{'max drawdown':<20}{fmt(self.max_drawdown)}",
+                 f"{'hands to bust':<20}{fmt(self.time_to_bust())}"]
+        return "\n".join(lines)
+
+
+def hand_stream(rng, players, hands, decks=TOTAL_DECKS, rules=STANDARD):
+    """(winner, banker_class, new_shoe) arrays of shape (players, hands): shoes laid end to end."""
+    per_shoe = (decks*52//2)//6   # fewest hands a shoe can deal
+    shoes_each = -(-hands//per_shoe)
+    winner, banker_class, _ = deal_outcomes(shuffled_shoes(rng, players*shoes_each, decks), rules)
+    steps = winner.shape[1]
+    first = np.zeros(winner.shape, dtype=bool); first[:, 0] = True
+    winner, banker_class, first = (a.reshape(players, shoes_each*steps) for a in (winner, banker_class, first))
+    # every shoe's hands are a prefix of its row: a stable sort moves the fillers to the end
+    order = np.argsort(winner == NO_HAND, axis=1, kind='stable')[:, :hands]
+    return tuple(np.take_along_axis(a, order, axis=1) for a in (winner, banker_class, first))
+
+
+def backtest(system, players=10_000, hands=1000, bankroll=1000.0, seed=None, decks=TOTAL_DECKS,
+             rules=STANDARD, payouts=PAYOUTS, keep_paths=100, batch_players=4096):
+    rng = np.random.default_rng(seed)
+    banker_pays = np.array(rules.banker_pays)
+    finals, busts, drawdowns, kept = [], [], [], []
+    for first_player in range(0, players, batch_players):
+        n = min(batch_players, players-first_player)
+        winner, banker_class, new_shoe = hand_stream(rng, n, hands, decks, rules)
+        system.start(n)
+        money = np.full(n, float(bankroll))
+        peak = money.copy()
+        drawdown = np.zeros(n)
+        busted_at = np.full(n, -1)
+        alive = np.ones(n, dtype=bool)
+        previous = np.full(n, NO_RESULT)
+        won = np.zeros(n, dtype=bool)
+        keep = max(0, min(keep_paths-sum(len(p) for p in kept), n))
+        path = np.empty((keep, hands+1)); path[:, 0] = money[:keep]
+        for h in range(hands):
+            previous = np.where(new_shoe[:, h], NO_RESULT, previous)
+            area, stake = system.bets(money, previous, won)
+            broke = alive & (stake > money)
+            busted_at[broke] = h
+            alive &= ~broke
+            w = winner[:, h].astype(np.int64)
+            won = (area == w)
+            ratio = np.where(area == BANKER, banker_pays[banker_class[:, h]],
+                             np.where(area == TIE, payouts['Tie'], payouts['Player']))
+            money = np.where(alive, money + np.where(won, stake*ratio, -stake), money)
+            peak = np.maximum(peak, money)
+            drawdown = np.maximum(drawdown, peak-money)
+            previous = w
+            path[:, h+1] = money[:keep]
+        finals.append(money); busts.append(busted_at); drawdowns.append(drawdown); kept.append(path)
+    return BacktestResult(bankroll, np.concatenate(finals), np.concatenate(busts),
+                          np.concatenate(drawdowns), np.concatenate(kept), hands)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Backtest a Baccarat betting system over simulated shoes")
+    ap.add_argument("--system", choices=sorted(SYSTEMS), default='flat')
+    ap.add_argument("--players", type=int, default=10_000)
+    ap.add_argument("--hands", type=int, default=1000)
+    ap.add_argument("--bankroll", type=float, default=1000)
+    ap.add_argument("--unit", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--decks", type=int, default=TOTAL_DECKS)
+    ap.add_argument("--rules", choices=sorted(VARIANTS), default=STANDARD.name)
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    result = backtest(SYSTEMS[args.system](args.unit), args.players, args.hands, args.bankroll,
+                      args.seed, args.decks, VARIANTS[args.rules])
+    dt = time.perf_counter()-t0
+    print(f"{args.system} ({args.rules})")
+    print(result.summary())
+    print(f"\n{args.players*args.hands/dt:,.0f} player-hands/sec ({dt:.2f}s)")
+
+
+if __name__ == "__main__": main()
@@ -0,0 +1,73 @@
+"""
+Pre-rendered card sprites for the Baccarat table.
+
+Faces, sideways (third card) faces and both card backs are rendered once.
+Flip animation frames are snapped to FLIP_STEPS fixed widths and scaled on
+first use into a bounded LRU, so a steady-state frame is blits only.
+"""
+
+from collections import OrderedDict
+import pygame
+
+FLIP_STEPS = 20          # distinct widths a flipping card can take
+MAX_FLIP_FRAMES = 512    # cached scaled frames (~15 MB at 100x140 cards)
+
+
+def _prepared(surf):
+    return surf.convert_alpha() if pygame.display.get_surface() else surf
+
+
+class CardSprites:
+    def __init__(self, faces, back, flip_steps=FLIP_STEPS, max_frames=MAX_FLIP_FRAMES):
+        self.card_w, self.card_h = back.get_size()
+        self.faces = [_prepared(f) for f in faces]
+        self.sideways = [_prepared(pygame.transform.rotate(f, 90)) for f in faces]
+        self.back = _prepared(back)
+        self.sideways_back = _prepared(pygame.transform.rotate(back, 90))
+        self.flip_steps = flip_steps
+        self.max_frames = max_frames
+        self._frames = OrderedDict()
+        self.hits = self.misses = 0
+
+    def face(self, card, sideways=False):
+        return (self.sideways if sideways else self.faces)[card]
+
+    def back_image(self, sideways=False):
+        return self.sideways_back if sideways else self.back
+
+    def flip_width(self, prog):
+        """Width of a card `prog` (0..1) of the way through its flip, snapped to a step.
+
+        Full width at both ends, thinnest half way through.  The table used to
+        scale by CARD_W*(1-2p) and then CARD_W*2p, which swells the second half
+        of the flip to twice the card width before snapping back; abs(1-2p)
+        mirrors the first half instead, so a card never outgrows its slot.
+        """
+        step = max(1, min(self.flip_steps, round(abs(1-2*prog)*self.flip_steps)))
+        return max(2, self.card_w*step//self.flip_steps)
+
+    def flip_frame(self, card, prog, sideways=False):
+        """Face (or back, for card None) squeezed to the flip width, at full card height."""
+        return self._frame(card, sideways, self.flip_width(prog))
+
+    def _frame(self, card, sideways, width):
+        key = (card, sideways, width)
+        img = self._frames.get(key)
+        if img is not None:
+            self.hits += 1
+            self._frames.move_to_end(key)
+            return img
+        self.misses += 1
+        base = self.back_image(sideways) if card is None else self.face(card, sideways)
+        img = _prepared(pygame.transform.smoothscale(base, (width, self.card_h)))
+        self._frames[key] = img
+        if len(self._frames) > self.max_frames: self._frames.popitem(last=False)
+        return img
+
+    def prewarm(self, cards=None):
+        """Render every flip frame of `cards` (all faces by default) ahead of time."""
+        cards = range(len(self.faces)) if cards is None else cards
+        for card in cards:
+            for sideways in (False, True):
+                for step in range(1, self.flip_steps+1):
+                    self._frame(card, sideways, max(2, self.card_w*step//self.flip_steps))
@@ -0,0 +1,31 @@
+"""
+Compact integer cards shared by the Baccarat games and tools.
+
+A card is a single byte code = rank*4 + suit, with ranks A,2..10,J,Q,K -> 0..12
+and suits C,D,H,S -> 0..3.  Two cards are a pair when their codes agree above
+the low two bits and a perfect pair when the codes are equal.  A shoe is a
+bytearray of codes dealt from the end, just like the old list of strings.
+"""
+
+RANKS = ("A","2","3","4","5","6","7","8","9","10","J","Q","K")
+SUITS = ("C","D","H","S")
+
+CARD_NAMES = tuple(r+s for r in RANKS for s in SUITS)
+CARD_CODES = {name: code for code, name in enumerate(CARD_NAMES)}
+RANK_VALUE = bytes(min(r+1, 10) % 10 for r in range(len(RANKS)))
+CARD_VALUE = bytes(RANK_VALUE[code >> 2] for code in range(len(CARD_NAMES)))
+
+
+def card_code(name): return CARD_CODES[name]
+def card_rank(c): return c >> 2
+def card_suit(c): return c & 3
+def card_value(c): return CARD_VALUE[c]
+def hand_total(h): return sum(CARD_VALUE[c] for c in h) % 10
+
+def build_shoe(decks): return bytearray(range(len(CARD_NAMES)))*decks
+def draw_card(shoe): return shoe.pop()
+
+def is_perfect_pair(hand): return len(hand)>=2 and hand[0]==hand[1]
+def is_player_pair(p): return len(p)>=2 and p[0]>>2==p[1]>>2
+def is_banker_pair(b): return len(b)>=2 and b[0]>>2==b[1]>>2
+def is_any_pair(p,b): return is_player_pair(p) or is_banker_pair(b)
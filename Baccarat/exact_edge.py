@@ -0,0 +1,147 @@
+"""
+Exact Baccarat probabilities for an arbitrary shoe composition.
+
+A composition is a sequence of 52 card counts indexed by the card codes
+of cards.py (rank*4+suit).  The Player/Banker/Tie split enumerates every
+ordered draw of up to six card values under the third-card rules of
+baccarat_round, with the drawing tables of a rules.RuleSet, weighting each
+path by its falling card counts.  All weights are kept as integers over
+the common denominator N(N-1)..(N-5), so the results are exact Fractions.
+
+    python exact_edge.py --decks 16
+"""
+
+import argparse, time
+from fractions import Fraction
+from functools import lru_cache
+
+from paytable import TOTAL_DECKS, PAYOUTS, format_report
+from cards import RANK_VALUE
+from rules import STANDARD, VARIANTS, DRAW, NO_THIRD
+
+
+def full_shoe(decks=TOTAL_DECKS):
+    return (decks,)*52
+
+
+def rank_counts(composition):
+    return [sum(composition[r*4:r*4+4]) for r in range(13)]
+
+
+def value_counts(composition):
+    counts = [0]*10
+    for r, n in enumerate(rank_counts(composition)): counts[RANK_VALUE[r]] += n
+    return counts
+
+
+def _main_outcomes(c, rules):
+    """Integer weights over N(N-1)(N-2)(N-3)(N-4)(N-5) of Player/Banker/Tie,
+    plus the Banker wins split by rules.banker_class."""
+    n = sum(c)
+    d4, d5 = (n-4)*(n-5), n-5
+    opening, player_draw, banker_draw = rules.opening, rules.player_draw, rules.banker_draw
+    res = [0, 0, 0]   # player, banker, tie
+    banker_wins = [0]*20
+
+    def settle(pt, bt, w, three=False):
+        if pt > bt: res[0] += w
+        elif bt > pt: res[1] += w; banker_wins[bt*2+three] += w
+        else: res[2] += w
+
+    def banker_third(pt, bt, w):
+        # w already carries every factor but the banker's third card
+        for v in range(10):
+            if c[v]: settle(pt, (bt+v) % 10, w*c[v], True)
+
+    # Card order inside each two-card hand does not change the counts left
+    # behind, so unordered pairs are enumerated once with weight x2.
+    for a in range(10):
+        wa = c[a]
+        if not wa: continue
+        c[a] -= 1
+        for b in range(a, 10):
+            wb = wa*c[b]*(1 if a == b else 2)
+            if not wb: continue
+            c[b] -= 1
+            pt = (a+b) % 10
+            for x in range(10):
+                wx = wb*c[x]
+                if not wx: continue
+                c[x] -= 1
+                for y in range(x, 10):
+                    w = wx*c[y]*(1 if x == y else 2)
+                    if not w: continue
+                    c[y] -= 1
+                    bt = (x+y) % 10
+                    if opening[((a*10+b)*10+x)*10+y] != DRAW:
+                        settle(pt, bt, w*d4)
+                    elif player_draw[pt]:
+                        for pv in range(10):
+                            w5 = w*c[pv]
+                            if not w5: continue
+                            c[pv] -= 1
+                            pt3 = (pt+pv) % 10
+                            if banker_draw[bt*11+pv]: banker_third(pt3, bt, w5)
+                            else: settle(pt3, bt, w5*d5)
+                            c[pv] += 1
+                    elif banker_draw[bt*11+NO_THIRD]:
+                        banker_third(pt, bt, w*d5)
+                    else:
+                        settle(pt, bt, w*d4)
+                    c[y] += 1
+                c[x] += 1
+            c[b] += 1
+        c[a] += 1
+    return res, banker_wins
+
+
+def _pair_weights(counts):
+    """(one hand pairs over N(N-1), both hands pair over N(N-1)(N-2)(N-3))."""
+    two = [k*(k-1) for k in counts]
+    single = sum(two)
+    both = single*single - sum(t*t for t in two) + sum(k*(k-1)*(k-2)*(k-3) for k in counts)
+    return single, both
+
+
+@lru_cache(maxsize=4096)
+def _exact(composition, rules):
+    n = sum(composition)
+    if len(composition) != 52: raise ValueError("composition must hold 52 card counts")
+    if n < 6: raise ValueError("need at least six cards in the shoe")
+    n2, n4, n6 = n*(n-1), n*(n-1)*(n-2)*(n-3), n*(n-1)*(n-2)*(n-3)*(n-4)*(n-5)
+    (player, banker, tie), banker_wins = _main_outcomes(value_counts(composition), rules)
+    pair, both_pair = _pair_weights(rank_counts(composition))
+    perfect, both_perfect = _pair_weights(composition)
+    return {
+        'Player': Fraction(player, n6),
+        'Banker': Fraction(banker, n6),
+        'Tie': Fraction(tie, n6),
+        'Player Pair': Fraction(pair, n2),
+        'Banker Pair': Fraction(pair, n2),
+        'Any Pair': Fraction(2*pair, n2) - Fraction(both_pair, n4),
+        'Perfect Pair': Fraction(2*perfect, n2) - Fraction(both_perfect, n4),
+        'Double Perfect Pair': Fraction(both_perfect, n4),
+        'Banker wins': tuple(Fraction(w, n6) for w in banker_wins),
+    }
+
+
+def exact_probabilities(composition, rules=STANDARD):
+    """Exact event probabilities (Fractions) for one round dealt from `composition`."""
+    return dict(_exact(tuple(composition), rules))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Exact Baccarat probabilities for a full shoe")
+    ap.add_argument("--decks", type=int, default=TOTAL_DECKS)
+    ap.add_argument("--rules", choices=sorted(VARIANTS), default=STANDARD.name)
+    args = ap.parse_args()
+    rules = VARIANTS[args.rules]
+    t0 = time.perf_counter()
+    probs = exact_probabilities(full_shoe(args.decks), rules)
+    dt = time.perf_counter()-t0
+    print(format_report(probs, PAYOUTS, f"{args.decks} deck shoe, {rules.name} rules (exact)",
+                        rules.banker_pays))
+    print(f"\nresolved in {dt*1000:.0f} ms")
+
+
+if __name__ == "__main__": main()
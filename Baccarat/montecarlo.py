@@ -0,0 +1,162 @@
+"""
+Headless NumPy Monte Carlo engine for the Baccarat rules in baccarat_round/winner.
+
+Whole shoes are shuffled as rows of a (shoes, cards) array and dealt in lock
+step: every iteration deals one hand in each shoe that has not reached the
+reshuffle point, so the Python loop runs ~85 times per batch regardless of
+how many shoes are in it.
+
+    python montecarlo.py --hands 20000000 --seed 7
+"""
+
+import argparse, time
+import numpy as np
+
+from paytable import TOTAL_DECKS, PAYOUTS, EVENTS, format_report
+from cards import CARD_VALUE, build_shoe
+from rules import STANDARD, VARIANTS, PLAYER, BANKER, TIE, DRAW, NO_THIRD
+
+# NumPy views of the byte card codes from cards.py
+DECK_CODES = np.frombuffer(build_shoe(1), dtype=np.uint8)
+CODE_VALUE = np.frombuffer(CARD_VALUE, dtype=np.uint8).astype(np.int16)
+NO_HAND = 255   # deal_outcomes filler past the end of a shoe
+
+
+class Tally:
+    """Event counts over a number of hands; tallies add together.
+
+    banker_wins splits the Banker wins by rules.banker_class so variants
+    that pay the Banker differently can be priced from the same counts.
+    """
+    def __init__(self, counts=None, hands=0, banker_wins=None):
+        self.counts = dict.fromkeys(EVENTS, 0)
+        if counts: self.counts.update(counts)
+        self.hands = hands
+        self.banker_wins = list(banker_wins) if banker_wins else [0]*20
+
+    def __add__(self, other):
+        return Tally({k: self.counts[k]+other.counts[k] for k in EVENTS}, self.hands+other.hands,
+                     [a+b for a, b in zip(self.banker_wins, other.banker_wins)])
+
+    def __eq__(self, other):
+        return (isinstance(other, Tally) and self.hands == other.hands
+                and self.counts == other.counts and self.banker_wins == other.banker_wins)
+
+    def probabilities(self):
+        n = self.hands or 1
+        probs = {k: v/n for k, v in self.counts.items()}
+        probs['Banker wins'] = [v/n for v in self.banker_wins]
+        return probs
+
+    def report(self, rules=STANDARD, payouts=PAYOUTS):
+        return format_report(self.probabilities(), payouts, f"{self.hands:,} hands ({rules.name})",
+                             rules.banker_pays)
+
+
+def shuffled_shoes(rng, n_shoes, decks=TOTAL_DECKS):
+    shoes = np.tile(np.tile(DECK_CODES, decks), (n_shoes, 1))
+    return rng.permuted(shoes, axis=1, out=shoes)
+
+
+def dealt_hands(shoes, rules=STANDARD):
+    """Deal every shoe down to the reshuffle point (half the shoe) in lock step.
+
+    Yields once per step, for the shoes still live: (live, cards, pt, bt, b_draw)
+    with the first six cards at each shoe's position and the final totals.
+    """
+    opening = np.frombuffer(rules.opening, dtype=np.uint8)
+    player_draw = np.frombuffer(rules.player_draw, dtype=np.bool_)
+    banker_draw = np.frombuffer(rules.banker_draw, dtype=np.bool_)
+    n_shoes, n_cards = shoes.shape
+    last_start = n_cards - n_cards//2   # a hand is dealt while len(deck) >= reshuffle_point
+    pos = np.zeros(n_shoes, dtype=np.intp)
+    live = np.arange(n_shoes)
+    offsets = np.arange(6)
+    while live.size:
+        c = shoes[live[:, None], pos[live][:, None] + offsets]
+        v = CODE_VALUE[c]
+        draw = opening[((v[:, 0]*10+v[:, 1])*10+v[:, 2])*10+v[:, 3]] == DRAW
+        pt = (v[:, 0]+v[:, 1]) % 10
+        bt = (v[:, 2]+v[:, 3]) % 10
+        p_draw = draw & player_draw[pt]
+        pv = np.where(p_draw, v[:, 4], NO_THIRD)
+        b_draw = draw & banker_draw[bt*11+pv]
+        bv = np.where(p_draw, v[:, 5], v[:, 4])
+        pt = np.where(p_draw, (pt+pv) % 10, pt)
+        bt = np.where(b_draw, (bt+bv) % 10, bt)
+        yield live, c, pt, bt, b_draw
+
+        pos[live] += 4 + p_draw + b_draw
+        live = live[pos[live] <= last_start]
+
+
+def deal_shoes(shoes, rules=STANDARD):
+    """Deal every shoe down to the reshuffle point and tally the hands."""
+    counts = dict.fromkeys(EVENTS, 0)
+    banker_wins = np.zeros(20, dtype=np.int64)
+    hands = 0
+    for live, c, pt, bt, b_draw in dealt_hands(shoes, rules):
+        b_win = bt > pt
+        rank = c[:, :4] >> 2
+        p_pair = rank[:, 0] == rank[:, 1]
+        b_pair = rank[:, 2] == rank[:, 3]
+        p_perfect = c[:, 0] == c[:, 1]
+        b_perfect = c[:, 2] == c[:, 3]
+        counts['Player'] += int(np.count_nonzero(pt > bt))
+        counts['Banker'] += int(np.count_nonzero(b_win))
+        banker_wins += np.bincount((bt*2+b_draw)[b_win], minlength=20)
+        counts['Tie'] += int(np.count_nonzero(pt == bt))
+        counts['Player Pair'] += int(np.count_nonzero(p_pair))
+        counts['Banker Pair'] += int(np.count_nonzero(b_pair))
+        counts['Any Pair'] += int(np.count_nonzero(p_pair | b_pair))
+        counts['Perfect Pair'] += int(np.count_nonzero(p_perfect | b_perfect))
+        counts['Double Perfect Pair'] += int(np.count_nonzero(p_perfect & b_perfect))
+        hands += live.size
+    return Tally(counts, hands, banker_wins.tolist())
+
+
+def deal_outcomes(shoes, rules=STANDARD):
+    """Hand-by-hand results of every shoe, as (shoes, hands) arrays in dealing order.
+
+    Returns (winner, banker_class, hands): winner holds rules.PLAYER/BANKER/TIE
+    and NO_HAND past the end of a shoe, banker_class is rules.banker_class of
+    the Banker hand, hands the number of hands dealt from each shoe.
+    """
+    n_shoes, n_cards = shoes.shape
+    steps = (n_cards//2)//4 + 1
+    winner = np.full((n_shoes, steps), NO_HAND, dtype=np.uint8)
+    banker_class = np.zeros((n_shoes, steps), dtype=np.uint8)
+    hands = np.zeros(n_shoes, dtype=np.intp)
+    for step, (live, c, pt, bt, b_draw) in enumerate(dealt_hands(shoes, rules)):
+        winner[live, step] = np.where(pt > bt, PLAYER, np.where(bt > pt, BANKER, TIE))
+        banker_class[live, step] = bt*2 + b_draw
+        hands[live] += 1
+    return winner, banker_class, hands
+
+
+def simulate(hands, decks=TOTAL_DECKS, seed=None, batch_shoes=4096, rules=STANDARD):
+    """Deal whole shoes until at least `hands` hands have been played."""
+    rng = np.random.default_rng(seed)
+    total = Tally()
+    while total.hands < hands:
+        total = total + deal_shoes(shuffled_shoes(rng, batch_shoes, decks), rules)
+    return total
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Monte Carlo house edge for the Baccarat paytable")
+    ap.add_argument("--hands", type=int, default=10_000_000)
+    ap.add_argument("--decks", type=int, default=TOTAL_DECKS)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--batch-shoes", type=int, default=4096)
+    ap.add_argument("--rules", choices=sorted(VARIANTS), default=STANDARD.name)
+    args = ap.parse_args()
+    rules = VARIANTS[args.rules]
+    t0 = time.perf_counter()
+    tally = simulate(args.hands, args.decks, args.seed, args.batch_shoes, rules)
+    dt = time.perf_counter()-t0
+    print(tally.report(rules))
+    print(f"\n{tally.hands/dt:,.0f} hands/sec ({dt:.2f}s)")
+
+
+if __name__ == "__main__": main()
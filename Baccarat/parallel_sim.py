@@ -0,0 +1,109 @@
+"""
+Multi-process Baccarat shoe simulator with reproducible seed streams.
+
+The master seed is split with numpy.random.SeedSequence.spawn into one
+independent stream per worker.  Every worker deals at least its quota of
+hands and returns a mergeable montecarlo.Tally, so the same seed and worker
+count always produce bit-identical totals, whatever the scheduling order.
+
+Two engines are available: the vectorised NumPy dealer from montecarlo.py,
+and the reference path that shuffles build_shoe() shoes and plays them
+through rules.baccarat_round one hand at a time.
+
+    python parallel_sim.py --hands 1000000000 --workers 16 --seed 20240601
+"""
+
+import argparse, os, random, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from paytable import TOTAL_DECKS, EVENTS
+from cards import build_shoe, is_perfect_pair, is_player_pair, is_banker_pair, hand_total
+from rules import STANDARD, VARIANTS, banker_class, baccarat_round
+from montecarlo import Tally, deal_shoes, shuffled_shoes
+
+ENGINES = ('numpy', 'python')
+
+
+def worker_seeds(seed, workers):
+    return np.random.SeedSequence(seed).spawn(workers)
+
+
+def split_hands(hands, workers):
+    return [hands//workers + (i < hands % workers) for i in range(workers)]
+
+
+def reference_shoes(rng, hands, decks=TOTAL_DECKS, rules=STANDARD):
+    """Deal shuffled shoes through baccarat_round until `hands` hands are played."""
+    counts = dict.fromkeys(EVENTS, 0)
+    banker_wins = [0]*20
+    played = 0
+    while played < hands:
+        shoe = build_shoe(decks); rng.shuffle(shoe)
+        reshuffle_point = len(shoe)//2
+        while not (len(shoe) < 20 or len(shoe) < reshuffle_point):
+            player, banker = baccarat_round(shoe, rules)
+            pt, bt = hand_total(player), hand_total(banker)
+            if pt > bt: counts['Player'] += 1
+            elif bt > pt: counts['Banker'] += 1; banker_wins[banker_class(bt, len(banker))] += 1
+            else: counts['Tie'] += 1
+            pp, bp = is_player_pair(player), is_banker_pair(banker)
+            counts['Player Pair'] += pp
+            counts['Banker Pair'] += bp
+            counts['Any Pair'] += pp or bp
+            ppp, bpp = is_perfect_pair(player), is_perfect_pair(banker)
+            counts['Perfect Pair'] += ppp or bpp
+            counts['Double Perfect Pair'] += ppp and bpp
+            played += 1
+    return Tally(counts, played, banker_wins)
+
+
+def run_worker(seed_seq, hands, decks=TOTAL_DECKS, rules_name=STANDARD.name, engine='numpy',
+               batch_shoes=2048):
+    """One worker's share of a run; everything it needs is in its arguments."""
+    rules = VARIANTS[rules_name]
+    if engine == 'python':
+        return reference_shoes(random.Random(int(seed_seq.generate_state(1, np.uint64)[0])),
+                               hands, decks, rules)
+    rng = np.random.default_rng(seed_seq)
+    total = Tally()
+    while total.hands < hands:
+        total = total + deal_shoes(shuffled_shoes(rng, batch_shoes, decks), rules)
+    return total
+
+
+def simulate(hands, workers=None, seed=0, decks=TOTAL_DECKS, rules=STANDARD, engine='numpy',
+             batch_shoes=2048):
+    workers = workers or os.cpu_count() or 1
+    seeds = worker_seeds(seed, workers)
+    quotas = split_hands(hands, workers)
+    args = [(s, q, decks, rules.name, engine, batch_shoes) for s, q in zip(seeds, quotas)]
+    if workers == 1:
+        parts = [run_worker(*args[0])]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(run_worker, *zip(*args)))
+    total = Tally()
+    for part in parts: total = total + part
+    return total
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Multi-process Baccarat shoe simulator")
+    ap.add_argument("--hands", type=int, default=100_000_000)
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--decks", type=int, default=TOTAL_DECKS)
+    ap.add_argument("--rules", choices=sorted(VARIANTS), default=STANDARD.name)
+    ap.add_argument("--engine", choices=ENGINES, default='numpy')
+    args = ap.parse_args()
+    rules = VARIANTS[args.rules]
+    t0 = time.perf_counter()
+    tally = simulate(args.hands, args.workers, args.seed, args.decks, rules, args.engine)
+    dt = time.perf_counter()-t0
+    print(tally.report(rules))
+    print(f"\nseed {args.seed}, {args.workers} workers, {args.engine} engine: "
+          f"{tally.hands/dt:,.0f} hands/sec ({dt:.2f}s)")
+
+
+if __name__ == "__main__": main()
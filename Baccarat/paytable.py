@@ -0,0 +1,63 @@
+"""
+Baccarat paytable shared by the UI and the headless tools.
+
+Payouts are "to one": a winning stake is returned plus stake*ratio.
+Player/Banker bets lose on a Tie (the table does not push them).
+"""
+
+TOTAL_DECKS = 16
+
+PAYOUTS = {
+    'Player': 1.0,
+    'Banker': 0.95,
+    'Tie': 8.0,
+    'Perfect Pair': 25.0,
+    'Any Pair': 5.0,
+    'Player Pair': 11.0,
+    'Banker Pair': 11.0,
+    'Double Perfect Pair': 200.0
+}
+
+MAIN_BETS = ('Player', 'Banker', 'Tie')
+SIDE_BETS = ('Perfect Pair', 'Any Pair', 'Player Pair', 'Banker Pair')
+BET_AREAS = MAIN_BETS + SIDE_BETS
+
+# Round events the tools report on. 'Perfect Pair' means at least one hand
+# holds a perfect pair, 'Double Perfect Pair' means both hands do.
+EVENTS = ('Player', 'Banker', 'Tie', 'Player Pair', 'Banker Pair',
+          'Any Pair', 'Perfect Pair', 'Double Perfect Pair')
+
+
+def bet_returns(probs, payouts=PAYOUTS, banker_pays=None):
+    """Expected return per unit staked on each bet area, from event probabilities.
+
+    With a RuleSet's banker_pays table the Banker bet is priced per winning
+    Banker class instead, from probs['Banker wins'] (see rules.banker_class).
+    Areas whose events are missing from probs are left out.
+    """
+    ev = {}
+    for area in ('Player', 'Banker', 'Tie', 'Any Pair', 'Player Pair', 'Banker Pair'):
+        if area not in probs: continue
+        p = probs[area]
+        ev[area] = p*payouts[area] - (1-p)
+    if banker_pays is not None and 'Banker' in probs:
+        ev['Banker'] = sum(p*r for p, r in zip(probs['Banker wins'], banker_pays)) - (1-probs['Banker'])
+    if 'Perfect Pair' in probs:
+        pp, dpp = probs['Perfect Pair'], probs['Double Perfect Pair']
+        ev['Perfect Pair'] = (pp-dpp)*payouts['Perfect Pair'] + dpp*payouts['Double Perfect Pair'] - (1-pp)
+    return ev
+
+
+def house_edges(probs, payouts=PAYOUTS, banker_pays=None):
+    """House edge (positive = house advantage) for every bet area."""
+    return {area: -r for area, r in bet_returns(probs, payouts, banker_pays).items()}
+
+
+def format_report(probs, payouts=PAYOUTS, title=None, banker_pays=None):
+    lines = [title] if title else []
+    edges = house_edges(probs, payouts, banker_pays)
+    lines.append(f"{'Event':<22}{'Probability':>14}{'House edge':>14}")
+    for name in EVENTS:
+        edge = f"{edges[name]*100:>13.4f}%" if name in edges else f"{'':>14}"
+        lines.append(f"{name:<22}{float(probs[name]):>14.8f}{edge}")
+    return "\n".join(lines)
@@ -0,0 +1,99 @@
+"""
+Table-driven Baccarat drawing rules.
+
+A RuleSet compiles a variant once into flat byte tables:
+
+  player_draw[pt]            Player draws on two-card total pt
+  banker_draw[bt*11 + pv]    Banker draws on total bt when the Player's third
+                             card has value pv, or pv = NO_THIRD if he stood
+  opening[v0v1v2v3]          outcome class straight from the first four card
+                             values (P1,P2,B1,B2 as a 4-digit decimal index):
+                             PLAYER/BANKER/TIE when the round is already
+                             settled, DRAW when third cards are needed
+  banker_pays[bt*2 + three]  Banker win ratio by final Banker total and
+                             whether the Banker drew (0.0 is a push)
+
+baccarat_round, the Monte Carlo engine and the exact calculator all read
+these tables, so a variant only has to supply different ones.
+"""
+
+from cards import CARD_VALUE, hand_total
+from paytable import PAYOUTS
+
+PLAYER, BANKER, TIE, DRAW = 0, 1, 2, 3
+OUTCOME_NAMES = ('Player', 'Banker', 'Tie')
+NO_THIRD = 10
+
+
+def punto_banco_banker_draw():
+    """The classic Banker tableau as a 10x11 table."""
+    draws = {0: range(10), 1: range(10), 2: range(10), 3: [0,1,2,3,4,5,6,7,9],
+             4: range(2, 8), 5: range(4, 8), 6: range(6, 8), 7: ()}
+    table = bytearray(10*11)
+    for bt in range(10):
+        for pv in draws.get(bt, ()): table[bt*11+pv] = 1
+        table[bt*11+NO_THIRD] = bt <= 5
+    return table
+
+
+def compile_opening(player_draw, banker_draw):
+    table = bytearray(10000)
+    for key in range(10000):
+        v0, v1, v2, v3 = key//1000, key//100 % 10, key//10 % 10, key % 10
+        pt, bt = (v0+v1) % 10, (v2+v3) % 10
+        if pt < 8 and bt < 8 and (player_draw[pt] or banker_draw[bt*11+NO_THIRD]):
+            table[key] = DRAW
+        else:
+            table[key] = PLAYER if pt > bt else BANKER if bt > pt else TIE
+    return table
+
+
+class RuleSet:
+    def __init__(self, name, player_draw, banker_draw, banker_pays):
+        self.name = name
+        self.player_draw = bytes(player_draw)
+        self.banker_draw = bytes(banker_draw)
+        self.banker_pays = tuple(banker_pays)
+        self.opening = bytes(compile_opening(self.player_draw, self.banker_draw))
+
+    def __repr__(self): return f"RuleSet({self.name!r})"
+
+
+def banker_class(total, cards): return total*2 + (cards == 3)
+
+PUNTO_BANCO_PLAYER = [pt <= 5 for pt in range(10)]
+PUNTO_BANCO_BANKER = punto_banco_banker_draw()
+
+STANDARD = RuleSet('standard', PUNTO_BANCO_PLAYER, PUNTO_BANCO_BANKER, [PAYOUTS['Banker']]*20)
+# Banker pays even money but only half when it wins on a 6
+NO_COMMISSION = RuleSet('no-commission', PUNTO_BANCO_PLAYER, PUNTO_BANCO_BANKER,
+                        [0.5 if c//2 == 6 else 1.0 for c in range(20)])
+# EZ Baccarat: even money, Banker bets push when the Banker wins with a three-card 7
+EZ_BACCARAT = RuleSet('ez', PUNTO_BANCO_PLAYER, PUNTO_BANCO_BANKER,
+                      [0.0 if c == banker_class(7, 3) else 1.0 for c in range(20)])
+
+VARIANTS = {r.name: r for r in (STANDARD, NO_COMMISSION, EZ_BACCARAT)}
+
+
+def baccarat_round(deck, rules=STANDARD):
+    player=[deck.pop(),deck.pop()]
+    banker=[deck.pop(),deck.pop()]
+    v=CARD_VALUE
+    if rules.opening[((v[player[0]]*10+v[player[1]])*10+v[banker[0]])*10+v[banker[1]]]!=DRAW:
+        return player,banker
+    pt=(v[player[0]]+v[player[1]])%10
+    bt=(v[banker[0]]+v[banker[1]])%10
+    pv=NO_THIRD
+    if rules.player_draw[pt]: c=deck.pop(); player.append(c); pv=v[c]
+    if rules.banker_draw[bt*11+pv]: banker.append(deck.pop())
+    return player,banker
+
+def winner(player,banker):
+    pt,bt=hand_total(player),hand_total(banker)
+    if pt>bt: return "Player"
+    if bt>pt: return "Banker"
+    return "Tie"
+
+def banker_ratio(banker, rules=STANDARD):
+    """Win ratio paid on the Banker bet for a winning Banker hand."""
+    return rules.banker_pays[banker_class(hand_total(banker), len(banker))]
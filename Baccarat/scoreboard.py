@@ -0,0 +1,204 @@
+"""
+Fixed-memory result history and the five Baccarat scoreboards.
+
+Every hand is kept as one outcome byte (winner code from rules plus the
+pair flags) in a ResultRing of fixed capacity, and placed on the roads as
+it is recorded:
+
+  Bead Plate     every hand, column by column
+  Big Road       runs of Player/Banker wins, ties counted on the last cell
+  Big Eye Boy,   RED/BLUE marks derived from the Big Road by comparing the
+  Small Road,    new entry with the column 1, 2 or 3 to its left
+  Cockroach Pig
+
+A road keeps only its `cols` visible columns (plus the absolute positions
+of what it shows); when a run reaches the right edge the road scrolls by a
+chunk of columns and forgets what fell off, so memory stays flat however
+long the table runs.  take_changes() reports which cells changed since the
+last call so a display can repaint only those.
+"""
+
+from collections import deque
+
+from rules import TIE
+
+PLAYER_PAIR, BANKER_PAIR = 4, 8   # flag bits above the two-bit winner code
+RED, BLUE = 0, 1                  # derived road marks
+ROAD_ROWS = 6
+DERIVED_ROADS = ('Big Eye Boy', 'Small Road', 'Cockroach Pig')   # compare 1, 2, 3 columns back
+
+
+def outcome_code(winner, player_pair=False, banker_pair=False):
+    return winner | PLAYER_PAIR*bool(player_pair) | BANKER_PAIR*bool(banker_pair)
+
+def code_winner(code): return code & 3
+
+
+class ResultRing:
+    """The last `capacity` outcome codes, oldest first."""
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.codes = bytearray(capacity)
+        self.total = 0
+
+    def append(self, code):
+        self.codes[self.total % self.capacity] = code
+        self.total += 1
+
+    def __len__(self): return min(self.total, self.capacity)
+
+    def __getitem__(self, i):
+        n = len(self)
+        if i < 0: i += n
+        if not 0 <= i < n: raise IndexError("result index out of range")
+        return self.codes[(self.total-n+i) % self.capacity]
+
+    def __iter__(self): return (self[i] for i in range(len(self)))
+
+    def last(self, n):
+        n = min(n, len(self))
+        return [self[i] for i in range(len(self)-n, len(self))]
+
+
+class _Grid:
+    """Cells at absolute (x, y), of which columns offset .. offset+cols-1 are kept."""
+
+    def __init__(self, rows, cols, scroll=None):
+        self.rows, self.cols = rows, cols
+        self.scroll = scroll or max(1, cols//3)
+        self.offset = 0
+        self.columns = {}
+        self.changed = set()
+        self.scrolled = False
+
+    def _place(self, x, y, value):
+        if x >= self.offset+self.cols:
+            new_offset = x-self.cols+self.scroll
+            for old in range(self.offset, new_offset): self.columns.pop(old, None)
+            self.offset = new_offset
+            self.scrolled = True
+            self.changed.clear()
+        self.columns.setdefault(x, {})[y] = value
+        if not self.scrolled: self.changed.add((x-self.offset, y))
+
+    def occupied(self, x, y): return y in self.columns.get(x, ())
+
+    def cell(self, vx, vy):
+        """Value shown at visible column vx, row vy (None when empty)."""
+        return self.columns.get(vx+self.offset, {}).get(vy)
+
+    def visible(self):
+        for x, col in self.columns.items():
+            for y, value in col.items(): yield x-self.offset, y, value
+
+    def take_changes(self):
+        """(scrolled, changed visible cells) since the last call; scrolled means repaint it all."""
+        scrolled, changed = self.scrolled, sorted(self.changed)
+        self.scrolled = False
+        self.changed = set()
+        return scrolled, changed
+
+
+class BeadPlate(_Grid):
+    def __init__(self, rows=ROAD_ROWS, cols=18, scroll=None):
+        super().__init__(rows, cols, scroll)
+        self.count = 0
+
+    def add(self, code):
+        self._place(self.count//self.rows, self.count % self.rows, code)
+        self.count += 1
+
+
+class Road(_Grid):
+    """Big Road placement: equal marks run down a column, a new mark starts the next one.
+
+    A run that hits the bottom row or an occupied cell turns right (the dragon
+    tail).  Cells are [mark, ties].
+    """
+
+    def __init__(self, rows=ROAD_ROWS, cols=18, scroll=None):
+        super().__init__(rows, cols, scroll)
+        self.last = None
+        self.start = -1       # x where the current run started
+        self.cursor = None
+        self.turned = False
+        self.pending_ties = 0
+
+    def add(self, mark):
+        if mark != self.last:
+            x, y = self.start+1, 0
+            while self.occupied(x, y): x += 1
+            self.start, self.turned = x, False
+        else:
+            x, y = self.cursor
+            if not self.turned and y+1 < self.rows and not self.occupied(x, y+1): y += 1
+            else: x += 1; self.turned = True
+        self.cursor, self.last = (x, y), mark
+        self._place(x, y, [mark, self.pending_ties])
+        self.pending_ties = 0
+
+    def tie(self):
+        if self.cursor is None or self.cursor[0] < self.offset:
+            self.pending_ties += 1
+            return
+        x, y = self.cursor
+        self.columns[x][y][1] += 1
+        if not self.scrolled: self.changed.add((x-self.offset, y))
+
+
+class Scoreboard:
+    """Result ring, Bead Plate, Big Road, the three derived roads and streak counters."""
+
+    def __init__(self, capacity=4096, bead_cols=18, road_cols=18, derived_cols=36, rows=ROAD_ROWS):
+        self.results = ResultRing(capacity)
+        self.bead = BeadPlate(rows, bead_cols)
+        self.big_road = Road(rows, road_cols)
+        self.derived = {name: Road(rows, derived_cols) for name in DERIVED_ROADS}
+        self.counts = [0, 0, 0]
+        self.pairs = [0, 0]
+        self.streak_side = None
+        self.streak = 0
+        self.longest = [0, 0]
+        # lengths of the latest Big Road columns, enough to look 3 columns back
+        self.column_lengths = deque(maxlen=len(DERIVED_ROADS)+2)
+        self.big_columns = 0
+
+    def __len__(self): return self.results.total
+
+    def roads(self):
+        return {'Bead Plate': self.bead, 'Big Road': self.big_road, **self.derived}
+
+    def record(self, winner, player_pair=False, banker_pair=False):
+        code = outcome_code(winner, player_pair, banker_pair)
+        self.results.append(code)
+        self.bead.add(code)
+        self.counts[winner] += 1
+        self.pairs[0] += bool(player_pair); self.pairs[1] += bool(banker_pair)
+        if winner == TIE:
+            self.big_road.tie()
+            return code
+        if winner == self.streak_side:
+            self.streak += 1
+            self.column_lengths[-1] += 1
+        else:
+            self.streak_side, self.streak = winner, 1
+            self.column_lengths.append(1)
+            self.big_columns += 1
+        self.longest[winner] = max(self.longest[winner], self.streak)
+        self.big_road.add(winner)
+        self._derive()
+        return code
+
+    def _derive(self):
+        cols = self.column_lengths
+        c, r = self.big_columns-1, cols[-1]-1
+        for k, name in enumerate(DERIVED_ROADS, 1):
+            if r > 0:
+                if c < k: continue
+                # the column k back: a cell level with this one or two empty rows repeat, a drop-off breaks
+                mark = BLUE if cols[-1-k] == r else RED
+            else:
+                if c < k+1: continue
+                mark = RED if cols[-2] == cols[-2-k] else BLUE
+            self.derived[name].add(mark)
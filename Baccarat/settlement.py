@@ -0,0 +1,85 @@
+"""
+Batched settlement of one Baccarat round for many seats.
+
+A round is reduced once to an outcome vector: for every bet area, the win
+ratio scaled by a common integer denominator D, or -D when the area loses.
+A stake matrix (seats x BET_AREAS, integer credits) then settles in one
+NumPy expression:
+
+    returned = stakes + stakes*pay // D        (0 for a lost area)
+
+which is the stake plus int(stake*ratio) the single-seat table pays, in
+exact integer arithmetic.  Perfect Pair pays the Double Perfect Pair ratio
+when both hands hold one; a Banker ratio of 0 is a push.
+
+    seats = Settlement()
+    pay = seats.outcome(player, banker)
+    credits += seats.settle(stakes, pay)
+"""
+
+from fractions import Fraction
+from math import lcm
+import numpy as np
+
+from paytable import PAYOUTS, BET_AREAS
+from cards import hand_total, is_perfect_pair, is_player_pair, is_banker_pair
+from rules import STANDARD, banker_class
+
+AREA_INDEX = {area: i for i, area in enumerate(BET_AREAS)}
+MAX_DENOMINATOR = 1000
+
+
+def ratio_fraction(ratio):
+    return Fraction(ratio).limit_denominator(MAX_DENOMINATOR)
+
+
+class Settlement:
+    """Outcome vectors and batched payouts for one rule set and paytable."""
+
+    def __init__(self, rules=STANDARD, payouts=PAYOUTS):
+        self.rules = rules
+        ratios = {area: ratio_fraction(payouts[area]) for area in BET_AREAS}
+        ratios['Double Perfect Pair'] = ratio_fraction(payouts['Double Perfect Pair'])
+        banker = [ratio_fraction(r) for r in rules.banker_pays]
+        self.denominator = D = lcm(*(f.denominator for f in (*ratios.values(), *banker)))
+        self.pays = {area: int(f*D) for area, f in ratios.items()}
+        self.banker_pays = [int(f*D) for f in banker]
+
+    def outcome(self, player, banker):
+        """Scaled win ratio per bet area for a dealt round, -denominator where the area loses."""
+        D = self.denominator
+        pay = np.full(len(BET_AREAS), -D, dtype=np.int64)
+        pt, bt = hand_total(player), hand_total(banker)
+        if pt > bt: pay[AREA_INDEX['Player']] = self.pays['Player']
+        elif bt > pt: pay[AREA_INDEX['Banker']] = self.banker_pays[banker_class(bt, len(banker))]
+        else: pay[AREA_INDEX['Tie']] = self.pays['Tie']
+        pp, bp = is_player_pair(player), is_banker_pair(banker)
+        if pp: pay[AREA_INDEX['Player Pair']] = self.pays['Player Pair']
+        if bp: pay[AREA_INDEX['Banker Pair']] = self.pays['Banker Pair']
+        if pp or bp: pay[AREA_INDEX['Any Pair']] = self.pays['Any Pair']
+        ppp, bpp = is_perfect_pair(player), is_perfect_pair(banker)
+        if ppp or bpp:
+            pay[AREA_INDEX['Perfect Pair']] = self.pays['Double Perfect Pair' if ppp and bpp else 'Perfect Pair']
+        return pay
+
+    def returns(self, stakes, pay):
+        """Credits returned per seat and area for a (seats x BET_AREAS) stake matrix."""
+        stakes = np.asarray(stakes, dtype=np.int64)
+        return stakes + stakes*pay//self.denominator
+
+    def settle(self, stakes, pay):
+        """Total credits returned to each seat."""
+        return self.returns(stakes, pay).sum(axis=-1)
+
+    def net(self, stakes, pay):
+        """Each seat's win (positive) or loss for the round."""
+        stakes = np.asarray(stakes, dtype=np.int64)
+        return self.settle(stakes, pay) - stakes.sum(axis=-1)
+
+
+def stake_matrix(bets_by_seat):
+    """Stake matrix from a list of {area: stake} dicts, one per seat."""
+    stakes = np.zeros((len(bets_by_seat), len(BET_AREAS)), dtype=np.int64)
+    for seat, bets in enumerate(bets_by_seat):
+        for area, stake in bets.items(): stakes[seat, AREA_INDEX[area]] = stake
+    return stakes
@@ -0,0 +1,98 @@
+"""
+Shuffled shoes prepared ahead of time, so a reshuffle never stalls the table.
+
+With background=True a ShoeProvider keeps the next `ahead` shoes built,
+shuffled and burned on a daemon worker thread; next_shoe() hands one over
+at once and the worker starts on its replacement while the table plays.
+The games' windows ask for that and close() the provider when they quit.
+By default the same shoes are made inline instead, with no thread
+(headless tools, the server, tests).  Shoes come out of one RNG in order,
+so a seeded provider always deals the same sequence of shoes.
+
+Penetration sets the cut card: the shoe is finished once fewer than
+(1-penetration) of its cards, or MIN_CARDS, are left.  Burn cards are
+taken off the top before the first hand, either a fixed number face down
+or BURN_BY_VALUE: the first card is turned up and as many more burned as
+its value (10 for tens and faces).
+"""
+
+import random, threading, queue
+
+from paytable import TOTAL_DECKS
+from cards import build_shoe, card_value
+
+PENETRATION = 0.5
+MIN_CARDS = 20           # never start a hand with fewer cards left
+BURN_BY_VALUE = 'value'
+
+
+class Shoe:
+    """A dealt-from-the-end shoe with its cut card and burned cards."""
+    __slots__ = ("cards", "reshuffle_point", "burned", "shown")
+
+    def __init__(self, cards, reshuffle_point, burned=b"", shown=b""):
+        self.cards = cards
+        self.reshuffle_point = reshuffle_point
+        self.burned = bytes(burned)
+        self.shown = bytes(shown)
+
+    def finished(self):
+        return len(self.cards) < MIN_CARDS or len(self.cards) < self.reshuffle_point
+
+    def unseen(self):
+        """Every card the players have not seen: the rest of the shoe and the face-down burns."""
+        hidden = list(self.burned)
+        for c in self.shown: hidden.remove(c)
+        return self.cards + bytes(hidden)
+
+
+def make_shoe(rng, decks=TOTAL_DECKS, penetration=PENETRATION, burn=0):
+    cards = build_shoe(decks); rng.shuffle(cards)
+    reshuffle_point = round(len(cards)*(1-penetration))
+    if burn == BURN_BY_VALUE:
+        first = cards.pop()
+        burned = [first] + [cards.pop() for _ in range(card_value(first) or 10)]
+        shown = [first]
+    else:
+        burned = [cards.pop() for _ in range(burn)]
+        shown = []
+    return Shoe(cards, reshuffle_point, burned, shown)
+
+
+class ShoeProvider:
+    def __init__(self, decks=TOTAL_DECKS, penetration=PENETRATION, burn=0, rng=None, ahead=1,
+                 background=False):
+        if not 0 < penetration <= 1: raise ValueError("penetration must be in (0, 1]")
+        self.decks, self.penetration, self.burn = decks, penetration, burn
+        self.rng = rng or random.Random()
+        self.shoes_made = 0
+        self._ready = queue.Queue(maxsize=ahead)
+        self._closed = threading.Event()
+        self._worker = None
+        if background:
+            self._worker = threading.Thread(target=self._run, name="shoe-provider", daemon=True)
+            self._worker.start()
+
+    def _make(self):
+        shoe = make_shoe(self.rng, self.decks, self.penetration, self.burn)
+        self.shoes_made += 1
+        return shoe
+
+    def _run(self):
+        while not self._closed.is_set():
+            shoe = self._make()
+            while not self._closed.is_set():
+                try: self._ready.put(shoe, timeout=0.2); break
+                except queue.Full: pass
+
+    def ready(self):
+        """True when next_shoe() will not have to wait."""
+        return self._worker is None or not self._ready.empty()
+
+    def next_shoe(self):
+        if self._worker is None: return self._make()
+        return self._ready.get()
+
+    def close(self):
+        self._closed.set()
+        if self._worker is not None: self._worker.join()
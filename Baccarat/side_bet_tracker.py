@@ -0,0 +1,89 @@
+"""
+Live expected value of the pair side bets for the cards left in the shoe.
+
+Every pair bet is decided by the first four cards of the next round, so its
+exact probability only needs a few running sums over the remaining counts
+(the same sums exact_edge.py builds from scratch):
+
+  s2 = sum k(k-1)      s4 = sum k(k-1)(k-2)(k-3)      sq = sum (k(k-1))^2
+
+kept once over the 13 ranks and once over the 52 card codes.  Removing a
+card only touches the terms of its rank and its code, so an update is a
+handful of integer operations per dealt card.
+"""
+
+from cards import CARD_NAMES
+from paytable import PAYOUTS, bet_returns
+
+
+class _PairSums:
+    __slots__ = ("counts", "s2", "s4", "sq")
+
+    def __init__(self, counts):
+        self.counts = list(counts)
+        t = [k*(k-1) for k in self.counts]
+        self.s2 = sum(t)
+        self.sq = sum(x*x for x in t)
+        self.s4 = sum(k*(k-1)*(k-2)*(k-3) for k in self.counts)
+
+    def remove(self, i):
+        k = self.counts[i]
+        t = k*(k-1)
+        # k(k-1) -> (k-1)(k-2) drops by 2(k-1); the falling power of four drops by 4(k-1)(k-2)(k-3)
+        self.s2 -= 2*(k-1)
+        self.sq += (k-1)*(k-2)*(k-1)*(k-2) - t*t
+        self.s4 -= 4*(k-1)*(k-2)*(k-3)
+        self.counts[i] = k-1
+
+    def one_hand(self, n2):
+        return self.s2/n2
+
+    def both_hands(self, n4):
+        return (self.s2*self.s2 - self.sq + self.s4)/n4
+
+
+class SideBetTracker:
+    """Follows a shoe card by card and prices Perfect/Any/Player/Banker Pair."""
+
+    def __init__(self, shoe=(), payouts=PAYOUTS):
+        self.payouts = payouts
+        self.reset(shoe)
+
+    def reset(self, shoe):
+        codes = [0]*len(CARD_NAMES)
+        for c in shoe: codes[c] += 1
+        self.remaining = sum(codes)
+        self.cards = _PairSums(codes)
+        self.ranks = _PairSums([sum(codes[r*4:r*4+4]) for r in range(len(codes)//4)])
+
+    def remove(self, card):
+        if not self.cards.counts[card]: raise ValueError(f"{CARD_NAMES[card]} is not in the shoe")
+        self.cards.remove(card)
+        self.ranks.remove(card >> 2)
+        self.remaining -= 1
+
+    def remove_all(self, cards):
+        for c in cards: self.remove(c)
+
+    def probabilities(self):
+        n = self.remaining
+        if n < 4: return dict.fromkeys(('Player Pair', 'Banker Pair', 'Any Pair', 'Perfect Pair',
+                                        'Double Perfect Pair'), 0.0)
+        n2, n4 = n*(n-1), n*(n-1)*(n-2)*(n-3)
+        pair = self.ranks.one_hand(n2)
+        perfect = self.cards.one_hand(n2)
+        both_perfect = self.cards.both_hands(n4)
+        return {
+            'Player Pair': pair,
+            'Banker Pair': pair,
+            'Any Pair': 2*pair - self.ranks.both_hands(n4),
+            'Perfect Pair': 2*perfect - both_perfect,
+            'Double Perfect Pair': both_perfect,
+        }
+
+    def expected_values(self):
+        """Expected return per unit staked on each side bet for the next round."""
+        return bet_returns(self.probabilities(), self.payouts)
+
+    def advantage_bets(self):
+        return [area for area, ev in self.expected_values().items() if ev > 0]
@@ -0,0 +1,111 @@
+"""
+Local load generator for table_server.py.
+
+Opens `seats` TCP connections spread over the server's tables; every seat
+bets when its table opens and reads every deal.  Reports the bet round-trip
+latency, deals received per second and the server's own stats (rounds per
+second and the worst lateness of a scheduled deal).  With --spawn the
+server is started as a child process first, so one command proves a
+configuration on one box:
+
+    python table_load.py --spawn --tables 300 --seats 3000 --bet-time 1 --deal-time 1 --duration 30
+"""
+
+import argparse, asyncio, json, os, random, subprocess, sys, time
+import numpy as np
+
+from table_server import HOST, PORT
+from paytable import MAIN_BETS
+
+
+class Load:
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.latencies = []
+        self.deals = 0
+        self.bets = 0
+        self.errors = 0
+        self.connected = 0
+
+    async def seat(self, host, port, table, stop):
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 16)
+        writer.write(json.dumps({"op": "join", "table": table}).encode() + b"\n")
+        self.connected += 1
+        sent = None
+        try:
+            while not stop.is_set():
+                line = await reader.readline()
+                if not line: break
+                ev = json.loads(line)["ev"]
+                if ev == "betting":
+                    area = self.rng.choice(MAIN_BETS)
+                    sent = time.perf_counter()
+                    writer.write(json.dumps({"op": "bet", "area": area, "amount": 5}).encode() + b"\n")
+                elif ev == "bet":
+                    self.latencies.append(time.perf_counter() - sent)
+                    self.bets += 1
+                elif ev == "deal":
+                    self.deals += 1
+                elif ev == "error":
+                    self.errors += 1
+        finally:
+            self.connected -= 1
+            writer.close()
+
+    async def run(self, host, port, tables, seats, duration, ramp):
+        stop = asyncio.Event()
+        tasks = []
+        for n in range(seats):
+            tasks.append(asyncio.create_task(self.seat(host, port, n % tables, stop)))
+            if ramp and n % 100 == 99: await asyncio.sleep(ramp)
+        await asyncio.sleep(0.5)
+        peak = self.connected
+        self.deals = self.bets = 0; self.latencies.clear()
+        t0 = time.perf_counter()
+        await asyncio.sleep(duration)
+        elapsed = time.perf_counter() - t0
+        deals, bets, lat = self.deals, self.bets, np.array(self.latencies)*1000
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(b'{"op": "stats"}\n')
+        server = json.loads(await reader.readline())
+        writer.close()
+        stop.set()
+        for task in tasks: task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        print(f"{peak:,} seats connected over {tables} tables, {elapsed:.1f}s measured")
+        print(f"deals received  {deals/elapsed:>12,.0f}/s")
+        print(f"bets acked      {bets/elapsed:>12,.0f}/s   errors {self.errors}")
+        if lat.size:
+            p50, p99, worst = np.percentile(lat, (50, 99, 100))
+            print(f"bet round trip  p50 {p50:.2f} ms  p99 {p99:.2f} ms  max {worst:.2f} ms")
+        print(f"server          {server['rounds_per_sec']:,.1f} rounds/s, {server['seats']:,} seats, "
+              f"worst deal lateness {server['max_lag_ms']:.1f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Drive table_server.py with many local seats")
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--tables", type=int, default=100)
+    ap.add_argument("--seats", type=int, default=1000)
+    ap.add_argument("--duration", type=float, default=20)
+    ap.add_argument("--ramp", type=float, default=0.01, help="pause after every 100 connections (s)")
+    ap.add_argument("--spawn", action="store_true", help="start table_server.py as a child process")
+    ap.add_argument("--bet-time", type=float, default=1.0)
+    ap.add_argument("--deal-time", type=float, default=1.0)
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+    server = None
+    if args.spawn:
+        here = os.path.dirname(os.path.abspath(__file__))
+        server = subprocess.Popen([sys.executable, os.path.join(here, "table_server.py"), "--tables", str(args.tables),
+                                   "--host", args.host, "--port", str(args.port), "--bet-time", str(args.bet_time),
+                                   "--deal-time", str(args.deal_time)], stdout=subprocess.DEVNULL)
+        time.sleep(1.0)
+    try: asyncio.run(Load(args.seed).run(args.host, args.port, args.tables, args.seats, args.duration, args.ramp))
+    finally:
+        if server:
+            server.terminate(); server.wait()
+
+
+if __name__ == "__main__": main()
@@ -0,0 +1,236 @@
+"""
+Many Baccarat tables in one process, as an asyncio service over local TCP.
+
+Each table runs its own shoe and timing loop: betting opens, stays open for
+`bet_time` seconds, the round is dealt and every seat is settled at once
+with settlement.Settlement (one NumPy expression for the whole table), then
+the next round opens.  Nothing is drawn; clients are thin and can be many.
+Everything on the event loop is short and CPU-bound; shuffling a new shoe
+runs on the default executor so a reshuffle never stalls the other tables.
+
+The protocol is newline-delimited JSON, one object per line.
+
+    client -> server
+        {"op": "join", "table": 3}
+        {"op": "bet", "area": "Banker", "amount": 25}
+        {"op": "stats"}
+    server -> client
+        {"ev": "joined", "table": 3, "seat": 17, "credits": 1000}
+        {"ev": "betting", "table": 3, "round": 42, "closes_in": 2.0}
+        {"ev": "bet", "area": "Banker", "amount": 25, "credits": 975}
+        {"ev": "deal", "round": 42, "result": "Banker", "player": [..], "banker": [..],
+         "returned": 48, "credits": 1023}
+        {"ev": "error", "error": "betting is closed"}
+
+A client whose socket backs up past MAX_BUFFERED bytes is disconnected
+rather than buffered without bound.  A seat that leaves with bets open (the
+round not yet dealt) has its stakes refunded, and the refund is written to
+the server's journal (journal/baccarat-server.journal) as a REFUND record
+with the table and seat in its detail.
+
+    python table_server.py --tables 200 --port 8765
+"""
+
+import argparse, asyncio, json, os, random, struct, sys, time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gamecore.journal import JOURNAL_DIR, REFUND, Journal
+from paytable import TOTAL_DECKS, PAYOUTS, BET_AREAS
+from rules import STANDARD, VARIANTS, OUTCOME_NAMES, baccarat_round, winner
+from cards import is_player_pair, is_banker_pair
+from scoreboard import Scoreboard
+from shoe_provider import PENETRATION, ShoeProvider
+from settlement import AREA_INDEX, Settlement
+from baccarat_table import STARTING_CREDITS
+
+HOST, PORT = "127.0.0.1", 8765
+BET_TIME = 10.0          # seconds betting stays open
+DEAL_TIME = 4.0          # seconds between the deal and the next betting round (the clients animate)
+MAX_BUFFERED = 1 << 20   # bytes queued to a client before it is dropped
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), JOURNAL_DIR, "baccarat-server.journal")
+
+
+class Seat:
+    __slots__ = ("id", "writer", "table", "credits", "stakes")
+
+    def __init__(self, id, writer, credits=STARTING_CREDITS):
+        self.id, self.writer, self.credits = id, writer, credits
+        self.table = None
+        self.stakes = None
+
+    def send(self, line):
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+            self.writer.transport.abort(); return
+        self.writer.write(line)
+
+
+class ServerTable:
+    """One table's shoe, scoreboard and seats.  play_round() deals and settles a round."""
+
+    def __init__(self, number, settlement, decks=TOTAL_DECKS, penetration=PENETRATION, rng=None):
+        self.number = number
+        self.settlement = settlement
+        self.shoes = ShoeProvider(decks, penetration, rng=rng, background=False)
+        self.shoe = None
+        self.seats = {}
+        self.scoreboard = Scoreboard()
+        self.round = 0
+        self.open = False
+
+    def play_round(self):
+        """Deal from the shoe and settle every seat; returns the deal event's fields."""
+        rules = self.settlement.rules
+        player, banker = baccarat_round(self.shoe.cards, rules)
+        res = winner(player, banker)
+        self.scoreboard.record(OUTCOME_NAMES.index(res), is_player_pair(player), is_banker_pair(banker))
+        betting = [s for s in self.seats.values() if s.stakes is not None]
+        returned = ()
+        if betting:
+            stakes = np.stack([s.stakes for s in betting])
+            returned = self.settlement.settle(stakes, self.settlement.outcome(player, banker)).tolist()
+        for seat, back in zip(betting, returned):
+            seat.credits += back
+        return res, player, banker, dict(zip((s.id for s in betting), returned))
+
+
+class TableService:
+    def __init__(self, tables=100, bet_time=BET_TIME, deal_time=DEAL_TIME, decks=TOTAL_DECKS,
+                 penetration=PENETRATION, rules=STANDARD, payouts=PAYOUTS, seed=None, journal=None):
+        rng = random.Random(seed)
+        settlement = Settlement(rules, payouts)
+        self.tables = [ServerTable(n, settlement, decks, penetration, random.Random(rng.getrandbits(64)))
+                       for n in range(tables)]
+        self.bet_time, self.deal_time = bet_time, deal_time
+        self.next_seat = 0
+        self.rounds = 0
+        self.bets = 0
+        self.refunds = 0
+        self.journal = journal   # gamecore.journal.Journal for refunds, or None
+        self.max_lag = 0.0   # worst lateness of a table's scheduled deal, seconds
+        self.started = time.monotonic()
+
+    async def serve(self, host=HOST, port=PORT):
+        server = await asyncio.start_server(self.handle, host, port, limit=4096)
+        loops = [asyncio.create_task(self.run_table(t)) for t in self.tables]
+        try: await server.serve_forever()
+        finally:
+            for task in loops: task.cancel()
+            server.close()
+            for table in self.tables:
+                for seat in table.seats.values(): seat.writer.close()
+            await server.wait_closed()
+            if self.journal: self.journal.close()
+
+    async def run_table(self, table):
+        loop = asyncio.get_running_loop()
+        period = self.bet_time + self.deal_time
+        # stagger the tables over one period so their deals do not all land together
+        deadline = loop.time() + period*table.number/len(self.tables)
+        await asyncio.sleep(deadline - loop.time())
+        while True:
+            if table.shoe is None or table.shoe.finished():
+                table.shoe = await loop.run_in_executor(None, table.shoes.next_shoe)
+            table.round += 1
+            table.open = True
+            line = json.dumps({"ev": "betting", "table": table.number, "round": table.round,
+                               "closes_in": self.bet_time}).encode() + b"\n"
+            for seat in table.seats.values(): seat.send(line)
+            deadline += self.bet_time
+            await asyncio.sleep(deadline - loop.time())
+            self.max_lag = max(self.max_lag, loop.time() - deadline)
+            table.open = False
+            res, player, banker, returned = table.play_round()
+            self.rounds += 1
+            deal = {"ev": "deal", "table": table.number, "round": table.round, "result": res,
+                    "player": player, "banker": banker}
+            for seat in table.seats.values():
+                deal["returned"], deal["credits"] = returned.get(seat.id, 0), seat.credits
+                seat.send(json.dumps(deal).encode() + b"\n")
+                seat.stakes = None
+            if self.journal: self.journal.tick()
+            deadline += self.deal_time
+            await asyncio.sleep(deadline - loop.time())
+
+    def stats(self):
+        up = time.monotonic() - self.started
+        return {"ev": "stats", "tables": len(self.tables), "seats": sum(len(t.seats) for t in self.tables),
+                "rounds": self.rounds, "bets": self.bets, "refunds": self.refunds, "rounds_per_sec": self.rounds/up,
+                "max_lag_ms": self.max_lag*1000}
+
+    def command(self, seat, msg):
+        op = msg.get("op")
+        if op == "bet":
+            table, area, amount = seat.table, msg.get("area"), msg.get("amount")
+            if table is None: return {"ev": "error", "error": "join a table first"}
+            if not table.open: return {"ev": "error", "error": "betting is closed"}
+            if area not in AREA_INDEX or isinstance(amount, bool) or not isinstance(amount, int) or amount <= 0:
+                return {"ev": "error", "error": "bad bet"}
+            if amount > seat.credits: return {"ev": "error", "error": "not enough credits"}
+            if seat.stakes is None: seat.stakes = np.zeros(len(BET_AREAS), dtype=np.int64)
+            seat.stakes[AREA_INDEX[area]] += amount
+            seat.credits -= amount
+            self.bets += 1
+            return {"ev": "bet", "area": area, "amount": amount, "credits": seat.credits}
+        if op == "join":
+            number = msg.get("table")
+            if isinstance(number, bool) or not isinstance(number, int) or not 0 <= number < len(self.tables):
+                return {"ev": "error", "error": "no such table"}
+            if seat.table is not None:
+                if seat.stakes is not None: return {"ev": "error", "error": "bets are open on this table"}
+                del seat.table.seats[seat.id]
+            seat.table = self.tables[number]
+            seat.table.seats[seat.id] = seat
+            return {"ev": "joined", "table": number, "seat": seat.id, "credits": seat.credits}
+        if op == "stats": return self.stats()
+        return {"ev": "error", "error": f"unknown op {op!r}"}
+
+    def leave(self, seat):
+        """Take a departing seat off its table, refunding stakes on a round not yet dealt."""
+        table = seat.table
+        if table is None: return
+        table.seats.pop(seat.id, None)
+        seat.table = None
+        if seat.stakes is None: return
+        # stakes only stay set while betting is open: the deal settles and clears them without yielding
+        amount = int(seat.stakes.sum())
+        seat.credits += amount
+        seat.stakes = None
+        self.refunds += 1
+        if self.journal: self.journal.append(REFUND, 0, amount, seat.credits, struct.pack("<IIQ", table.number, table.round, seat.id))
+
+    async def handle(self, reader, writer):
+        seat = Seat(self.next_seat, writer); self.next_seat += 1
+        try:
+            while line := await reader.readline():
+                try: msg = json.loads(line)
+                except ValueError: reply = {"ev": "error", "error": "bad json"}
+                else: reply = self.command(seat, msg) if isinstance(msg, dict) else {"ev": "error", "error": "bad message"}
+                seat.send(json.dumps(reply).encode() + b"\n")
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.leave(seat)
+            writer.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve many Baccarat tables over local TCP")
+    ap.add_argument("--tables", type=int, default=100)
+    ap.add_argument("--host", default=HOST)
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--bet-time", type=float, default=BET_TIME)
+    ap.add_argument("--deal-time", type=float, default=DEAL_TIME)
+    ap.add_argument("--rules", choices=sorted(VARIANTS), default=STANDARD.name)
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+    journal = Journal("baccarat-server", JOURNAL_PATH)
+    journal.warn_dropped()
+    service = TableService(args.tables, args.bet_time, args.deal_time, rules=VARIANTS[args.rules], seed=args.seed,
+                           journal=journal)
+    print(f"{args.tables} tables on {args.host}:{args.port}")
+    try: asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt: pass
+
+
+if __name__ == "__main__": main()
@@ -1,14 +1,22 @@
 import pygame
 import random
 import math
-from collections import deque
+import gc
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gamecore.text_cache import TEXT
+from gamecore.replay import session_args, open_log, NullLog
+from gamecore.journal import Journal
+from gamecore.frame_profiler import FrameProfiler, profiler_args
+from cascade import (ROWS, COLS, START_CREDITS, MIN_BET, MAX_BET, PAYOUT_PER_TILE_FACTOR,
+                     make_grid, collapse_columns, empty_cells, random_symbol_with_bias, tile_payout,
+                     ClusterTracker, layout, grid_args)
 
 # ========= Setup =========
-pygame.init()
 WIDTH, HEIGHT = 720, 1280
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Cascade Slots (5x5)")
-clock = pygame.time.Clock()
+screen = clock = None   # opened by init_display()
 
 # ========= Colors & Fonts =========
 WHITE = (245, 245, 245)
@@ -16,52 +24,92 @@ BLACK = (15, 15, 20)
 UI_GOLD = (236, 188, 59)
 UI_ACCENT = (159, 115, 255)
 
-FONT = pygame.font.SysFont("arial", 24, bold=True)
-BIG = pygame.font.SysFont("arial", 36, bold=True)
-FLOAT_FONT = pygame.font.SysFont("arial", 20, bold=True)
-
-# Colors (9 balanced)
-SYMBOLS = [
-    (255, 0, 0),       # Bright Red
-    (0, 255, 0),       # Bright Green
-    (0, 0, 255),       # Bright Blue
-    (255, 255, 0),     # Yellow
-    (255, 165, 0),     # Orange
-    (128, 0, 128),     # Purple
-    (0, 255, 255),     # Cyan
-    (255, 192, 203),   # Pink
-    (165, 42, 42),     # Brown
-    (128, 128, 128),   # Gray
-    (0, 128, 128),     # Teal
-    (255, 105, 180),   # Hot Pink
-    (0, 100, 0),       # Dark Green
-    (210, 180, 140),   # Tan
-    (0, 0, 128),       # Navy Blue
-#    (240, 230, 140),   # Khaki
-    (173, 216, 230),   # Light Blue
-    (255, 20, 147),    # Deep Pink
-    (75, 0, 130),      # Indigo
-    (34, 139, 34),     # Forest Green
-]
-SYMBOL_WEIGHTS = [20] * len(SYMBOLS)  # balanced
+FONT = BIG = FLOAT_FONT = None   # loaded by init_display()
 
 # ========= Grid Config =========
-ROWS, COLS = 5, 5
-TILE = 110
-GRID_W, GRID_H = COLS * TILE, ROWS * TILE
-GRID_X = (WIDTH - GRID_W) // 2
+BASE_TILE = 110         # tile size of the 5x5 board; every tile measurement below is drawn for it
+GRID_BOX = 5 * BASE_TILE
 GRID_Y = 280
 
-# ========= Economy =========
-START_CREDITS = 1000
-MIN_BET, MAX_BET = 1, 50
-PAYOUT_PER_TILE_FACTOR = 0.05  # per tile
+def scaled(px):
+    """A measurement drawn for BASE_TILE, at the current TILE (never below 1 px)."""
+    return max(1, px * TILE // BASE_TILE)
+
+def configure_grid(rows, cols):
+    """Size the board for a rows x cols grid (up to 64x64): tiles shrink to fit GRID_BOX."""
+    global ROWS, COLS, TILE, GRID_W, GRID_H, GRID_X, TILE_INSET, TILE_SIZE, GLOW, GLOW_PAD, BOARD_BG
+    ROWS, COLS = rows, cols
+    TILE = min(GRID_BOX // cols, GRID_BOX // rows)
+    GRID_W, GRID_H = COLS * TILE, ROWS * TILE
+    GRID_X = (WIDTH - GRID_W) // 2
+    TILE_INSET, TILE_SIZE = scaled(4), TILE - scaled(16)
+    TILE_SPRITES.clear()
+    layout(rows, cols)   # the bitboard tables, built now rather than on the first spin's frames
+    # the highlight glow, drawn once at full alpha; draw_scene fades it with set_alpha
+    GLOW_PAD = scaled(7)
+    GLOW = pygame.Surface((TILE_SIZE + 2*GLOW_PAD, TILE_SIZE + 2*GLOW_PAD), pygame.SRCALPHA)
+    pygame.draw.rect(GLOW, (255, 255, 255, 255), GLOW.get_rect(), border_radius=scaled(22))
+    GLOW = GLOW.convert_alpha()
+    # the empty cells never change: one surface for the whole board
+    BOARD_BG = pygame.Surface((GRID_W, GRID_H)).convert()
+    BOARD_BG.fill(BLACK)
+    radius, border = scaled(18), scaled(2)
+    for r in range(ROWS):
+        for c in range(COLS):
+            cell = pygame.Rect(c*TILE, r*TILE, TILE, TILE)
+            pygame.draw.rect(BOARD_BG, (16, 16, 26), cell, border_radius=radius)
+            pygame.draw.rect(BOARD_BG, (45, 45, 70), cell, border, border_radius=radius)
+    pygame.display.set_caption(f"Cascade Slots ({ROWS}x{COLS})")
+
+TILE_SPRITES = {}   # color -> the tile with its sheen, at the current TILE
+
+def init_display(rows=ROWS, cols=COLS):
+    """Open the window, load the fonts and size the board; run before any Tile is made or drawn."""
+    global screen, clock, FONT, BIG, FLOAT_FONT
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    clock = pygame.time.Clock()
+    FONT = pygame.font.SysFont("arial", 24, bold=True)
+    BIG = pygame.font.SysFont("arial", 36, bold=True)
+    FLOAT_FONT = pygame.font.SysFont("arial", 20, bold=True)
+    configure_grid(rows, cols)
+
+FREEZE_GC_CELLS = 16 * 16   # boards from this size up (large-grid mode) freeze the start-up objects
+
+def freeze_gc():
+    """In large-grid mode, move the start-up objects out of the collector's reach.
+
+    A full collection walks some 35k long-lived objects (pygame, the modules,
+    the sprites) in about 10 ms.  Next to a 5x5 frame that still fits the
+    60 FPS budget; next to a 64x64 frame it does not: drawing 4096 tiles
+    takes 4-6 ms and a deal, pop, repack or rescan step up to 5 ms more,
+    which is why step_cascade gives each of them a frame of its own.
+    bench_grid.py puts a 64x64 resolve at about 5.5 ms p50 and 10-12 ms
+    p99; a frame or two in 1800 still goes over 16.7 ms on a loaded
+    single-core machine, where the process is preempted mid-frame.
+    """
+    if ROWS * COLS >= FREEZE_GC_CELLS: gc.freeze()
+
+def tile_sprite(color):
+    sprite = TILE_SPRITES.get(color)
+    if sprite is None:
+        # the rect, then the sheen over it and over its rounded-off corners
+        sprite = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        pygame.draw.rect(sprite, color, sprite.get_rect(), border_radius=scaled(16))
+        sheen = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        pygame.draw.ellipse(sheen, (255, 255, 255, 48),
+                            (TILE_SIZE * 0.1, -TILE_SIZE * 0.25, TILE_SIZE * 0.8, TILE_SIZE * 0.7))
+        sprite.blit(sheen, (0, 0))
+        sprite = TILE_SPRITES[color] = sprite.convert_alpha()
+    return sprite
 
 # ========= Anim / Timing =========
 DROP_SPEED = 50    # slower
 POP_FLASH_TIME = 400 # ms
 SPIN_SHAKE_TIME = 420
 FILL_STAGGER = 50    # slower cascade
+DEAL_PER_FRAME = 256 # new tiles a frame, dealt or refilled; a 64x64 deal spreads over sixteen frames
+TEXT_PER_TILE = 40   # smaller tiles get one floating text per cascade step, not one per tile
 # ========= last win ==============
 last_win = 0.0
 # ========= Floating Text =========
@@ -72,6 +120,7 @@ class FloatingText:
         self.timer = 0
         self.lifetime = 900  # ms
         self.alpha = 255
+        self.surf = TEXT.render(FLOAT_FONT, self.text, True, (255, 255, 255)).copy()
 
     def update(self, dt):
         self.timer += dt
@@ -79,9 +128,8 @@ class FloatingText:
         self.alpha = max(0, 255 - int((self.timer / self.lifetime) * 255))
 
     def draw(self, surf):
-        txt_surf = FLOAT_FONT.render(self.text, True, (255, 255, 255))
-        txt_surf.set_alpha(self.alpha)
-        surf.blit(txt_surf, (self.x, self.y))
+        self.surf.set_alpha(self.alpha)
+        surf.blit(self.surf, (self.x, self.y))
 
     def is_alive(self):
         return self.timer < self.lifetime
@@ -96,7 +144,7 @@ class Button:
         color = UI_GOLD if enabled else (130, 100, 30)
         pygame.draw.rect(surf, color, self.rect, border_radius=16)
         pygame.draw.rect(surf, (255, 255, 255), self.rect, 3, border_radius=16)
-        text = BIG.render(self.label, True, BLACK if enabled else (40, 40, 40))
+        text = TEXT.render(BIG, self.label, True, BLACK if enabled else (40, 40, 40))
         surf.blit(text, text.get_rect(center=self.rect.center))
 
     def clicked(self, pos):
@@ -104,88 +152,48 @@ class Button:
 
 # ========= Tile object =========
 class Tile:
-    __slots__ = ("color", "row", "col", "x", "y", "target_y", "popping", "pop_start", "alive")
+    __slots__ = ("color", "sprite", "row", "col", "x", "y", "target_y", "popping", "pop_start", "alive",
+                 "blit", "glow")
     def __init__(self, color, row, col, world_x, world_y):
         self.color = color
+        self.sprite = tile_sprite(color)
         self.row = row
         self.col = col
         self.x = world_x
-        self.y = world_y - random.randint(0, GRID_H)
+        self.y = world_y - int(random.random() * (GRID_H + 1))   # randint(0, GRID_H), for thousands of tiles a frame
         self.target_y = world_y
         self.popping = False
         self.pop_start = 0
         self.alive = True
+        self.place()
+
+    def place(self):
+        """The blits of the tile and of its highlight glow, kept until it moves (nothing is allocated per frame)."""
+        x, y = int(self.x) + TILE_INSET, int(self.y) + TILE_INSET
+        self.blit = (self.sprite, (x, y))
+        self.glow = (GLOW, (x - GLOW_PAD, y - GLOW_PAD))
 
     def update(self, dt):
         if self.y < self.target_y:
             self.y = min(self.target_y, self.y + DROP_SPEED * (dt / 16.67))
-
-    def draw(self, surf, highlight=False, flash_phase=1.0):
-        if not self.alive:
-            return
-        rect = pygame.Rect(self.x, self.y, TILE - 8, TILE - 8)
-        rect.inflate_ip(-8, -8)
-        if highlight:
-            glow = pygame.Surface((rect.w + 14, rect.h + 14), pygame.SRCALPHA)
-            alpha = 80 + int(80 * flash_phase)
-            pygame.draw.rect(glow, (255, 255, 255, alpha), glow.get_rect(), border_radius=22)
-            surf.blit(glow, (rect.x - 7, rect.y - 7))
-        pygame.draw.rect(surf, self.color, rect, border_radius=16)
-        sheen = pygame.Surface((rect.w, rect.h), pygame.SRCALPHA)
-        pygame.draw.ellipse(sheen, (255, 255, 255, 48),
-                            (rect.w * 0.1, -rect.h * 0.25, rect.w * 0.8, rect.h * 0.7))
-        surf.blit(sheen, rect.topleft)
+            self.place()
 
 # ========= Utility =========
 def world_pos(r, c):
     return GRID_X + c * TILE, GRID_Y + r * TILE
 
-def random_symbol_with_bias(grid, r, c):
-    if random.random() < 0.35:
-        neighbors = []
-        if r > 0 and grid[r-1][c] is not None:
-            neighbors.append(grid[r-1][c].color)
-        if c > 0 and grid[r][c-1] is not None:
-            neighbors.append(grid[r][c-1].color)
-        if neighbors:
-            return random.choice(neighbors)
-    return random.choices(SYMBOLS, weights=SYMBOL_WEIGHTS, k=1)[0]
+def symbol_grid(grid):
+    return [[t.color if t else None for t in row] for row in grid]
 
 def make_initial_grid():
+    colors = make_grid(rng, ROWS, COLS)
     grid = [[None for _ in range(COLS)] for _ in range(ROWS)]
     for r in range(ROWS):
         for c in range(COLS):
-            color = random_symbol_with_bias(grid, r, c)
             x, y = world_pos(r, c)
-            grid[r][c] = Tile(color, r, c, x, y)
+            grid[r][c] = Tile(colors[r][c], r, c, x, y)
     return grid
 
-def scan_clusters(grid):
-    seen = [[False]*COLS for _ in range(ROWS)]
-    clusters = []
-    for r in range(ROWS):
-        for c in range(COLS):
-            tile = grid[r][c]
-            if tile is None or seen[r][c]:
-                continue
-            color = tile.color
-            q = deque([(r, c)])
-            blob = []
-            seen[r][c] = True
-            while q:
-                rr, cc = q.popleft()
-                blob.append((rr, cc))
-                for dr, dc in ((1,0),(-1,0),(0,1),(0,-1)):
-                    nr, nc = rr+dr, cc+dc
-                    if 0 <= nr < ROWS and 0 <= nc < COLS and not seen[nr][nc]:
-                        t2 = grid[nr][nc]
-                        if t2 and t2.color == color:
-                            seen[nr][nc] = True
-                            q.append((nr, nc))
-            if len(blob) >= 3:
-                clusters.append(blob)
-    return clusters
-
 def mark_popping(grid, clusters, now_ms):
     for blob in clusters:
         for r, c in blob:
@@ -204,29 +212,28 @@ def perform_pop(grid, bet, floating_texts):
                 t.alive = False
                 grid[r][c] = None
                 popped_positions.append((r, c))
-                fx, fy = world_pos(r, c)
-                floating_texts.append(
-                    FloatingText(f"+{per_tile_value:.2f}", (fx + TILE//3, fy + TILE//3))
-                )
+                if TILE >= TEXT_PER_TILE:
+                    fx, fy = world_pos(r, c)
+                    floating_texts.append(
+                        FloatingText(f"+{per_tile_value:.2f}", (fx + TILE//3, fy + TILE//3))
+                    )
+    if TILE < TEXT_PER_TILE and popped_positions:
+        # the step's total, over the middle of what popped
+        r = sum(r for r, _ in popped_positions) // len(popped_positions)
+        c = sum(c for _, c in popped_positions) // len(popped_positions)
+        fx, fy = world_pos(r, c)
+        floating_texts.append(FloatingText(f"+{per_tile_value * len(popped_positions):.2f}", (fx, fy)))
     return popped_positions
 
-def collapse_columns(grid):
-    for c in range(COLS):
-        stack = [grid[r][c] for r in range(ROWS) if grid[r][c] is not None]
-        for r in range(ROWS-1, -1, -1):
-            t = stack.pop() if stack else None
-            grid[r][c] = t
+def drop_columns(grid, popped):
+    collapse_columns(grid)
+    for c in {c for _, c in popped}:   # the other columns did not move
+        for r in range(ROWS):
+            t = grid[r][c]
             if t:
                 t.row, t.col = r, c
                 t.x, t.target_y = world_pos(r, c)
 
-def fill_new_tiles(grid):
-    for r in range(ROWS-1, -1, -1):
-        for c in range(COLS):
-            if grid[r][c] is None:
-                color = random_symbol_with_bias(grid, r, c)
-                x, y = world_pos(r, c)
-                grid[r][c] = Tile(color, r, c, x, y)
 
 # ========= Game State =========
 STATE_IDLE = "idle"
@@ -238,76 +245,99 @@ minus_btn = Button((60, HEIGHT - 210, 90, 90), "–")
 plus_btn  = Button((WIDTH - 150, HEIGHT - 210, 90, 90), "+")
 max_btn   = Button((WIDTH//2 - 120, HEIGHT - 110, 240, 70), "MAX BET")
 
-grid = make_initial_grid()
+rng = random.Random()   # every outcome comes from here (seeded at start-up); animation jitter uses the global random
 credits = float(START_CREDITS)
 bet = 5.0
+spins = 0
+grid = []        # the board's Tiles, dealt by make_initial_grid() once the display is open
 
 state = STATE_IDLE
 state_timer = 0
-last_time = pygame.time.get_ticks()
 pending_clusters = []
+tracker = None   # ClusterTracker of the spin being resolved
+rescan_due = False   # a refill is being dealt; once it is, the tracker catches up, then rescans
 total_popped_this_spin = 0
 last_fill_time = 0
 floating_texts = []
+symbols = None   # the spin's symbol grid, drawn cell by cell as the tiles are dealt
+to_deal = []     # the cells being dealt (a new grid or a refill), in the order the rules draw them
+dealt_count = 0
+log = NullLog()  # the session log and the journal, opened by the main loop
+journal = None
 
 def start_spin():
-    global state, state_timer, total_popped_this_spin, pending_clusters
+    global state, state_timer, total_popped_this_spin, pending_clusters, tracker, symbols, to_deal, dealt_count
     state = STATE_SPIN_SHAKE
     state_timer = 0
     total_popped_this_spin = 0
-    for r in range(ROWS):
-        for c in range(COLS):
-            color = random_symbol_with_bias(grid, r, c)
-            x, y = world_pos(r, c)
-            grid[r][c] = Tile(color, r, c, x, y)
+    pending_clusters, tracker = None, None   # the first scan is made during the shake
+    symbols = [[None for _ in range(COLS)] for _ in range(ROWS)]
+    grid[:] = [[None for _ in range(COLS)] for _ in range(ROWS)]
+    to_deal, dealt_count = [(r, c) for r in range(ROWS) for c in range(COLS)], 0   # make_grid's order
+    deal_tiles(DEAL_PER_FRAME)
+
+def deal_tiles(count):
+    """Draw the symbols of up to `count` more cells of to_deal and give them their tiles.
+
+    The symbols come from rng in to_deal's order, the order make_grid and
+    fill_empty draw them in, so a grid dealt over several frames is the one
+    play_spin would make at once.
+    """
+    global dealt_count
+    end = min(len(to_deal), dealt_count + count)
+    for r, c in to_deal[dealt_count:end]:
+        symbol = symbols[r][c] = random_symbol_with_bias(symbols, r, c, rng)
+        x, y = world_pos(r, c)
+        grid[r][c] = Tile(symbol, r, c, x, y)
+    dealt_count = end
+
+def start_refill():
+    """Queue the holes left by the last drop for deal_tiles, bottom row first."""
+    global symbols, to_deal, dealt_count
+    symbols = symbol_grid(grid)
+    to_deal, dealt_count = empty_cells(symbols), 0
 
 def settle_and_score():
-    global credits, state, last_win
-    payout = total_popped_this_spin * bet * PAYOUT_PER_TILE_FACTOR
+    global credits, state, last_win, spins
+    payout = tile_payout(total_popped_this_spin, bet)
     credits += payout
     last_win = payout  # Store the win here
     state = STATE_IDLE
-
-# ========= Main Loop =========
-running = True
-while running:
-    now = pygame.time.get_ticks()
-    dt = now - last_time
-    last_time = now
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mx, my = event.pos
-            if state == STATE_IDLE:
-                if minus_btn.clicked((mx, my)):
-                    bet = max(MIN_BET, bet - 1)
-                elif plus_btn.clicked((mx, my)):
-                    bet = min(MAX_BET, bet + 1)
-                elif max_btn.clicked((mx, my)):
-                    bet = MAX_BET
-                elif spin_btn.clicked((mx, my)) and credits >= bet:
-                    credits -= bet
-                    start_spin()
-
-    for r in range(ROWS):
-        for c in range(COLS):
-            t = grid[r][c]
-            if t:
+    spins += 1
+    log.check({'spin': spins, 'popped': total_popped_this_spin, 'payout': payout, 'credits': credits})
+    if journal:
+        journal.round(bet, payout, credits, total_popped_this_spin.to_bytes(4, "little") + bytes((ROWS, COLS)))
+
+def update_tiles(dt):
+    global floating_texts
+    for row in grid:
+        for t in row:
+            if t and t.y < t.target_y:
                 t.update(dt)
 
     for ft in floating_texts:
         ft.update(dt)
     floating_texts = [ft for ft in floating_texts if ft.is_alive()]
 
+def step_cascade(now, dt):
+    """Advance the spin state machine one frame: shake, then pop / drop / refill until the grid settles."""
+    global state, state_timer, tracker, pending_clusters, total_popped_this_spin, last_fill_time, rescan_due
     if state == STATE_SPIN_SHAKE:
         state_timer += dt
-        if state_timer >= SPIN_SHAKE_TIME:
+        shaken = state_timer >= SPIN_SHAKE_TIME
+        # the deal, the packing and the first scan each get frames of their own while
+        # the spin shakes; a mega board does not fit them all in one 60 FPS frame
+        if dealt_count < len(to_deal):
+            deal_tiles(len(to_deal) if shaken else DEAL_PER_FRAME)
+            if not shaken: return
+        if tracker is None:
+            tracker = ClusterTracker(symbols)
+            if not shaken: return
+        if pending_clusters is None:
+            pending_clusters = tracker.scan()
+        if shaken:
             state = STATE_RESOLVE
             state_timer = 0
-            pending_clusters = scan_clusters(grid)
             if pending_clusters:
                 mark_popping(grid, pending_clusters, now)
             else:
@@ -315,54 +345,64 @@ while running:
 
     elif state == STATE_RESOLVE:
         if pending_clusters:
-            earliest = min(grid[r][c].pop_start for blob in pending_clusters for r, c in blob)
-            if now - earliest >= POP_FLASH_TIME:
+            r, c = pending_clusters[0][0]   # mark_popping stamped every pending tile at once
+            if now - grid[r][c].pop_start >= POP_FLASH_TIME:
                 popped = perform_pop(grid, bet, floating_texts)
                 total_popped_this_spin += len(popped)
                 pending_clusters = []
-                collapse_columns(grid)
+                tracker.pop(popped)
+                drop_columns(grid, popped)
                 last_fill_time = now
+        elif dealt_count < len(to_deal):
+            deal_tiles(DEAL_PER_FRAME)
+        elif rescan_due:
+            # the refill is dealt: repack it on this frame and rescan on the next,
+            # on a mega board the two would not fit one 60 FPS frame
+            rescan_due = False
+            tracker.fill(symbols)
+            pending_clusters = None
+        elif pending_clusters is None:
+            pending_clusters = tracker.scan()
+            if pending_clusters:
+                mark_popping(grid, pending_clusters, now)
+            else:
+                settle_and_score()
         else:
             if now - last_fill_time >= FILL_STAGGER:
-                fill_new_tiles(grid)
-                pending_clusters = scan_clusters(grid)
-                if pending_clusters:
-                    mark_popping(grid, pending_clusters, now)
-                else:
-                    settle_and_score()
-
-    # ======= Draw =======
+                start_refill()
+                deal_tiles(DEAL_PER_FRAME)
+                rescan_due = True
+
+# ========= Draw =========
+def draw_scene(now):
     screen.fill(BLACK)
 
     pygame.draw.rect(screen, (28, 28, 40), (0, 0, WIDTH, 160))
-    title = BIG.render("ULTRAEDGE CASCADE SLOTS", True, WHITE)
+    title = TEXT.render(BIG, "ULTRAEDGE CASCADE SLOTS", True, WHITE)
     screen.blit(title, title.get_rect(center=(WIDTH//2, 60)))
 
     pygame.draw.rect(screen, (24, 24, 32), (40, 170, WIDTH-80, 90), border_radius=18)
-    credits_text = FONT.render(f"Credits: {credits:.2f}", True, UI_GOLD)
-    bet_text = FONT.render(f"Bet: {bet:.2f}", True, UI_ACCENT)
+    credits_text = TEXT.render(FONT, f"Credits: {credits:.2f}", True, UI_GOLD)
+    bet_text = TEXT.render(FONT, f"Bet: {bet:.2f}", True, UI_ACCENT)
     screen.blit(credits_text, (60, 200))
     screen.blit(bet_text, (WIDTH//2 + 50, 200))
 
-    for r in range(ROWS):
-        for c in range(COLS):
-            cell = pygame.Rect(GRID_X + c*TILE, GRID_Y + r*TILE, TILE, TILE)
-            pygame.draw.rect(screen, (16, 16, 26), cell, border_radius=18)
-            pygame.draw.rect(screen, (45, 45, 70), cell, 2, border_radius=18)
+    screen.blit(BOARD_BG, (GRID_X, GRID_Y))
 
     flash_phase = (math.sin(now / 80.0) + 1) * 0.5
-    highlight_positions = set()
-    if state == STATE_RESOLVE and pending_clusters:
-        for blob in pending_clusters:
-            for r, c in blob:
-                highlight_positions.add((r, c))
-
-    for r in range(ROWS):
-        for c in range(COLS):
-            t = grid[r][c]
-            if t:
-                highlight = (r, c) in highlight_positions
-                t.draw(screen, highlight=highlight, flash_phase=flash_phase)
+    # the pending clusters are exactly the tiles marked popping
+    highlight = state == STATE_RESOLVE and bool(pending_clusters)
+
+    # every tile is a blit of its cached sprite, all sent to SDL in one blits call
+    GLOW.set_alpha(80 + int(80 * flash_phase))
+    sprites = []
+    for row in grid:
+        for t in row:
+            if t and t.alive:
+                if highlight and t.popping:
+                    sprites.append(t.glow)
+                sprites.append(t.blit)
+    screen.blits(sprites, False)
 
     for ft in floating_texts:
         ft.draw(screen)
@@ -373,7 +413,7 @@ while running:
     max_btn.draw(screen, enabled=(state == STATE_IDLE and bet < MAX_BET))
 
     # Small status text
-    win_text = FONT.render(f"Win: {last_win:.2f}", True, (255, 255, 255))
+    win_text = TEXT.render(FONT, f"Win: {last_win:.2f}", True, (255, 255, 255))
     win_rect = win_text.get_rect(center=(WIDTH // 2, spin_btn.rect.top - 30))
     screen.blit(win_text, win_rect)
     if state == STATE_IDLE:
@@ -382,10 +422,72 @@ while running:
         status = "Spinning..."
     else:
         status = "Resolving cascades..."
-    st = FONT.render(status, True, WHITE)
+    st = TEXT.render(FONT, status, True, WHITE)
     screen.blit(st, (GRID_X, GRID_Y + GRID_H + 20))
 
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
+# ========= Main Loop =========
+if __name__ == "__main__":
+    seed, record = session_args()
+    init_display(*grid_args())
+    rng.seed(seed)
+    grid[:] = make_initial_grid()
+    journal = Journal("cascade")
+    journal.warn_dropped()
+    credits = journal.credits(credits)
+    if journal.last: last_win = journal.last.payout
+    log = open_log("cascade", seed, record, credits=credits, bet=bet, rows=ROWS, cols=COLS)
+    overlay, trace = profiler_args()
+    PROFILE = FrameProfiler(1000 / 60, overlay=overlay, trace=trace)
+    freeze_gc()
+    last_time = pygame.time.get_ticks()
+    running = True
+    while running:
+        PROFILE.frame()
+        now = pygame.time.get_ticks()
+        dt = now - last_time
+        last_time = now
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                PROFILE.toggle_overlay()
+
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                mx, my = event.pos
+                if state == STATE_IDLE:
+                    if minus_btn.clicked((mx, my)):
+                        bet = max(MIN_BET, bet - 1)
+                        log.input('bet_down')
+                    elif plus_btn.clicked((mx, my)):
+                        bet = min(MAX_BET, bet + 1)
+                        log.input('bet_up')
+                    elif max_btn.clicked((mx, my)):
+                        bet = MAX_BET
+                        log.input('max_bet')
+                    elif spin_btn.clicked((mx, my)) and credits >= bet:
+                        log.input('spin')
+                        credits -= bet
+                        start_spin()
+        PROFILE.mark('events')
+
+        update_tiles(dt)
+        PROFILE.mark('update')
+
+        step_cascade(now, dt)
+        PROFILE.mark('cascade')
+
+        draw_scene(now)
+        PROFILE.draw_overlay(screen)
+        PROFILE.mark('draw')
+        journal.tick()
+        pygame.display.flip()
+        PROFILE.mark('flip')
+        clock.tick(60)
+        PROFILE.mark('wait')
+
+    PROFILE.close()
+    log.close()
+    journal.close()
+    pygame.quit()
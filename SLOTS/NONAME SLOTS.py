@@ -1,46 +1,30 @@
 import pygame
 import random
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gamecore.text_cache import TEXT
+from gamecore.replay import session_args, open_log, NullLog
+from gamecore.journal import Journal, CARRY
+from gamecore.frame_profiler import FrameProfiler, profiler_args
+from paylines import (ROWS, COLS, WAGER_MIN, WAGER_MAX, SYMBOLS, WEIGHTED_SYMBOLS, WILD_SYMBOL,
+                      random_grid, spin as spin_grid, line_payout)
 
 # Setup
-pygame.init()
 WIDTH, HEIGHT = 720, 1280  # Smartphone portrait resolution
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Slot Machine")
-clock = pygame.time.Clock()
+screen = clock = None  # opened by init_display()
 
 # Game config
-ROWS, COLS = 5, 4
 TILE_SIZE = 150  # Reduced tile size for mobile
 SPIN_TIME = 30
-WAGER_MIN, WAGER_MAX = 10, 100
 FLASH_TIME = 60
 
 # Fonts and colors
-FONT = pygame.font.SysFont("Arial", 24, bold=True)
-BIG_FONT = pygame.font.SysFont("Arial", 32, bold=True)
+FONT = BIG_FONT = None  # loaded by init_display()
 WHITE, BLACK = (255, 255, 255), (0, 0, 0)
 YELLOW, BLUE, BG_COLOR = (255, 255, 0), (0, 255, 255), (30, 30, 30)
 
-# Symbols
-SYMBOLS = [
-    {"color": (255, 0, 0), "name": "Cherry", "multiplier": 1, "is_wild": False},
-    {"color": (0, 255, 0), "name": "Gem", "multiplier": 5, "is_wild": False},
-    {"color": (0, 0, 255), "name": "Bell", "multiplier": 3, "is_wild": False},
-    {"color": (255, 255, 0), "name": "Seven", "multiplier": 10, "is_wild": False},
-    {"color": (255, 105, 180), "name": "Star", "multiplier": 4, "is_wild": False},
-]
-# Add a weights list to bias symbol selection
-WEIGHTED_SYMBOLS = (
-    [SYMBOLS[0]] * 14 +  # Cherry (common)
-    [SYMBOLS[1]] * 7 +   # Gem
-    [SYMBOLS[2]] * 5 +   # Bell
-    [SYMBOLS[3]] * 2 +   # Seven (rare)
-    [SYMBOLS[4]] * 4     # Star
-)
-
-WILD_SYMBOL = {"color": (200, 0, 200), "name": "Wild", "multiplier": 1, "is_wild": True}
-
 # UI Rects
 spin_button = pygame.Rect(WIDTH // 2 - 100, HEIGHT - 300, 200, 60)
 auto_spin_button = pygame.Rect(WIDTH // 2 - 100, HEIGHT - 230, 200, 60)
@@ -62,7 +46,8 @@ shop_credit_buttons = [
 display_credits = 0  # starts equal to credits
 credits = 0
 wager = 10
-grid = [[random.choice(WEIGHTED_SYMBOLS) for _ in range(COLS)] for _ in range(ROWS)]
+spins = 0
+grid = random_grid()
 spinning = False
 spin_frames = 0
 payout = 0
@@ -78,25 +63,36 @@ total_credits_won = 0
 auto_spin = False
 auto_spin_pause = 0  # frames to wait before next spin
 PAUSE_DURATION = 30  # 30 frames ≈ 1 second at 30 FPS
+rng = random.Random()   # spin outcomes only (seeded at start-up); the reel animation uses the global random
+log = NullLog()  # the session log and the journal, opened by the main loop
+journal = None
 
 
-def read_log():
-    global total_credits_spent, total_credits_won
-    if not os.path.exists("slot_log.txt"):
-        return
-    with open("slot_log.txt", "r") as f:
-        for line in f:
-            if "Total Credits Spent" in line:
-                total_credits_spent = int(line.strip().split(":")[1].strip())
-            elif "Total Credits Won" in line:
-                total_credits_won = int(line.strip().split(":")[1].strip())
-
-def write_log():
-    with open("slot_log.txt", "w") as f:
-        f.write(f"Total Credits Spent: {total_credits_spent}\n")
-        f.write(f"Total Credits Won: {total_credits_won}\n")
+def init_display():
+    """Open the window and load the fonts; run before anything is drawn."""
+    global screen, clock, FONT, BIG_FONT
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Slot Machine")
+    clock = pygame.time.Clock()
+    FONT = pygame.font.SysFont("Arial", 24, bold=True)
+    BIG_FONT = pygame.font.SysFont("Arial", 32, bold=True)
 
-read_log()
+def read_log():
+    """Credits and lifetime totals from the journal; a new journal first carries over slot_log.txt."""
+    global total_credits_spent, total_credits_won, credits, display_credits
+    if not journal.seq and os.path.exists("slot_log.txt"):
+        spent = won = 0
+        with open("slot_log.txt", "r") as f:
+            for line in f:
+                if "Total Credits Spent" in line:
+                    spent = int(line.strip().split(":")[1].strip())
+                elif "Total Credits Won" in line:
+                    won = int(line.strip().split(":")[1].strip())
+        journal.append(CARRY, spent, won, credits)
+        journal.commit()
+    total_credits_spent, total_credits_won = int(journal.wagered), int(journal.paid)
+    credits = display_credits = int(journal.credits(credits))
 
 def draw_grid():
     x_offset = (WIDTH - (COLS * TILE_SIZE)) // 2
@@ -107,7 +103,7 @@ def draw_grid():
             rect = pygame.Rect(x_offset + col * TILE_SIZE, y_offset + row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
             pygame.draw.rect(screen, symbol["color"], rect)
             pygame.draw.rect(screen, BLACK, rect, 3)
-            label = FONT.render(symbol["name"], True, BLACK)
+            label = TEXT.render(FONT, symbol["name"], True, BLACK)
             screen.blit(label, (rect.x + 5, rect.y + 5))
 
 def draw_info_screen():
@@ -115,7 +111,7 @@ def draw_info_screen():
     overlay.set_alpha(220)
     overlay.fill((20, 20, 20))
     screen.blit(overlay, (0, 0))
-    screen.blit(BIG_FONT.render("Symbol Info", True, WHITE), (WIDTH // 2 - 100, 30))
+    screen.blit(TEXT.render(BIG_FONT, "Symbol Info", True, WHITE), (WIDTH // 2 - 100, 30))
 
     for i, symbol in enumerate(SYMBOLS + [WILD_SYMBOL]):
         x = 100
@@ -126,84 +122,84 @@ def draw_info_screen():
         if symbol["is_wild"]:
             desc = f"{symbol['name']} - substitutes any symbol"
             bonus = "50% chance to double total win!"
-            screen.blit(FONT.render(desc, True, WHITE), (x + 80, y + 5))
-            screen.blit(FONT.render(bonus, True, YELLOW), (x + 80, y + 30))
+            screen.blit(TEXT.render(FONT, desc, True, WHITE), (x + 80, y + 5))
+            screen.blit(TEXT.render(FONT, bonus, True, YELLOW), (x + 80, y + 30))
         else:
             label = f"x{symbol['multiplier']} payout"
             desc = f"{symbol['name']} - {label}"
-            screen.blit(FONT.render(desc, True, WHITE), (x + 80, y + 15))
+            screen.blit(TEXT.render(FONT, desc, True, WHITE), (x + 80, y + 15))
 
-    screen.blit(FONT.render("Click INFO again to close", True, YELLOW), (WIDTH // 2 - 140, HEIGHT - 50))
+    screen.blit(TEXT.render(FONT, "Click INFO again to close", True, YELLOW), (WIDTH // 2 - 140, HEIGHT - 50))
 
 def draw_shop_screen():
     overlay = pygame.Surface((WIDTH, HEIGHT))
     overlay.set_alpha(230)
     overlay.fill((40, 40, 40))
     screen.blit(overlay, (0, 0))
-    screen.blit(BIG_FONT.render("Shop", True, WHITE), (WIDTH // 2 - 50, 40))
+    screen.blit(TEXT.render(BIG_FONT, "Shop", True, WHITE), (WIDTH // 2 - 50, 40))
 
     for item in shop_credit_buttons:
         pygame.draw.rect(screen, (100, 200, 100), item["rect"])
         pygame.draw.rect(screen, BLACK, item["rect"], 3)
         label = f"+{item['credits']} Credits - ${item['price']}"
-        text = BIG_FONT.render(label, True, BLACK)
+        text = TEXT.render(BIG_FONT, label, True, BLACK)
         screen.blit(text, (item["rect"].x + 30, item["rect"].y + 10))
 
     pygame.draw.rect(screen, (200, 50, 50), shop_back_button)
     pygame.draw.rect(screen, BLACK, shop_back_button, 3)
-    screen.blit(FONT.render("BACK", True, WHITE), (shop_back_button.x + 10, shop_back_button.y + 10))
+    screen.blit(TEXT.render(FONT, "BACK", True, WHITE), (shop_back_button.x + 10, shop_back_button.y + 10))
 
 def draw_ui():
     # SPIN
     pygame.draw.rect(screen, (200, 200, 200), spin_button)
     pygame.draw.rect(screen, BLACK, spin_button, 3)
-    screen.blit(FONT.render("SPIN", True, BLACK), (spin_button.x + 60, spin_button.y + 15))
+    screen.blit(TEXT.render(FONT, "SPIN", True, BLACK), (spin_button.x + 60, spin_button.y + 15))
 
     # AUTO SPIN
     color = (100, 255, 100) if auto_spin else (180, 180, 180)
     pygame.draw.rect(screen, color, auto_spin_button)
     pygame.draw.rect(screen, BLACK, auto_spin_button, 3)
     label = "AUTO ON" if auto_spin else "AUTO OFF"
-    screen.blit(FONT.render(label, True, BLACK), (auto_spin_button.x + 50, auto_spin_button.y + 15))
+    screen.blit(TEXT.render(FONT, label, True, BLACK), (auto_spin_button.x + 50, auto_spin_button.y + 15))
 
     # WAGER DISPLAY
-    wager_text = BIG_FONT.render(f"Wager: {wager}", True, WHITE)
+    wager_text = TEXT.render(BIG_FONT, f"Wager: {wager}", True, WHITE)
     screen.blit(wager_text, (WIDTH // 2 - wager_text.get_width() // 2, HEIGHT - 160))
 
     # WAGER UP/DOWN
     pygame.draw.rect(screen, WHITE, wager_up_button)
     pygame.draw.rect(screen, BLACK, wager_up_button, 2)
-    screen.blit(FONT.render("+", True, BLACK), (wager_up_button.x + 10, wager_up_button.y + 5))
+    screen.blit(TEXT.render(FONT, "+", True, BLACK), (wager_up_button.x + 10, wager_up_button.y + 5))
     pygame.draw.rect(screen, WHITE, wager_down_button)
     pygame.draw.rect(screen, BLACK, wager_down_button, 2)
-    screen.blit(FONT.render("-", True, BLACK), (wager_down_button.x + 10, wager_down_button.y + 5))
+    screen.blit(TEXT.render(FONT, "-", True, BLACK), (wager_down_button.x + 10, wager_down_button.y + 5))
 
     # MAX/MIN
     pygame.draw.rect(screen, WHITE, max_bet_button)
     pygame.draw.rect(screen, BLACK, max_bet_button, 2)
-    screen.blit(FONT.render("MAX", True, BLACK), (max_bet_button.x + 15, max_bet_button.y + 5))
+    screen.blit(TEXT.render(FONT, "MAX", True, BLACK), (max_bet_button.x + 15, max_bet_button.y + 5))
 
     pygame.draw.rect(screen, WHITE, min_bet_button)
     pygame.draw.rect(screen, BLACK, min_bet_button, 2)
-    screen.blit(FONT.render("MIN", True, BLACK), (min_bet_button.x + 15, min_bet_button.y + 5))
+    screen.blit(TEXT.render(FONT, "MIN", True, BLACK), (min_bet_button.x + 15, min_bet_button.y + 5))
 
     # SHOP & INFO
     pygame.draw.rect(screen, (255, 165, 0), shop_button)
     pygame.draw.rect(screen, BLACK, shop_button, 2)
-    screen.blit(FONT.render("SHOP", True, WHITE), (shop_button.x + 10, shop_button.y + 10))
+    screen.blit(TEXT.render(FONT, "SHOP", True, WHITE), (shop_button.x + 10, shop_button.y + 10))
 
     pygame.draw.rect(screen, (100, 100, 255), info_button)
     pygame.draw.rect(screen, BLACK, info_button, 2)
-    screen.blit(FONT.render("INFO", True, WHITE), (info_button.x + 10, info_button.y + 10))
+    screen.blit(TEXT.render(FONT, "INFO", True, WHITE), (info_button.x + 10, info_button.y + 10))
 
     # Credits display
-    screen.blit(FONT.render(f"Credits: {int(display_credits)}", True, WHITE), (300, 880))
+    screen.blit(TEXT.render(FONT, f"Credits: {int(display_credits)}", True, WHITE), (300, 880))
 
     if payout > 0:
         win_text = f"You won {payout}!"
         if wild_doubler_triggered:
             win_text += " (Doubled by Wild!)"
-        screen.blit(FONT.render(win_text, True, YELLOW), (20, 60))
+        screen.blit(TEXT.render(FONT, win_text, True, YELLOW), (20, 60))
 
 def animate_spin():
     global spin_frames, spinning
@@ -216,74 +212,25 @@ def animate_spin():
         spin_frames += 1
     else:
         spinning = False
+        log.input('resolve')
         spin()
 
 def spin():
     global grid, wild_columns, wild_doubler_triggered
-    wild_columns.clear()
-    wild_doubler_triggered = False
-    grid = []
-
-    for row in range(ROWS):
-        new_row = []
-        for col in range(COLS):
-            if col in [1, 3] and random.random() < 0.01:
-                new_row.append(WILD_SYMBOL)
-                if col not in wild_columns:
-                    wild_columns.append(col)
-            else:
-                new_row.append(random.choice(WEIGHTED_SYMBOLS))
-        grid.append(new_row)
-
-    for col in wild_columns:
-        for row in range(ROWS):
-            grid[row][col] = WILD_SYMBOL
-
-    if wild_columns and random.random() < 0.5:
-        wild_doubler_triggered = True
-
-def symbol_match(sym_list):
-    names = [s["name"] for s in sym_list]
-    base = names[0]
-    matches = sum(1 for s in sym_list if s["name"] == base or s["is_wild"])
-    return matches >= len(sym_list)  # Require full match
+    grid, wild_columns, wild_doubler_triggered = spin_grid(rng)
 
 def calculate_payout():
-    global payout, credits, winning_lines, flash_index, flash_timer, total_credits_won
-    payout = 0
-    winning_lines.clear()
-
-    for row_idx, row in enumerate(grid):
-        if symbol_match(row):
-            winning_lines.append(("row", row_idx))
-            payout += row[0]["multiplier"] * wager
-
-    for col in range(COLS):
-        col_syms = [grid[r][col] for r in range(ROWS)]
-        if symbol_match(col_syms):
-            winning_lines.append(("col", col))
-            payout += col_syms[0]["multiplier"] * wager
-
-    diag1 = [grid[i][i] for i in range(min(ROWS, COLS))]
-    if symbol_match(diag1):
-        winning_lines.append(("diag", "tlbr"))
-        payout += diag1[0]["multiplier"] * wager
-
-    diag2 = [grid[i][COLS - 1 - i] for i in range(min(ROWS, COLS))]
-    if symbol_match(diag2):
-        winning_lines.append(("diag", "trbl"))
-        payout += diag2[0]["multiplier"] * wager
-
-    if wild_doubler_triggered:
-        payout *= 2
+    global payout, credits, winning_lines, flash_index, flash_timer, total_credits_won, spins
+    payout, winning_lines = line_payout(grid, wager, wild_doubler_triggered)
 
     total_credits_won += payout
     credits += payout
+    spins += 1
+    log.check({'spin': spins, 'payout': payout, 'lines': [list(l) for l in winning_lines], 'credits': credits})
+    if journal: journal.round(wager, payout, credits, bytes([len(winning_lines)]))
     flash_index = 0
     flash_timer = 0
 
-    write_log()
-
 def draw_paylines():
     if not winning_lines:
         return
@@ -312,91 +259,125 @@ def draw_paylines():
         flash_index += 1
 
 # Game loop
-running = True
-while running:
-    screen.fill(BG_COLOR)
-
-    if show_info:
-        draw_info_screen()
-    elif show_shop:
-        draw_shop_screen()
-    else:
-        draw_grid()
-        draw_paylines()
-        draw_ui()
-
-    pygame.draw.rect(screen, (100, 100, 255), info_button)
-    pygame.draw.rect(screen, BLACK, info_button, 3)
-    screen.blit(FONT.render("INFO", True, WHITE), (info_button.x + 5, info_button.y + 5))
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            if show_shop:
-                if shop_back_button.collidepoint(event.pos):
-                    show_shop = False
-                for item in shop_credit_buttons:
-                    if item["rect"].collidepoint(event.pos):
-                        credits += item["credits"]
+if __name__ == "__main__":
+    init_display()
+    journal = Journal("paylines")
+    journal.warn_dropped()
+    read_log()
+    seed, record = session_args()
+    rng.seed(seed)
+    log = open_log("paylines", seed, record, credits=credits, wager=wager)
+    overlay, trace = profiler_args()
+    PROFILE = FrameProfiler(1000 / 30, overlay=overlay, trace=trace)
+    running = True
+    while running:
+        PROFILE.frame()
+        screen.fill(BG_COLOR)
+
+        if show_info:
+            draw_info_screen()
+        elif show_shop:
+            draw_shop_screen()
+        else:
+            draw_grid()
+            draw_paylines()
+            draw_ui()
+
+        pygame.draw.rect(screen, (100, 100, 255), info_button)
+        pygame.draw.rect(screen, BLACK, info_button, 3)
+        screen.blit(TEXT.render(FONT, "INFO", True, WHITE), (info_button.x + 5, info_button.y + 5))
+        PROFILE.draw_overlay(screen)
+        PROFILE.mark('draw')
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                PROFILE.toggle_overlay()
+
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if show_shop:
+                    if shop_back_button.collidepoint(event.pos):
                         show_shop = False
-            elif show_info:
-                if info_button.collidepoint(event.pos):
-                    show_info = False
-            elif auto_spin_button.collidepoint(event.pos):
-                 auto_spin = not auto_spin
-
-            else:
-                if info_button.collidepoint(event.pos):
-                    show_info = True
-                elif shop_button.collidepoint(event.pos):
-                    show_shop = True
-                elif spin_button.collidepoint(event.pos) and not spinning and credits >= wager:
-                    credits -= wager
-                    total_credits_spent += wager
-                    spinning = True
-                    spin_frames = 0
-                    payout = 0
-                    winning_lines.clear()
-                elif not spinning:
-                    if wager_up_button.collidepoint(event.pos):
-                        wager = min(wager + 1, WAGER_MAX)
-                    elif wager_down_button.collidepoint(event.pos):
-                        wager = max(wager - 1, WAGER_MIN)
-                    elif max_bet_button.collidepoint(event.pos):
-                        wager = min(WAGER_MAX, credits)
-                    elif min_bet_button.collidepoint(event.pos):
-                        wager = WAGER_MIN
+                    for item in shop_credit_buttons:
+                        if item["rect"].collidepoint(event.pos):
+                            credits += item["credits"]
+                            log.input('buy', item["credits"])
+                            journal.deposit(item["credits"], credits)
+                            show_shop = False
+                elif show_info:
+                    if info_button.collidepoint(event.pos):
+                        show_info = False
+                elif auto_spin_button.collidepoint(event.pos):
+                     auto_spin = not auto_spin
+
+                else:
+                    if info_button.collidepoint(event.pos):
+                        show_info = True
+                    elif shop_button.collidepoint(event.pos):
+                        show_shop = True
+                    elif spin_button.collidepoint(event.pos) and not spinning and credits >= wager:
+                        log.input('spin')
+                        credits -= wager
+                        total_credits_spent += wager
+                        spinning = True
+                        spin_frames = 0
+                        payout = 0
+                        winning_lines.clear()
+                    elif not spinning:
+                        if wager_up_button.collidepoint(event.pos):
+                            wager = min(wager + 1, WAGER_MAX)
+                            log.input('wager_up')
+                        elif wager_down_button.collidepoint(event.pos):
+                            wager = max(wager - 1, WAGER_MIN)
+                            log.input('wager_down')
+                        elif max_bet_button.collidepoint(event.pos):
+                            wager = min(WAGER_MAX, credits)
+                            log.input('max_bet')
+                        elif min_bet_button.collidepoint(event.pos):
+                            wager = WAGER_MIN
+                            log.input('min_bet')
     
-    if spinning and not show_info and not show_shop:
-        animate_spin()
-        if not spinning:
-            calculate_payout()
-            if auto_spin and credits >= wager:
-                auto_spin_pause = PAUSE_DURATION
-
-    if auto_spin_pause > 0:
-        auto_spin_pause -= 1
-        if auto_spin_pause == 0 and not spinning and credits >= wager:
-            credits -= wager
-            total_credits_spent += wager
-            spinning = True
-            spin_frames = 0
-            payout = 0
-            winning_lines.clear()
-
-    # Animate credits increase smoothly
-    if display_credits < credits:
-        display_credits += max(1, (credits - display_credits) * 0.1)
-        if display_credits > credits:
-            display_credits = credits
-    elif display_credits > credits:
-        display_credits -= max(1, (display_credits - credits) * 0.1)
+        PROFILE.mark('events')
+
+        if spinning and not show_info and not show_shop:
+            animate_spin()
+            if not spinning:
+                calculate_payout()
+                if auto_spin and credits >= wager:
+                    auto_spin_pause = PAUSE_DURATION
+
+        if auto_spin_pause > 0:
+            auto_spin_pause -= 1
+            if auto_spin_pause == 0 and not spinning and credits >= wager:
+                log.input('spin')
+                credits -= wager
+                total_credits_spent += wager
+                spinning = True
+                spin_frames = 0
+                payout = 0
+                winning_lines.clear()
+        PROFILE.mark('spin')
+
+        # Animate credits increase smoothly
         if display_credits < credits:
-            display_credits = credits
-
-    pygame.display.flip()
-    clock.tick(30)
-
-pygame.quit()
+            display_credits += max(1, (credits - display_credits) * 0.1)
+            if display_credits > credits:
+                display_credits = credits
+        elif display_credits > credits:
+            display_credits -= max(1, (display_credits - credits) * 0.1)
+            if display_credits < credits:
+                display_credits = credits
+
+        journal.tick()
+        PROFILE.mark('update')
+        pygame.display.flip()
+        PROFILE.mark('flip')
+        clock.tick(30)
+        PROFILE.mark('wait')
+
+    PROFILE.close()
+    log.close()
+    journal.close()
+    pygame.quit()
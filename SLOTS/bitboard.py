@@ -0,0 +1,229 @@
+"""
+Bitboards for the cascade grid: one bitmask per symbol, all packed in one int.
+
+A board covers a rows x cols grid column by column, bottom row first, with
+one guard bit above every column:
+
+    bit = col*(rows+1) + (rows-1-row)
+
+so a shift by 1 moves a cell up or down its column, a shift by rows+1 moves
+it across columns, and gravity points at bit 0.  The boards of all symbols
+sit side by side in a single Python int, one lane per symbol, and each lane
+is padded by a column's worth of zero bits so no shift reaches the next
+symbol.  Every shift-and-mask below therefore works on all symbols at once.
+
+    clusters   cells with two equal neighbours seed a flood fill; every blob
+               of three or more has such a cell, and every blob that has one
+               is at least three long, so for MIN_CLUSTER 3 one multi-source
+               flood of those seeds is the whole scan.  The flooded cells are
+               split into blobs (and larger thresholds applied) by a two-pass
+               union-find over just those cells; on small boards a flood per
+               blob is cheaper and is used instead.
+    collapse   removing a cell shifts the part of its column above it down
+               one bit, in every lane at once
+    rescans    after a cascade step only the cells that moved or were refilled
+               (fallen) can be in a new cluster, so the seeds are limited to
+               them and their neighbours; the untouched board is kept as is
+    symbol_at  the lane holding a given cell's bit
+
+Any size works: one operation costs rows*cols*symbols/64 machine words, and
+the number of operations grows with the cells involved, not the grid.
+"""
+
+TABLE_BITS = 1 << 14   # packed boards up to this size are "small": collapse masks precomputed, blobs flooded
+
+
+def _indices(mask):
+    """The set bit numbers of `mask`, lowest first."""
+    if mask.bit_count() <= 16:     # a few bits: peel them off; many: one pass over the binary string
+        out = []
+        while mask:
+            low = mask & -mask
+            out.append(low.bit_length()-1)
+            mask ^= low
+        return out
+    bits = bin(mask)[:1:-1]
+    out = []
+    i = bits.find('1')
+    while i >= 0:
+        out.append(i)
+        i = bits.find('1', i+1)
+    return out
+
+
+class Layout:
+    """Bit positions, masks and packed-board operations for a rows x cols grid of `symbols` symbols."""
+
+    def __init__(self, rows, cols, min_cluster=3, symbols=1):
+        self.rows, self.cols, self.min_cluster, self.symbols = rows, cols, min_cluster, symbols
+        self.stride = s = rows + 1
+        self.size = cols*s                             # bits of one board
+        self.lane = self.size + s                      # one board plus padding
+        self.column = (1 << rows) - 1                  # one column's cells, before shifting
+        self.full = sum(self.column << c*s for c in range(cols))
+        self.ones = sum(1 << k*self.lane for k in range(symbols))   # bit 0 of every lane
+        self.every = self.repeat(self.full)            # every cell of every lane
+        self.bits = [[1 << self.index(r, c) for c in range(cols)] for r in range(rows)]
+        self._cells = [self.position(i) for i in range(self.lane)]
+        self.small = self.lane*symbols <= TABLE_BITS
+        # removing the cell at bit i: its column from i up is replaced by the part above i, shifted down
+        self._from = [self._column_from(i) for i in range(self.size)] if self.small else None
+        self._above = [m & ~self.repeat(1 << i) for i, m in enumerate(self._from)] if self.small else None
+        self._folds = []                               # shifts that OR every lane into lane 0
+        n = 1
+        while n < symbols:
+            self._folds.append(n*self.lane)
+            n *= 2
+
+    def index(self, r, c):
+        return c*self.stride + self.rows-1-r
+
+    def position(self, i):
+        """(row, col) of a bit, in any lane."""
+        c, k = divmod(i % self.lane, self.stride)
+        return self.rows-1-k, c
+
+    def repeat(self, mask):
+        """`mask` (one lane) copied into every lane."""
+        return mask * self.ones
+
+    def pack(self, grid, lanes, cells=None):
+        """The packed board of a list-of-lists grid; lanes maps symbol -> lane, None cells are left out.
+
+        With `cells` (one lane) only those cells are packed.
+        """
+        boards = [0]*self.symbols
+        if cells is None:
+            for row, bits in zip(grid, self.bits):
+                for symbol, bit in zip(row, bits):
+                    if symbol is not None: boards[lanes[symbol]] |= bit
+        else:
+            for i in _indices(cells):
+                r, c = self._cells[i]
+                if grid[r][c] is not None: boards[lanes[grid[r][c]]] |= 1 << i
+        board = 0
+        for k, b in enumerate(boards):
+            if b: board |= b << k*self.lane
+        return board
+
+    def fold(self, board):
+        """The cells set in any lane, as a single board."""
+        for shift in reversed(self._folds): board |= board >> shift
+        return board & self.full
+
+    def symbol_at(self, board, i):
+        """The symbol whose lane has bit i of the grid set, or None."""
+        hit = (board >> i) & self.ones
+        return (hit.bit_length()-1) // self.lane if hit else None
+
+    def positions(self, mask):
+        """(row, col) of every set bit."""
+        cells, lane = self._cells, self.lane
+        return [cells[i % lane] for i in _indices(mask)]
+
+    def fallen(self, cells):
+        """The cells that move or are refilled when `cells` (one lane) pop: each column from its lowest popped cell up."""
+        s, col = self.stride, self.column
+        out = 0
+        while cells:
+            low = cells & -cells
+            column = col << (low.bit_length()-1) // s * s
+            out |= column & -low                       # low and everything above it
+            cells &= ~column
+        return out
+
+    def _seeds(self, board, changed=None):
+        """Cells with an equal neighbour (min_cluster 2) or with two of them (3 and up).
+
+        With `changed` (one lane), only the seeds of blobs that can reach a
+        changed cell: a blob of 3+ through a changed cell has a seed on it
+        or next to it.
+        """
+        s = self.stride
+        lo, hi, le, ri = board & (board << 1), board & (board >> 1), board & (board << s), board & (board >> s)
+        if self.min_cluster >= 3: seeds = (lo & (hi | le | ri)) | (hi & (le | ri)) | (le & ri)
+        else: seeds = (lo | hi | le | ri) if self.min_cluster == 2 else board
+        if changed is not None: seeds &= (changed | self.neighbors(changed)) * self.ones
+        return seeds
+
+    def neighbors(self, mask):
+        """Cells orthogonally next to a cell of `mask`."""
+        s = self.stride
+        return ((mask << 1) | (mask >> 1) | (mask << s) | (mask >> s)) & self.every
+
+    def flood(self, seeds, board):
+        """Every cell of `board` connected to a cell of `seeds`."""
+        s = self.stride
+        blob = seeds
+        while True:
+            grown = (blob | (blob << 1) | (blob >> 1) | (blob << s) | (blob >> s)) & board
+            if grown == blob: return blob
+            blob = grown
+
+    def blobs(self, mask):
+        """The connected blobs of a packed mask, as lists of bit numbers: two-pass union-find.
+
+        Neighbouring bits of one lane hold the same symbol, so the first pass
+        only unions each bit with the bits below it and to its left; the
+        second groups the bits by root.
+        """
+        bits = _indices(mask)
+        index = {b: n for n, b in enumerate(bits)}
+        parent = list(range(len(bits)))
+        s = self.stride
+        for n, b in enumerate(bits):
+            for m in (index.get(b-1), index.get(b-s)):
+                if m is None: continue
+                while parent[m] != m: parent[m] = m = parent[parent[m]]
+                root = n
+                while parent[root] != root: root = parent[root]
+                if root != m: parent[max(root, m)] = min(root, m)
+        groups = {}
+        for n, b in enumerate(bits):
+            root = n
+            while parent[root] != root: root = parent[root]
+            groups.setdefault(root, []).append(b)
+        return list(groups.values())
+
+    def clusters(self, board, changed=None):
+        """Every connected blob of min_cluster+ equal cells, as lists of (row, col); with `changed`, only those that can touch it."""
+        cells, lane, n = self._cells, self.lane, self.min_cluster
+        starts = self._seeds(board, changed)
+        if self.small:
+            found = []
+            while starts:
+                blob = self.flood(starts & -starts, board)
+                starts &= ~blob
+                if blob.bit_count() >= n: found.append(self.positions(blob))
+            return found
+        return [[cells[b % lane] for b in blob] for blob in self.blobs(self.flood(starts, board)) if len(blob) >= n]
+
+    def popped(self, board, changed=None):
+        """The union of every cluster, as a packed mask; its bit_count is the number of tiles.
+
+        After a cascade step pass the cells that moved or were refilled as
+        `changed`: the rest of the grid held no cluster and still holds none,
+        so only blobs through those cells are looked for.
+        """
+        grown = self.flood(self._seeds(board, changed), board)
+        if self.min_cluster <= 3: return grown
+        return sum(1 << b for blob in self.blobs(grown) if len(blob) >= self.min_cluster for b in blob)
+
+    def without(self, board, cells):
+        """`board` with the cells of `cells` (one lane) cleared in every lane."""
+        return board & ~self.repeat(cells)
+
+    def collapse(self, board, popped):
+        """Remove the popped cells (packed, or one lane) and let every column fall toward its bottom row."""
+        for i in reversed(_indices(self.fold(popped))):   # top cell first, so the ones below keep their bits
+            if self.small: column, above = self._from[i], self._above[i]
+            else:
+                column = self._column_from(i)
+                above = column ^ self.ones << i
+            board = (board & ~column) | ((board & above) >> 1)
+        return board
+
+    def _column_from(self, i):
+        """Bit i and the cells above it in its column, in every lane."""
+        s = self.stride
+        return self.repeat((self.column << i//s*s) & -(1 << i))
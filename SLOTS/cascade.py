@@ -0,0 +1,230 @@
+"""
+Rules of the DROPPER cascade slot, without pygame.
+
+The grid is ROWS lists of COLS symbols (colors), None where a tile has
+popped.  A spin fills the grid, then repeatedly pops every orthogonally
+connected cluster of MIN_CLUSTER or more equal symbols, lets the columns
+fall and refills the holes from the top, until no cluster is left.  Each
+popped tile pays bet * PAYOUT_PER_TILE_FACTOR.
+
+DROPPER SLOT.py animates exactly these steps; play_spin runs them headless.
+scan_clusters finds the clusters on packed bitboards (bitboard.py).  The
+grid is ROWS x COLS by default and any size up to MAX_ROWS x MAX_COLS
+otherwise; the functions take the size from the grid they are given.
+CascadeSession is the machine around them (credits, bet, one seeded RNG)
+that gamecore.replay re-runs from a recorded session log.
+"""
+
+import argparse, random, sys
+from functools import lru_cache
+from itertools import accumulate
+
+from bitboard import Layout
+
+# Colors (9 balanced)
+SYMBOLS = [
+    (255, 0, 0),       # Bright Red
+    (0, 255, 0),       # Bright Green
+    (0, 0, 255),       # Bright Blue
+    (255, 255, 0),     # Yellow
+    (255, 165, 0),     # Orange
+    (128, 0, 128),     # Purple
+    (0, 255, 255),     # Cyan
+    (255, 192, 203),   # Pink
+    (165, 42, 42),     # Brown
+    (128, 128, 128),   # Gray
+    (0, 128, 128),     # Teal
+    (255, 105, 180),   # Hot Pink
+    (0, 100, 0),       # Dark Green
+    (210, 180, 140),   # Tan
+    (0, 0, 128),       # Navy Blue
+#    (240, 230, 140),   # Khaki
+    (173, 216, 230),   # Light Blue
+    (255, 20, 147),    # Deep Pink
+    (75, 0, 130),      # Indigo
+    (34, 139, 34),     # Forest Green
+]
+SYMBOL_WEIGHTS = [20] * len(SYMBOLS)  # balanced
+CUM_WEIGHTS = list(accumulate(SYMBOL_WEIGHTS))   # the same draws as weights=, without re-summing per tile
+NEIGHBOR_BIAS = 0.35   # chance a new tile copies the tile above or to its left
+
+# ========= Grid Config =========
+ROWS, COLS = 5, 5
+MAX_ROWS, MAX_COLS = 64, 64   # the "mega board" variant; every function takes its size from the grid
+MIN_CLUSTER = 3
+
+# ========= Economy =========
+START_CREDITS = 1000
+MIN_BET, MAX_BET = 1, 50
+PAYOUT_PER_TILE_FACTOR = 0.05  # per tile
+
+LANES = {symbol: lane for lane, symbol in enumerate(SYMBOLS)}
+
+
+@lru_cache(maxsize=None)
+def layout(rows, cols):
+    """The bitboard layout cluster detection uses for a rows x cols grid, one lane per symbol."""
+    return Layout(rows, cols, MIN_CLUSTER, len(SYMBOLS))
+
+BOARD = layout(ROWS, COLS)
+
+
+def grid_size(text):
+    """'ROWSxCOLS' -> (rows, cols), within MAX_ROWS x MAX_COLS."""
+    try: rows, cols = (int(n) for n in text.lower().split("x"))
+    except ValueError: raise argparse.ArgumentTypeError(f"expected ROWSxCOLS, got {text!r}")
+    if not (1 <= rows <= MAX_ROWS and 1 <= cols <= MAX_COLS):
+        raise argparse.ArgumentTypeError(f"grid must be within {MAX_ROWS}x{MAX_COLS}")
+    return rows, cols
+
+def grid_args(argv=None):
+    """--grid ROWSxCOLS for a game script; returns (rows, cols)."""
+    ap = argparse.ArgumentParser(add_help=False)
+    ap.add_argument("--grid", type=grid_size, default=(ROWS, COLS))
+    args, _ = ap.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return args.grid
+
+
+def random_symbol_with_bias(grid, r, c, rng=random):
+    if rng.random() < NEIGHBOR_BIAS:
+        neighbors = []
+        if r > 0 and grid[r-1][c] is not None:
+            neighbors.append(grid[r-1][c])
+        if c > 0 and grid[r][c-1] is not None:
+            neighbors.append(grid[r][c-1])
+        if neighbors:
+            return rng.choice(neighbors)
+    return rng.choices(SYMBOLS, cum_weights=CUM_WEIGHTS, k=1)[0]
+
+def make_grid(rng=random, rows=ROWS, cols=COLS):
+    grid = [[None for _ in range(cols)] for _ in range(rows)]
+    for r in range(rows):
+        for c in range(cols):
+            grid[r][c] = random_symbol_with_bias(grid, r, c, rng)
+    return grid
+
+def scan_clusters(grid):
+    """Every orthogonally connected blob of MIN_CLUSTER+ equal symbols, as lists of (row, col)."""
+    board = layout(len(grid), len(grid[0]))
+    return board.clusters(board.pack(grid, LANES))
+
+def pop_clusters(grid, clusters):
+    """Empty every cell of `clusters`; returns the popped positions."""
+    popped = [(r, c) for blob in clusters for r, c in blob]
+    for r, c in popped:
+        grid[r][c] = None
+    return popped
+
+def collapse_columns(grid):
+    """Let every column fall so its holes end up on top (works on any cell objects)."""
+    rows, cols = len(grid), len(grid[0])
+    for c in range(cols):
+        stack = [grid[r][c] for r in range(rows) if grid[r][c] is not None]
+        for r in range(rows-1, -1, -1):
+            grid[r][c] = stack.pop() if stack else None
+
+def empty_cells(grid):
+    """The holes of `grid` in the order fill_empty refills them: bottom row first, left to right."""
+    cols = range(len(grid[0]))
+    return [(r, c) for r in range(len(grid)-1, -1, -1) for c in cols if grid[r][c] is None]
+
+def fill_empty(grid, rng=random):
+    """Refill the holes bottom row first; returns the filled positions in fill order."""
+    filled = empty_cells(grid)
+    for r, c in filled:
+        grid[r][c] = random_symbol_with_bias(grid, r, c, rng)
+    return filled
+
+def tile_payout(popped, bet):
+    return popped * bet * PAYOUT_PER_TILE_FACTOR
+
+class ClusterTracker:
+    """The packed board of one spin's grid, kept in step with its pops, collapses and refills.
+
+    scan() only looks for clusters through the cells that moved or were
+    refilled since the previous scan; the rest of the grid had no cluster
+    then and has none now.  Only those cells are ever repacked from the
+    grid, so a cascade step costs what it changed, whatever the grid size.
+    """
+    def __init__(self, grid):
+        self.layout = layout(len(grid), len(grid[0]))
+        self.board = self.layout.pack(grid, LANES)
+        self.changed = None   # everything
+        self.fallen = 0       # cells cleared by pop() and not yet repacked
+
+    def scan(self):
+        """Clusters as scan_clusters returns them."""
+        blobs = self.layout.clusters(self.board, self.changed)
+        self.changed = 0
+        return blobs
+
+    def pop(self, popped):
+        """The positions popped; call before collapse_columns."""
+        bits = self.layout.bits
+        cells = 0
+        for r, c in popped: cells |= bits[r][c]
+        fallen = self.layout.fallen(cells)
+        self.board = self.layout.without(self.board, fallen)
+        self.fallen |= fallen
+        self.changed |= fallen
+
+    def fill(self, grid):
+        """Call after fill_empty: repacks the cells that moved or were refilled from `grid`."""
+        self.board |= self.layout.pack(grid, LANES, self.fallen)
+        self.fallen = 0
+
+
+def play_spin(bet=1.0, rng=random, rows=ROWS, cols=COLS):
+    """One complete spin without animation: (tiles popped, cascades, payout)."""
+    grid = make_grid(rng, rows, cols)
+    tracker = ClusterTracker(grid)
+    popped = cascades = 0
+    clusters = tracker.scan()
+    while clusters:
+        cells = pop_clusters(grid, clusters)
+        popped += len(cells)
+        cascades += 1
+        tracker.pop(cells)
+        collapse_columns(grid)
+        fill_empty(grid, rng)
+        tracker.fill(grid)
+        clusters = tracker.scan()
+    return popped, cascades, tile_payout(popped, bet)
+
+
+class CascadeSession:
+    """Credits, bet and spins of one DROPPER session, all outcomes drawn from `rng`.
+
+    Consumes the RNG exactly as the animated game does: the idle grid shown
+    at start-up, then one play_spin per spin.
+    """
+    INPUTS = frozenset({'bet_down', 'bet_up', 'max_bet', 'spin'})   # ops a session log may replay
+
+    def __init__(self, rng=None, credits=START_CREDITS, bet=5.0, rows=ROWS, cols=COLS):
+        self.rng = rng or random.Random()
+        self.credits, self.bet = float(credits), bet
+        self.rows, self.cols = rows, cols
+        self.grid = make_grid(self.rng, rows, cols)
+        self.spins = 0
+        self.popped = 0
+        self.last_win = 0.0
+
+    def bet_down(self): self.bet = max(MIN_BET, self.bet - 1)
+    def bet_up(self): self.bet = min(MAX_BET, self.bet + 1)
+    def max_bet(self): self.bet = MAX_BET
+
+    def spin(self):
+        if self.credits < self.bet: return False
+        self.credits -= self.bet
+        self.popped, _, self.last_win = play_spin(self.bet, self.rng, self.rows, self.cols)
+        self.credits += self.last_win
+        self.spins += 1
+        return True
+
+    def checkpoint(self):
+        return {'spin': self.spins, 'popped': self.popped, 'payout': self.last_win, 'credits': self.credits}
+
+
+def replay_session(header):
+    c = header['config']
+    return CascadeSession(random.Random(header['seed']), c['credits'], c['bet'], c.get('rows', ROWS), c.get('cols', COLS))
@@ -0,0 +1,210 @@
+"""
+Batched NumPy cascade simulator: thousands of DROPPER grids resolved at once.
+
+A batch is one int8 array of shape (N, rows, cols), EMPTY where a tile has
+popped, for the 5x5 board or any --grid up to cascade.MAX_ROWS x MAX_COLS.
+Every step of a spin is an array operation over the whole batch, with no
+Python loop over cells, rows or columns:
+
+    deal       every tile is drawn as random_symbol_with_bias draws it: the
+               same NEIGHBOR_BIAS copy of the tile above or to the left and
+               the same SYMBOL_WEIGHTS otherwise (a lookup table instead of
+               the bisect).  Each cell points at the cell it copies, and
+               pointer jumping resolves the chains in log2(rows+cols) passes
+    clusters   with MIN_CLUSTER 3, a cell pops when it or an equal neighbour
+               has two equal neighbours; any other MIN_CLUSTER labels the
+               components by min-label propagation and counts them
+    collapse   one sort down each column puts the holes on top
+    refill     a hole never has a tile above it and always has one to its
+               left, as in fill_empty's bottom-row-first order, so the
+               copies resolve with one running maximum along each row
+
+Grids that stop cascading drop out of the batch, so the loop runs until the
+last grid has settled.  The draws come from a NumPy Generator, not from
+random.Random, so this is the same game in distribution (compare its
+report with cascade_sim.py on the same --grid), not spin for spin.  Workers
+get independent SeedSequence streams as in Baccarat/parallel_sim.py.
+
+Measured on one core of the bench machine: about 200,000 spins a second on
+the 5x5 board, 60,000 on 8x8; throughput scales with --workers.
+
+    python cascade_batch.py --spins 100000000 --workers 16 --seed 7
+    python cascade_batch.py --grid 64x64 --spins 100000 --batch 256
+"""
+
+import argparse, os, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from cascade import SYMBOLS, SYMBOL_WEIGHTS, NEIGHBOR_BIAS, ROWS, COLS, MIN_CLUSTER, grid_size
+from cascade_sim import CascadeTally
+
+EMPTY = -1
+TOTAL_WEIGHT = sum(SYMBOL_WEIGHTS)
+WEIGHTED = np.repeat(np.arange(len(SYMBOLS), dtype=np.int8), SYMBOL_WEIGHTS)   # u*TOTAL_WEIGHT -> symbol
+BATCH = 8192
+
+
+def make_grids(n, rng, rows=ROWS, cols=COLS):
+    """n new grids, as make_grid deals them.
+
+    Every cell either copies the tile above or to its left (NEIGHBOR_BIAS,
+    each half the time where both are there) or takes a weighted draw, so
+    each cell points at the cell its symbol comes from.  Pointer jumping
+    follows the chains, which are shorter than rows+cols, in log2 passes.
+    """
+    cells = rows*cols
+    u = rng.random((2, n, cells))
+    drawn = WEIGHTED.take((u[1]*TOTAL_WEIGHT).astype(np.intp))
+    i = np.arange(cells)
+    r, c = divmod(i, cols)
+    from_up = (r > 0) & ((c == 0) | (u[0] < NEIGHBOR_BIAS/2))
+    source = np.where(u[0] < NEIGHBOR_BIAS, np.where(from_up, i - cols, np.where(c > 0, i - 1, i)), i)
+    source = (source + (np.arange(n)*cells)[:, None]).ravel()
+    for _ in range(int(np.ceil(np.log2(rows + cols)))):
+        source = source.take(source)
+    return drawn.ravel().take(source).reshape(n, rows, cols)
+
+
+def fill(grids, rng):
+    """fill_empty for the batch after a collapse.
+
+    The holes sit on top of their columns, so a hole never finds the tile
+    above it and always finds the one to its left (refilled already, bottom
+    row first).  A hole that copies takes the nearest drawn or standing
+    tile to its left in the row: one running maximum over the row.
+    """
+    n, rows, cols = grids.shape
+    flat = grids.reshape(-1)
+    at = np.flatnonzero(flat == EMPTY)
+    u = rng.random((2, at.size))
+    copy = np.zeros(flat.size, dtype=bool)
+    copy[at] = (u[0] < NEIGHBOR_BIAS) & (at % cols != 0)
+    flat[at] = WEIGHTED.take((u[1]*TOTAL_WEIGHT).astype(np.intp))
+    source = np.where(copy, 0, np.arange(flat.size)).reshape(n*rows, cols)
+    np.maximum.accumulate(source, axis=1, out=source)
+    return flat.take(source).reshape(grids.shape)
+
+
+def label(grids):
+    """Connected-component labels: each cell gets the smallest cell index of its blob of equal symbols."""
+    n, rows, cols = grids.shape
+    cells = rows*cols
+    no_label = np.int16(cells)   # int16 holds every index up to MAX_ROWS x MAX_COLS
+    down = (grids[:, 1:, :] == grids[:, :-1, :]) & (grids[:, 1:, :] != EMPTY)
+    right = (grids[:, :, 1:] == grids[:, :, :-1]) & (grids[:, :, 1:] != EMPTY)
+    labels = np.broadcast_to(np.arange(cells, dtype=np.int16).reshape(rows, cols), grids.shape).copy()
+    while True:
+        new = labels.copy()
+        np.minimum(new[:, :-1, :], np.where(down, labels[:, 1:, :], no_label), out=new[:, :-1, :])
+        np.minimum(new[:, 1:, :], np.where(down, labels[:, :-1, :], no_label), out=new[:, 1:, :])
+        np.minimum(new[:, :, :-1], np.where(right, labels[:, :, 1:], no_label), out=new[:, :, :-1])
+        np.minimum(new[:, :, 1:], np.where(right, labels[:, :, :-1], no_label), out=new[:, :, 1:])
+        flat = new.reshape(n, cells)
+        new = np.take_along_axis(flat, flat.astype(np.intp), axis=1).reshape(grids.shape)   # pointer jumping
+        if np.array_equal(new, labels): return labels
+        labels = new
+
+
+def cluster_mask(grids):
+    """True on every cell of a MIN_CLUSTER+ blob (what scan_clusters would pop)."""
+    if MIN_CLUSTER == 3: return local_cluster_mask(grids)
+    n, rows, cols = grids.shape
+    cells = rows*cols
+    flat = label(grids).reshape(n, cells).astype(np.intp) + (np.arange(n)*cells)[:, None]
+    sizes = np.bincount(flat.ravel(), minlength=n*cells)
+    return ((sizes[flat] >= MIN_CLUSTER) & (grids.reshape(n, cells) != EMPTY)).reshape(grids.shape)
+
+
+def local_cluster_mask(grids):
+    """cluster_mask for MIN_CLUSTER 3 without labels: a blob has three or more cells exactly when
+    one of them has two equal neighbours, so a cell pops when it or an equal neighbour has two."""
+    n, rows, cols = grids.shape
+    flat = grids.reshape(n, rows*cols)
+    filled = flat != EMPTY
+    down = (flat[:, cols:] == flat[:, :-cols]) & filled[:, cols:]
+    right = (flat[:, 1:] == flat[:, :-1]) & filled[:, 1:] & (np.arange(1, rows*cols) % cols != 0)
+    degree = np.zeros(flat.shape, dtype=np.int8)
+    degree[:, cols:] += down; degree[:, :-cols] += down
+    degree[:, 1:] += right; degree[:, :-1] += right
+    hub = degree >= 2
+    pop = hub.copy()
+    pop[:, cols:] |= down & hub[:, :-cols]; pop[:, :-cols] |= down & hub[:, cols:]
+    pop[:, 1:] |= right & hub[:, :-1]; pop[:, :-1] |= right & hub[:, 1:]
+    return pop.reshape(grids.shape)
+
+
+def collapse(grids):
+    """collapse_columns for the batch: holes to the top of each column, the tiles keeping their order.
+
+    Sorting filled*rows + row down each column gives the rows to gather,
+    holes first (rows + row still fits int8 on a MAX_ROWS board).
+    """
+    n, rows, cols = grids.shape
+    key = (grids != EMPTY).view(np.int8) * rows + np.arange(rows, dtype=np.int8)[:, None]
+    key.sort(axis=1)
+    key %= rows
+    at = key.astype(np.intp)*cols + np.arange(cols) + (np.arange(n)*(rows*cols))[:, None, None]
+    return grids.reshape(-1).take(at)
+
+
+def play_batch(n, rng, rows=ROWS, cols=COLS):
+    """n complete spins: (tiles popped, cascades) per spin, as int64 arrays."""
+    grids = make_grids(n, rng, rows, cols)
+    popped = np.zeros(n, dtype=np.int64)
+    cascades = np.zeros(n, dtype=np.int64)
+    live = np.arange(n)
+    while live.size:
+        pop = cluster_mask(grids)
+        counts = pop.reshape(pop.shape[0], -1).sum(axis=1)
+        hit = counts > 0
+        popped[live] += counts
+        cascades[live] += hit
+        if not hit.all(): live, grids, pop = live[hit], grids[hit], pop[hit]   # settled grids drop out
+        grids[pop] = EMPTY
+        grids = fill(collapse(grids), rng)
+    return popped, cascades
+
+
+def simulate(spins, rng, batch=BATCH, rows=ROWS, cols=COLS):
+    tally = CascadeTally()
+    while tally.spins < spins:
+        popped, cascades = play_batch(min(batch, spins - tally.spins), rng, rows, cols)
+        tally = tally + CascadeTally(popped.size,
+                                     np.bincount(np.minimum(cascades, CascadeTally.MAX_DEPTH), minlength=CascadeTally.MAX_DEPTH+1),
+                                     np.bincount(np.minimum(popped, CascadeTally.MAX_POPPED), minlength=CascadeTally.MAX_POPPED+1),
+                                     int(popped.sum()))
+    return tally
+
+
+def _worker(args):
+    spins, seed_seq, batch, rows, cols = args
+    return simulate(spins, np.random.default_rng(seed_seq), batch, rows, cols)
+
+
+def run(spins, workers=1, seed=None, batch=BATCH, rows=ROWS, cols=COLS):
+    """Split `spins` over `workers` independent seed streams and merge the tallies."""
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    quotas = [spins//workers + (i < spins % workers) for i in range(workers)]
+    if workers <= 1: return _worker((spins, seeds[0], batch, rows, cols))
+    with ProcessPoolExecutor(workers) as pool:
+        return sum(pool.map(_worker, [(q, s, batch, rows, cols) for q, s in zip(quotas, seeds)]), CascadeTally())
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batched NumPy RTP simulator for the DROPPER cascade slot")
+    ap.add_argument("--spins", type=int, default=10_000_000)
+    ap.add_argument("--batch", type=int, default=BATCH, help="grids resolved together")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--grid", type=grid_size, default=(ROWS, COLS), help="ROWSxCOLS, as DROPPER SLOT --grid")
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    tally = run(args.spins, args.workers, args.seed, args.batch, *args.grid)
+    dt = time.perf_counter()-t0
+    print(f"{args.grid[0]}x{args.grid[1]} grid")
+    print(tally.report())
+    print(f"\n{tally.spins/dt:,.0f} spins/sec ({dt:.2f}s, {args.workers} workers, batches of {args.batch:,})")
+
+
+if __name__ == "__main__": main()
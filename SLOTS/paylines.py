@@ -0,0 +1,135 @@
+"""
+Rules of the NONAME payline slot, without pygame.
+
+A spin fills a ROWS x COLS grid from the weighted symbol strip.  Columns 1
+and 3 can turn fully wild, and a spin with a wild column doubles its win
+half of the time.  Every row, column and both diagonals pay the first
+symbol's multiplier times the wager when the whole line matches it.
+
+NONAME SLOTS.py animates and draws these; headless tools call spin() and
+line_payout() directly.  PaylineSession is the machine's credits and wager
+around them, which gamecore.replay re-runs from a recorded session log.
+"""
+
+import random
+
+# Game config
+ROWS, COLS = 5, 4
+WAGER_MIN, WAGER_MAX = 10, 100
+
+# Symbols
+SYMBOLS = [
+    {"color": (255, 0, 0), "name": "Cherry", "multiplier": 1, "is_wild": False},
+    {"color": (0, 255, 0), "name": "Gem", "multiplier": 5, "is_wild": False},
+    {"color": (0, 0, 255), "name": "Bell", "multiplier": 3, "is_wild": False},
+    {"color": (255, 255, 0), "name": "Seven", "multiplier": 10, "is_wild": False},
+    {"color": (255, 105, 180), "name": "Star", "multiplier": 4, "is_wild": False},
+]
+# Add a weights list to bias symbol selection
+WEIGHTED_SYMBOLS = (
+    [SYMBOLS[0]] * 14 +  # Cherry (common)
+    [SYMBOLS[1]] * 7 +   # Gem
+    [SYMBOLS[2]] * 5 +   # Bell
+    [SYMBOLS[3]] * 2 +   # Seven (rare)
+    [SYMBOLS[4]] * 4     # Star
+)
+
+WILD_SYMBOL = {"color": (200, 0, 200), "name": "Wild", "multiplier": 1, "is_wild": True}
+WILD_COLUMNS = (1, 3)
+WILD_CHANCE = 0.01      # per cell of a wild column
+DOUBLER_CHANCE = 0.5    # when any column went wild
+
+
+def random_grid(rng=random):
+    return [[rng.choice(WEIGHTED_SYMBOLS) for _ in range(COLS)] for _ in range(ROWS)]
+
+def spin(rng=random):
+    """A settled spin: (grid, wild_columns, wild_doubler_triggered)."""
+    wild_columns = []
+    grid = []
+
+    for row in range(ROWS):
+        new_row = []
+        for col in range(COLS):
+            if col in WILD_COLUMNS and rng.random() < WILD_CHANCE:
+                new_row.append(WILD_SYMBOL)
+                if col not in wild_columns:
+                    wild_columns.append(col)
+            else:
+                new_row.append(rng.choice(WEIGHTED_SYMBOLS))
+        grid.append(new_row)
+
+    for col in wild_columns:
+        for row in range(ROWS):
+            grid[row][col] = WILD_SYMBOL
+
+    doubled = bool(wild_columns) and rng.random() < DOUBLER_CHANCE
+    return grid, wild_columns, doubled
+
+def symbol_match(sym_list):
+    names = [s["name"] for s in sym_list]
+    base = names[0]
+    matches = sum(1 for s in sym_list if s["name"] == base or s["is_wild"])
+    return matches >= len(sym_list)  # Require full match
+
+def paylines(grid):
+    """Every line as ((kind, index), symbols): rows, columns, then both diagonals."""
+    lines = [(("row", r), row) for r, row in enumerate(grid)]
+    lines += [(("col", c), [grid[r][c] for r in range(ROWS)]) for c in range(COLS)]
+    lines.append((("diag", "tlbr"), [grid[i][i] for i in range(min(ROWS, COLS))]))
+    lines.append((("diag", "trbl"), [grid[i][COLS - 1 - i] for i in range(min(ROWS, COLS))]))
+    return lines
+
+def line_payout(grid, wager, doubled=False):
+    """(payout, winning lines) for a settled grid."""
+    payout = 0
+    winning_lines = []
+    for line, syms in paylines(grid):
+        if symbol_match(syms):
+            winning_lines.append(line)
+            payout += syms[0]["multiplier"] * wager
+    if doubled:
+        payout *= 2
+    return payout, winning_lines
+
+
+class PaylineSession:
+    """Credits and wager of one NONAME session, every spin outcome drawn from `rng`.
+
+    The wager is charged when the spin starts and the grid settles when the
+    reels stop (resolve), as on screen; shop purchases can land in between.
+    """
+    INPUTS = frozenset({'buy', 'wager_up', 'wager_down', 'max_bet', 'min_bet', 'spin', 'resolve'})   # ops a session log may replay
+
+    def __init__(self, rng=None, credits=0, wager=WAGER_MIN):
+        self.rng = rng or random.Random()
+        self.credits, self.wager = credits, wager
+        self.spins = 0
+        self.payout = 0
+        self.winning_lines = []
+
+    def buy(self, credits): self.credits += credits
+    def wager_up(self): self.wager = min(self.wager + 1, WAGER_MAX)
+    def wager_down(self): self.wager = max(self.wager - 1, WAGER_MIN)
+    def max_bet(self): self.wager = min(WAGER_MAX, self.credits)
+    def min_bet(self): self.wager = WAGER_MIN
+
+    def spin(self):
+        self.credits -= self.wager
+        self.payout = 0
+        self.winning_lines = []
+
+    def resolve(self):
+        grid, _, doubled = spin(self.rng)
+        self.payout, self.winning_lines = line_payout(grid, self.wager, doubled)
+        self.credits += self.payout
+        self.spins += 1
+
+    def checkpoint(self):
+        return {'spin': self.spins, 'payout': self.payout, 'lines': [list(l) for l in self.winning_lines],
+                'credits': self.credits}
+
+
+def replay_session(header):
+    c = header['config']
+    return PaylineSession(random.Random(header['seed']), c['credits'], c['wager'])
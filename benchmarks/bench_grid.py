@@ -0,0 +1,133 @@
+"""
+Cascade cost versus grid size, from the 5x5 board up to the 64x64 mega board.
+
+For each size N x N:
+
+    scan        scan_clusters on a fresh grid: pack, flood, union-find labels
+    step        one cascade step on a ClusterTracker: pop, collapse, refill
+                and the rescan of what moved, repacking only that
+    spin        cascade.play_spin, every cascade of a spin
+    frames      DROPPER SLOT resolving whole spins with animation, headless:
+                update_tiles + step_cascade + draw_scene per frame on a fixed
+                16 ms clock; p50/p99/worst frame time and the frames over the
+                60 FPS budget
+
+Under SDL's dummy video driver, so it runs on a headless box.  The frame
+numbers leave out display.flip and the vsync wait.
+
+    python benchmarks/bench_grid.py --sizes 5 16 64 --spins 3
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse, gc, itertools, random, sys, tempfile, time, timeit
+
+from bench_render import ROOT, SEED, load_script
+sys.path[:0] = [ROOT, os.path.join(ROOT, "SLOTS")]
+
+import cascade
+from gamecore.journal import Journal
+
+SIZES = (5, 8, 16, 32, 48, 64)
+SPINS = 3
+BUDGET_MS = 1000 / 60
+FRAME_MS = 16
+MAX_FRAMES = 5000    # per spin; a resolve that takes longer is reported as stuck
+
+
+def best_us(op, repeat=5):
+    """Best time per call of op, in microseconds."""
+    timer = timeit.Timer(op)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1e6
+
+
+def math_costs(n):
+    rng = random.Random(SEED)
+    grids = [cascade.make_grid(rng, n, n) for _ in range(8)]
+    grid = itertools.cycle(grids).__next__
+    scan = best_us(lambda: cascade.scan_clusters(grid()))
+
+    def step():
+        g = [row[:] for row in grid()]
+        tracker = cascade.ClusterTracker(g)
+        clusters = tracker.scan() or [[(n-1, 0)]]
+        popped = {p for blob in clusters for p in blob}
+        t = time.perf_counter()
+        tracker.pop(popped)
+        cascade.pop_clusters(g, [popped])
+        cascade.collapse_columns(g)
+        cascade.fill_empty(g, rng)
+        tracker.fill(g)
+        tracker.scan()
+        return time.perf_counter() - t
+    step_us = min(min(step() for _ in range(20)) for _ in range(3)) * 1e6
+
+    spins = max(3, 3000 // (n*n))
+    t = time.perf_counter()
+    for _ in range(spins): cascade.play_spin(1.0, rng, n, n)
+    spin = (time.perf_counter() - t) / spins * 1e3
+    return scan, step_us, spin
+
+
+def frame_costs(m, n, spins):
+    """Frame times (ms) of `spins` animated spins on an n x n board, and the frames of the slowest spin."""
+    m.configure_grid(n, n)
+    m.rng.seed(SEED)
+    m.grid[:] = m.make_initial_grid()
+    m.credits, m.bet = 10.0**9, 1.0
+    gc.unfreeze()
+    m.freeze_gc()   # as the game does before its loop, for this board size
+    times, longest = [], 0
+    now = 0
+    for _ in range(spins):
+        m.credits -= m.bet
+        frames = 0
+        while True:
+            now += FRAME_MS
+            t = time.perf_counter()
+            if not frames: m.start_spin()   # the SPIN click's frame deals the new grid
+            m.update_tiles(FRAME_MS)
+            m.step_cascade(now, FRAME_MS)
+            m.draw_scene(now)
+            times.append((time.perf_counter() - t) * 1e3)
+            frames += 1
+            if m.state == m.STATE_IDLE or frames >= MAX_FRAMES: break
+        longest = max(longest, frames)
+    times.sort()
+    return times, longest
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cascade cost versus grid size")
+    ap.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="board edge lengths (N x N)")
+    ap.add_argument("--spins", type=int, default=SPINS, help="animated spins per size")
+    ap.add_argument("--no-frames", action="store_true", help="only the headless cascade costs")
+    args = ap.parse_args()
+    for n in args.sizes:
+        if not 1 <= n <= min(cascade.MAX_ROWS, cascade.MAX_COLS): ap.error(f"size {n} is out of range")
+    m = None
+    if not args.no_frames:
+        random.seed(SEED)   # the game's cosmetic randomness
+        m = load_script("SLOTS/DROPPER SLOT.py", "dropper_ui")
+        m.init_display()
+        m.journal = Journal("cascade", os.path.join(tempfile.mkdtemp(), "cascade.journal"))
+    print(f"{'grid':>7}{'tile':>6}{'scan us':>10}{'step us':>10}{'spin ms':>10}"
+          + ("" if m is None else f"{'frames':>8}{'p50 ms':>8}{'p99 ms':>8}{'worst':>8}{'>16.7ms':>9}"))
+    for n in args.sizes:
+        scan, step, spin = math_costs(n)
+        line = f"{f'{n}x{n}':>7}"
+        if m is None: line += f"{'':>6}{scan:>10,.1f}{step:>10,.1f}{spin:>10,.2f}"
+        else:
+            times, longest = frame_costs(m, n, args.spins)
+            line += f"{m.TILE:>6}{scan:>10,.1f}{step:>10,.1f}{spin:>10,.2f}"
+            over = sum(t > BUDGET_MS for t in times)
+            line += (f"{len(times):>8}{times[len(times)//2]:>8.2f}{times[min(len(times)-1, len(times)*99//100)]:>8.2f}"
+                     f"{times[-1]:>8.2f}{over:>9}" + ("  (stuck)" if longest >= MAX_FRAMES else ""))
+        print(line)
+    if m is not None: m.journal.close()
+
+
+if __name__ == "__main__": main()
@@ -0,0 +1,222 @@
+"""
+Microbenchmarks for the game-math hot paths, comparable across commits.
+
+Every benchmark runs a prepared operation with the garbage collector off:
+timeit's autorange picks a loop count, the best of `repeat` runs gives
+ops/sec, and a separate tracemalloc pass gives the peak bytes allocated
+per call.  Inputs come from fixed seeds, so two runs measure the same work.
+
+    python benchmarks/bench_math.py --save base.json       # on the old commit
+    python benchmarks/bench_math.py --compare base.json    # on the new one
+
+--compare exits 1 when any benchmark is slower than the baseline by more
+than --threshold (default 10%) or allocates that much more per call.
+Baselines are machine specific and are not checked in.
+"""
+
+import argparse, itertools, json, os, random, sys, time, timeit, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "Baccarat"), os.path.join(ROOT, "SLOTS")]
+
+from cards import build_shoe, hand_total
+from rules import baccarat_round, winner
+import numpy as np
+import cascade, cascade_batch, cascade_sim, paylines
+
+SEED = 20240601
+REPEAT = 5
+ALLOC_CALLS = 200
+THRESHOLD = 0.10
+
+
+def cycle_of(items): return itertools.cycle(items).__next__
+
+
+# Each bench returns a zero-argument operation on inputs prepared from SEED.
+
+def bench_hand_total():
+    hand = bytearray([12, 37, 5])
+    return lambda: hand_total(hand)
+
+def bench_winner():
+    player, banker = [12, 37, 5], [40, 9]
+    return lambda: winner(player, banker)
+
+def bench_baccarat_round():
+    template = build_shoe(8); random.Random(SEED).shuffle(template)
+    deck = bytearray(template)
+    def op():
+        if len(deck) < 6: deck[:] = template
+        return baccarat_round(deck)
+    return op
+
+def bench_build_shoe_shuffle():
+    rng = random.Random(SEED)
+    def op():
+        shoe = build_shoe(8); rng.shuffle(shoe)
+        return shoe
+    return op
+
+def _cascade_grids(n=64):
+    rng = random.Random(SEED)
+    return [cascade.make_grid(rng) for _ in range(n)]
+
+def _popped_grids(n=64):
+    grids = []
+    for g in _cascade_grids(n):
+        cascade.pop_clusters(g, cascade.scan_clusters(g) or [[(0, 0), (1, 1)]])
+        grids.append(g)
+    return grids
+
+def bench_scan_clusters():
+    grid = cycle_of(_cascade_grids())
+    return lambda: cascade.scan_clusters(grid())
+
+def bench_bitboard_popped():
+    """The cascade's inner loop: every cluster of a packed grid in one flood fill."""
+    board = cycle_of([cascade.BOARD.pack(g, cascade.LANES) for g in _cascade_grids()])
+    return lambda: cascade.BOARD.popped(board())
+
+def bench_collapse_columns():
+    grid = cycle_of(_popped_grids())
+    return lambda: cascade.collapse_columns([row[:] for row in grid()])   # includes the 5x5 copy
+
+def bench_fill_empty():
+    """fill_empty is the refill DROPPER SLOT deals over frames."""
+    rng = random.Random(SEED)
+    collapsed = _popped_grids()
+    for g in collapsed: cascade.collapse_columns(g)
+    grid = cycle_of(collapsed)
+    return lambda: cascade.fill_empty([row[:] for row in grid()], rng)   # includes the 5x5 copy
+
+def bench_random_symbol_with_bias():
+    rng = random.Random(SEED)
+    grid = _cascade_grids(1)[0]
+    return lambda: cascade.random_symbol_with_bias(grid, 2, 2, rng)
+
+def bench_play_spin():
+    rng = random.Random(SEED)
+    return lambda: cascade.play_spin(1.0, rng)
+
+def bench_resolve_spin():
+    rng = random.Random(SEED)
+    return lambda: cascade_sim.resolve_spin(rng)
+
+def bench_play_batch():
+    """1024 spins per call through the batched NumPy engine."""
+    rng = np.random.default_rng(SEED)
+    return lambda: cascade_batch.play_batch(1024, rng)
+
+def bench_payline_spin():
+    rng = random.Random(SEED)
+    return lambda: paylines.spin(rng)
+
+def bench_symbol_match():
+    line = [paylines.SYMBOLS[0]]*4 + [paylines.WILD_SYMBOL]
+    return lambda: paylines.symbol_match(line)
+
+def bench_line_payout():
+    """line_payout is NONAME SLOTS' calculate_payout without the bookkeeping."""
+    rng = random.Random(SEED)
+    grid = cycle_of([paylines.spin(rng)[0] for _ in range(64)])
+    return lambda: paylines.line_payout(grid(), 10)
+
+
+BENCHES = {
+    'hand_total': bench_hand_total,
+    'winner': bench_winner,
+    'baccarat_round': bench_baccarat_round,
+    'build_shoe+shuffle': bench_build_shoe_shuffle,
+    'scan_clusters': bench_scan_clusters,
+    'bitboard.popped': bench_bitboard_popped,
+    'collapse_columns': bench_collapse_columns,
+    'fill_empty': bench_fill_empty,
+    'random_symbol_with_bias': bench_random_symbol_with_bias,
+    'play_spin': bench_play_spin,
+    'resolve_spin': bench_resolve_spin,
+    'play_batch(1024)': bench_play_batch,
+    'paylines.spin': bench_payline_spin,
+    'symbol_match': bench_symbol_match,
+    'line_payout': bench_line_payout,
+}
+
+
+def ops_per_sec(op, repeat=REPEAT):
+    timer = timeit.Timer(op)
+    number, _ = timer.autorange()
+    return number/min(timer.repeat(repeat, number))
+
+def alloc_per_call(op, calls=ALLOC_CALLS):
+    """Mean peak bytes allocated during one call."""
+    op()
+    tracemalloc.start()
+    total = 0
+    for _ in range(calls):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        op()
+        total += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return total/calls
+
+
+def run(names, repeat=REPEAT):
+    results = {}
+    for name in names:
+        results[name] = {'ops_per_sec': ops_per_sec(BENCHES[name](), repeat),
+                         'alloc_bytes': alloc_per_call(BENCHES[name]())}
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Names of the benchmarks that regressed against the baseline."""
+    regressed = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base: continue
+        slower = r['ops_per_sec'] < base['ops_per_sec']*(1-threshold)
+        fatter = r['alloc_bytes'] > base['alloc_bytes']*(1+threshold) + 16
+        if slower or fatter: regressed.append(name)
+    return regressed
+
+
+def report(results, baseline=None):
+    lines = [f"{'benchmark':<26}{'ops/sec':>14}{'ns/op':>12}{'alloc B/op':>12}" + ("  vs baseline" if baseline else "")]
+    for name, r in results.items():
+        line = f"{name:<26}{r['ops_per_sec']:>14,.0f}{1e9/r['ops_per_sec']:>12,.0f}{r['alloc_bytes']:>12,.0f}"
+        if baseline and name in baseline:
+            line += f"  {r['ops_per_sec']/baseline[name]['ops_per_sec']-1:>+7.1%}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Microbenchmarks for the Baccarat and slot math")
+    ap.add_argument("names", nargs="*", help=f"benchmarks to run (default all): {', '.join(BENCHES)}")
+    ap.add_argument("--repeat", type=int, default=REPEAT)
+    ap.add_argument("--save", help="write the results as a baseline JSON file")
+    ap.add_argument("--compare", help="baseline JSON file to check against")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = ap.parse_args()
+    unknown = set(args.names) - set(BENCHES)
+    if unknown: ap.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    t0 = time.perf_counter()
+    results = run(args.names or list(BENCHES), args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f: baseline = json.load(f)["results"]
+    print(report(results, baseline))
+    print(f"\n{time.perf_counter()-t0:.1f}s, Python {sys.version.split()[0]}")
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=1)
+    if baseline:
+        regressed = compare(results, baseline, args.threshold)
+        if regressed:
+            print(f"REGRESSION beyond {args.threshold:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__": main()
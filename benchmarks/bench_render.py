@@ -0,0 +1,173 @@
+"""
+Headless render benchmark: each game's draw path, offscreen, in a scripted state.
+
+Runs under SDL's dummy video driver, so it needs no display and runs on a
+headless Linux CI box.  The game scripts are loaded as modules (their main
+loops only run as __main__ and they open their window in init_display(),
+which the scenario calls), put into a fixed state and drawn N frames:
+
+    baccarat-mid-deal     Baccarat 1.1 BaccaratGame.draw with 40 rounds on the roads,
+                          the third card half flipped
+    baccarat-dirty        the same state through draw_dirty (steady state)
+    dropper-highlights    DROPPER SLOT draw_scene with popping clusters flashing
+                          and a floating text per popped tile
+    noname-paylines       NONAME SLOTS draw_grid + draw_paylines, a winning line every frame
+
+Reports frames/sec, p50/p99 frame time and the peak bytes Python allocates
+per frame (a separate tracemalloc pass).  --save/--compare/--threshold work
+as in bench_math.py: --compare exits 1 on a regression.
+
+    python benchmarks/bench_render.py --frames 500
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse, importlib.util, json, random, sys, time, tracemalloc
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED = 20240601
+FRAMES = 300
+WARMUP = 20
+ALLOC_FRAMES = 30
+THRESHOLD = 0.10
+
+
+def load_script(path, name):
+    """Import a game script by path without running its main loop."""
+    path = os.path.join(ROOT, path)
+    folder = os.path.dirname(path)
+    if folder not in sys.path: sys.path.insert(0, folder)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Each scenario loads its game, sets up the state and returns a draw-one-frame function.
+
+def baccarat_mid_deal(dirty=False):
+    m = load_script("Baccarat/Baccarat 1.1.py", "baccarat_ui")
+    m.init_display()
+    game = m.BaccaratGame(SEED)
+    game.credits = 10**9
+    for _ in range(40):
+        game.place_bet('Banker')
+        if game.deal(): game.settle()
+    game.place_bet('Player'); game.place_bet('Any Pair')
+    game.start_deal()
+    def frame():
+        game.animation_start = time.time() - 2.5*game.flip_time
+        if dirty: game.draw_dirty(m.screen)
+        else: game.draw(m.screen)
+    return frame
+
+def dropper_highlights():
+    m = load_script("SLOTS/DROPPER SLOT.py", "dropper_ui")
+    m.init_display()
+    from cascade import scan_clusters   # SLOTS/ is on the path once the script is loaded
+    m.rng.seed(SEED)
+    while True:
+        m.grid[:] = m.make_initial_grid()
+        clusters = scan_clusters(m.symbol_grid(m.grid))
+        if clusters: break
+    m.state = m.STATE_RESOLVE
+    m.pending_clusters = clusters
+    m.mark_popping(m.grid, clusters, 0)
+    for t in (t for row in m.grid for t in row):
+        t.y = t.target_y
+        t.place()
+    m.floating_texts = [m.FloatingText("+0.25", m.world_pos(r, c)) for blob in clusters for r, c in blob]
+    now = [0]
+    def frame():
+        now[0] += 16
+        m.draw_scene(now[0])
+    return frame
+
+def noname_paylines():
+    m = load_script("SLOTS/NONAME SLOTS.py", "noname_ui")
+    m.init_display()
+    m.rng.seed(SEED)
+    while True:
+        m.grid, _, doubled = m.spin_grid(m.rng)
+        _, m.winning_lines = m.line_payout(m.grid, 10, doubled)
+        if m.winning_lines: break
+    def frame():
+        m.flash_timer = 0   # the line is drawn on the flash frame; draw it every frame
+        m.screen.fill(m.BG_COLOR)
+        m.draw_grid()
+        m.draw_paylines()
+    return frame
+
+
+SCENARIOS = {
+    'baccarat-mid-deal': baccarat_mid_deal,
+    'baccarat-dirty': lambda: baccarat_mid_deal(dirty=True),
+    'dropper-highlights': dropper_highlights,
+    'noname-paylines': noname_paylines,
+}
+
+
+def measure(frame, frames=FRAMES):
+    for _ in range(WARMUP): frame()
+    times = []
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        t = time.perf_counter()
+        frame()
+        times.append(time.perf_counter() - t)
+    total = time.perf_counter() - t0
+    times.sort()
+    tracemalloc.start()
+    peak = 0
+    for _ in range(ALLOC_FRAMES):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        frame()
+        peak += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return {'fps': frames/total, 'p50_ms': times[len(times)//2]*1000,
+            'p99_ms': times[min(len(times)-1, len(times)*99//100)]*1000, 'alloc_bytes': peak/ALLOC_FRAMES}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless render benchmark for the game draw paths")
+    ap.add_argument("names", nargs="*", help=f"scenarios to run (default all): {', '.join(SCENARIOS)}")
+    ap.add_argument("--frames", type=int, default=FRAMES)
+    ap.add_argument("--save", help="write the results as a baseline JSON file")
+    ap.add_argument("--compare", help="baseline JSON file to check against")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = ap.parse_args()
+    unknown = set(args.names) - set(SCENARIOS)
+    if unknown: ap.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    random.seed(SEED)   # the games' cosmetic randomness
+    results = {name: measure(SCENARIOS[name](), args.frames) for name in args.names or SCENARIOS}
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f: baseline = json.load(f)["results"]
+    print(f"{'scenario':<22}{'frames/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'alloc B/frame':>15}"
+          + ("  vs baseline" if baseline else ""))
+    regressed = []
+    for name, r in results.items():
+        line = f"{name:<22}{r['fps']:>10,.0f}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['alloc_bytes']:>15,.0f}"
+        base = baseline and baseline.get(name)
+        if base:
+            line += f"  {r['fps']/base['fps']-1:>+7.1%}"
+            if (r['fps'] < base['fps']*(1-args.threshold)
+                    or r['alloc_bytes'] > base['alloc_bytes']*(1+args.threshold) + 64):
+                regressed.append(name)
+        print(line)
+    print(f"\nSDL video driver {pygame.display.get_driver()}, pygame {pygame.version.ver}")
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"pygame": pygame.version.ver, "frames": args.frames, "results": results}, f, indent=1)
+    if baseline:
+        if regressed:
+            print(f"REGRESSION beyond {args.threshold:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+        print(f"no regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__": main()
@@ -0,0 +1,6 @@
+"""
+Helpers shared by the Baccarat and SLOTS games.
+
+The games are run as scripts from their own folders, so each one puts the
+repository root on sys.path before importing from here.
+"""
@@ -0,0 +1,156 @@
+"""
+Per-phase frame timing for the game loops, with an optional overlay and traces.
+
+A loop calls frame() once at the top of every frame and mark(phase) after
+each phase; the time since the previous mark is charged to that phase:
+
+    PROFILE = FrameProfiler(budget_ms=1000/60)
+    while running:
+        PROFILE.frame()
+        ...events...;  PROFILE.mark('events')
+        ...update...;  PROFILE.mark('update')
+        ...draw...;    PROFILE.draw_overlay(screen); PROFILE.mark('draw')
+        pygame.display.flip(); PROFILE.mark('flip')
+        clock.tick(60); PROFILE.mark('wait')
+
+The last `window` frames of every phase are kept for p50/p95/p99.  A frame
+over budget_ms counts against the phase that took longest in it, which
+answers whether slow frames come from drawing, game logic or the flip.
+With a trace path every frame's phase times are kept and written at close()
+as CSV or JSON (by extension) for offline analysis.
+
+Games take --profile (overlay on; F3 toggles it) and --profile-trace FILE;
+either one prints the summary at exit.
+"""
+
+import argparse, csv, json, sys, time
+from collections import deque
+
+WINDOW = 600              # frames kept for the rolling percentiles
+OVERLAY_REFRESH = 0.5     # seconds between overlay text updates
+OVERLAY_FONT = ("monospace", 14)
+PERCENTILES = (50, 95, 99)
+
+
+def profiler_args(argv=None):
+    """--profile / --profile-trace for a game script; returns (overlay on, trace path or None)."""
+    ap = argparse.ArgumentParser(add_help=False)
+    ap.add_argument("--profile", action="store_true")
+    ap.add_argument("--profile-trace", default=None)
+    args, _ = ap.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return args.profile, args.profile_trace
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a sorted list."""
+    if not values: return 0.0
+    return values[min(len(values)-1, int(len(values)*p/100))]
+
+
+class FrameProfiler:
+    def __init__(self, budget_ms=1000/60, window=WINDOW, overlay=False, trace=None):
+        self.budget = budget_ms/1000
+        self.window = window
+        self.overlay = overlay
+        self.trace_path = trace
+        self.trace = [] if trace else None
+        self.report = overlay or bool(trace)
+        self.phases = {}          # phase -> deque of the last `window` times (s)
+        self.totals = deque(maxlen=window)
+        self.over_budget = {}     # phase -> frames over budget it dominated
+        self.frames = 0
+        self._current = {}
+        self._start = self._last = None
+        self._refreshed = 0.0
+        self._surf = None
+        self._font = None
+
+    def frame(self):
+        """End the previous frame (if any) and start timing a new one."""
+        now = time.perf_counter()
+        if self._start is not None and self._current:
+            total = now - self._start
+            for name, t in self._current.items():
+                if name not in self.phases: self.phases[name] = deque(maxlen=self.window)
+                self.phases[name].append(t)
+            self.totals.append(total)
+            if total > self.budget:
+                worst = max(self._current, key=self._current.get)
+                self.over_budget[worst] = self.over_budget.get(worst, 0) + 1
+            if self.trace is not None: self.trace.append((self.frames, total, dict(self._current)))
+            self.frames += 1
+        self._current = {}
+        self._start = self._last = now
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        if self._last is None: self._start = now
+        else: self._current[phase] = self._current.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def stats(self):
+        """{phase: (p50, p95, p99) in ms} over the window, with 'frame' for the whole frame."""
+        out = {}
+        for name, times in (*self.phases.items(), ('frame', self.totals)):
+            ordered = sorted(times)
+            out[name] = tuple(percentile(ordered, p)*1000 for p in PERCENTILES)
+        return out
+
+    def summary(self):
+        lines = [f"{'phase':<10}" + "".join(f"{'p'+str(p):>9}" for p in PERCENTILES) + "   (ms)"]
+        for name, values in self.stats().items():
+            lines.append(f"{name:<10}" + "".join(f"{v:>9.2f}" for v in values))
+        slow = sum(self.over_budget.values())
+        lines.append(f"{slow} of {self.frames} frames over {self.budget*1000:.1f} ms"
+                     + ("" if not slow else ": " + ", ".join(f"{k} {v}" for k, v in
+                        sorted(self.over_budget.items(), key=lambda kv: -kv[1]))))
+        return "\n".join(lines)
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self._refreshed = 0.0
+
+    def draw_overlay(self, surf, pos=(8, 8)):
+        """Draw the rolling percentiles in an opaque box; returns its rect, or None when the overlay is off."""
+        if not self.overlay: return None
+        import pygame
+        if self._font is None: self._font = pygame.font.SysFont(*OVERLAY_FONT)
+        font = self._font
+        now = time.perf_counter()
+        if self._surf is None or now - self._refreshed >= OVERLAY_REFRESH:
+            self._refreshed = now
+            stats = self.stats()
+            lines = [f"{'':<9}" + "".join(f"{'p'+str(p):>7}" for p in PERCENTILES)]
+            lines += [f"{name[:9]:<9}" + "".join(f"{v:>7.2f}" for v in values) for name, values in stats.items()]
+            lines.append(f"slow {sum(self.over_budget.values())}/{self.frames}")
+            h = font.get_linesize()
+            w, h_all = max(font.size(l)[0] for l in lines) + 12, len(lines)*h + 8
+            if self._surf is None or w > self._surf.get_width() or h_all > self._surf.get_height():
+                # only ever grows, so an opaque redraw always covers the previous overlay
+                old = self._surf.get_size() if self._surf else (0, 0)
+                self._surf = pygame.Surface((max(w, old[0]), max(h_all, old[1])))
+            self._surf.fill((0, 0, 0))
+            for i, line in enumerate(lines):
+                # numbers change every refresh: rendered directly, not through the shared TEXT cache
+                self._surf.blit(font.render(line, True, (0, 255, 0)), (6, 4 + i*h))
+        surf.blit(self._surf, pos)
+        return self._surf.get_rect(topleft=pos)
+
+    def dump(self, path):
+        names = sorted({k for _, _, phases in self.trace or () for k in phases})
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"budget_ms": self.budget*1000, "phases": names,
+                           "frames": [{"frame": n, "total_ms": total*1000,
+                                       **{k: v*1000 for k, v in phases.items()}}
+                                      for n, total, phases in self.trace or ()]}, f)
+        else:
+            with open(path, "w", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(["frame", "total_ms", *names])
+                for n, total, phases in self.trace or ():
+                    w.writerow([n, f"{total*1000:.3f}", *(f"{phases.get(k, 0)*1000:.3f}" for k in names)])
+
+    def close(self):
+        if self.trace_path: self.dump(self.trace_path)
+        if self.report: print(self.summary())
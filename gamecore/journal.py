@@ -0,0 +1,169 @@
+"""
+Append-only binary journal of every round or spin, shared by the games.
+
+The file is a 32-byte header (magic, version, record size, game name)
+followed by fixed-size 64-byte records:
+
+    seq u64 | time f64 | kind u8 | flags u8 | pad 2 | wager f64 | payout f64
+    credits f64 | detail 16 bytes (game specific) | crc32 u32
+
+Records are appended only.  append() packs into memory; the batch is
+written and fsync'd as one group commit once `group` records are pending
+or `sync_interval` seconds have passed since the last commit (checked on
+append and on tick(), which the game loops call once a frame), and on
+close().  A crash loses at most the last uncommitted group.
+
+Opening a journal scans it in chunks: every record's CRC and sequence
+number are checked and the file is cut back to the last good record, so a
+torn write at the end is dropped and appending carries on from there.
+Everything after the last good record (a torn tail, but also any good
+records behind a corrupt one) is appended to <journal>.bad before the cut,
+and the games print warn_dropped()'s warning, so nothing vanishes quietly.  The
+scan keeps only what the games restore from: the last record (credit
+balance, last payout), running wager/payout totals and the last `tail`
+rounds, so memory stays flat however long the history grows.
+
+Journals live in journal/ in the game's own folder (Baccarat/ or SLOTS/).
+"""
+
+import itertools, os, struct, sys, time, zlib
+from collections import deque, namedtuple
+
+from gamecore.replay import game_dir
+
+MAGIC = b"GMJ1"
+VERSION = 1
+HEADER = struct.Struct("<4sHH24s")
+RECORD = struct.Struct("<QdBB2xddd16sI")
+JOURNAL_DIR = "journal"
+GROUP = 64              # records per group commit
+TAIL = 4096             # recent rounds kept in memory, as many as a scoreboard shows
+CHUNK = 4096            # records read per block while scanning
+SYNC_INTERVAL = 1.0     # seconds; at most one fsync per interval while records keep coming
+
+# record kinds
+ROUND = 1               # a settled round or spin
+DEPOSIT = 2             # credits bought or added; payout holds the amount
+CARRY = 3               # totals carried over from an older log; wager/payout are the sums
+REFUND = 4              # stakes handed back unplayed; payout holds the amount
+
+Entry = namedtuple("Entry", "seq time kind wager payout credits detail")
+
+
+def journal_path(game):
+    return os.path.join(game_dir(game), JOURNAL_DIR, f"{game}.journal")
+
+
+def scan(f, game=b""):
+    """Entries of an open journal file, oldest first, read CHUNK records at a time.
+
+    Stops at the first torn or corrupt record; the good length is the header
+    plus one RECORD.size per entry yielded.
+    """
+    head = f.read(HEADER.size)
+    if len(head) < HEADER.size: return
+    magic, version, size, name = HEADER.unpack(head)
+    if magic != MAGIC or version != VERSION or size != RECORD.size:
+        raise ValueError("not a game journal, or written by another version")
+    name = name.rstrip(b"\0")
+    if game and name != game[:24]: raise ValueError(f"journal belongs to {name.decode()!r}")
+    seq = 0
+    crc_span = RECORD.size - 4
+    while True:
+        data = f.read(RECORD.size * CHUNK)
+        for off in range(0, len(data) - RECORD.size + 1, RECORD.size):
+            rec = RECORD.unpack_from(data, off)
+            if zlib.crc32(data[off:off+crc_span]) != rec[-1] or rec[0] != seq: return
+            yield Entry(rec[0], rec[1], rec[2], rec[4], rec[5], rec[6], rec[7])
+            seq += 1
+        if len(data) < RECORD.size * CHUNK: return
+
+
+class Journal:
+    def __init__(self, game, path=None, group=GROUP, sync_interval=SYNC_INTERVAL, tail=TAIL):
+        self.game = game.encode()[:24]
+        self.path = path or journal_path(game)
+        self.group, self.sync_interval = group, sync_interval
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.seq = 0
+        self.last = None                  # the newest record
+        self.wagered = self.paid = 0.0    # totals of the ROUND and CARRY records
+        self._rounds = deque(maxlen=tail)
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size:
+            with open(self.path, "rb") as f:
+                for e in scan(f, self.game): self._take(e)
+        good = HEADER.size + self.seq*RECORD.size if size >= HEADER.size else 0
+        self.dropped = max(0, size - good)   # bytes cut off by recovery, kept in bad_path
+        self.bad_path = self.path + ".bad"
+        self._f = open(self.path, "r+b" if size else "w+b")
+        if self.dropped:
+            self._f.seek(good)
+            with open(self.bad_path, "ab") as bad:
+                bad.write(self._f.read())
+                bad.flush(); os.fsync(bad.fileno())
+        if good:
+            self._f.truncate(good)
+        else:
+            self._f.truncate(0)
+            self._f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self.game))
+        self._f.seek(0, os.SEEK_END)
+        self._f.flush(); os.fsync(self._f.fileno())
+        self._pending = bytearray()
+        self._count = 0
+        self._last_sync = time.monotonic()
+        self.commits = 0
+
+    def _take(self, e):
+        self.seq = e.seq + 1
+        self.last = e
+        if e.kind in (ROUND, CARRY):
+            self.wagered += e.wager
+            self.paid += e.payout
+        if e.kind == ROUND: self._rounds.append(e)
+
+    def warn_dropped(self, out=sys.stderr):
+        """Tell the player that recovery cut the journal short, and where the cut-off bytes went."""
+        if self.dropped:
+            print(f"warning: {self.path}: {self.dropped} bytes after record {self.seq} failed their check; "
+                  f"moved to {self.bad_path}", file=out)
+
+    def credits(self, default):
+        """Balance after the last record, or `default` for a new journal."""
+        return self.last.credits if self.last else default
+
+    def tail(self, n):
+        """The last n rounds, oldest first (no more than the journal's `tail`)."""
+        return list(itertools.islice(self._rounds, max(0, len(self._rounds) - n), None))
+
+    def round(self, wager, payout, credits, detail=b""): self.append(ROUND, wager, payout, credits, detail)
+    def deposit(self, amount, credits): self.append(DEPOSIT, 0, amount, credits)
+
+    def append(self, kind, wager, payout, credits, detail=b""):
+        now = time.time()
+        body = RECORD.pack(self.seq, now, kind, 0, wager, payout, credits, detail, 0)[:-4]
+        self._pending += body + struct.pack("<I", zlib.crc32(body))
+        self._take(Entry(self.seq, now, kind, wager, payout, credits, bytes(detail).ljust(16, b"\0")))
+        self._count += 1
+        if self._count >= self.group: self.commit()
+        else: self.tick()
+
+    def tick(self):
+        if self._count and time.monotonic() - self._last_sync >= self.sync_interval: self.commit()
+
+    def commit(self):
+        """Write the pending group and fsync it."""
+        if self._count:
+            self._f.write(self._pending)
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self._pending.clear()
+            self._count = 0
+            self.commits += 1
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._f:
+            self.commit()
+            self._f.close()
+            self._f = None
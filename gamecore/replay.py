@@ -0,0 +1,184 @@
+"""
+Seeded session recording and headless replay for every game.
+
+A game draws all of its outcomes from one random.Random(seed) and writes a
+session log: a JSON-lines file whose first line is the header (game, seed,
+config), followed by the player's inputs in order and a checkpoint after
+every settled round (outcome and credit balance):
+
+    {"game": "cascade", "seed": 1234, "config": {...}}
+    {"op": "bet_up", "args": []}
+    {"op": "spin", "args": []}
+    {"check": {"popped": 6, "payout": 1.8, "credits": 996.8}}
+
+replay() rebuilds the game's display-free session from the header, feeds it
+the inputs as fast as the CPU allows and compares every checkpoint.  A game
+module takes part by exposing replay_session(header) -> an object with one
+method per recorded op, the names of those ops in its class's INPUTS, and a
+checkpoint() returning the same fields.  An op outside INPUTS stops the
+replay with a ReplayError rather than calling whatever method it names.
+
+Logs go to sessions/ in the game's own folder (Baccarat/ or SLOTS/),
+wherever the script was started from; only the newest KEEP_SESSIONS logs
+of each game are kept, older ones are deleted as a new session starts.
+
+    python -m gamecore.replay SLOTS/sessions/cascade-20240601-101500-1234.jsonl
+"""
+
+import argparse, importlib, json, os, re, secrets, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SESSION_DIR = "sessions"
+KEEP_SESSIONS = 50      # per game; 0 keeps every log
+
+# game name -> (folder, module with replay_session)
+GAMES = {
+    'baccarat': ('Baccarat', 'baccarat_table'),
+    'baccarat-simulator': ('Baccarat', 'baccarat_table'),
+    'cascade': ('SLOTS', 'cascade'),
+    'paylines': ('SLOTS', 'paylines'),
+}
+
+
+class ReplayError(ValueError):
+    """A session log that does not fit the game it names."""
+
+
+def game_dir(game):
+    """The folder of a game's scripts, where its sessions/ and journal/ live."""
+    if game not in GAMES: raise ValueError(f"unknown game {game!r}")
+    return os.path.join(ROOT, GAMES[game][0])
+
+
+def new_seed():
+    return secrets.randbits(63)
+
+
+def session_args(argv=None):
+    """--seed / --record / --no-record for a game script; returns (seed, log path or None)."""
+    ap = argparse.ArgumentParser(add_help=False)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--record", default=None, help="session log path (default: <game folder>/sessions/<game>-<time>-<seed>.jsonl)")
+    ap.add_argument("--no-record", action="store_true")
+    args, _ = ap.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return (new_seed() if args.seed is None else args.seed), (False if args.no_record else args.record)
+
+
+class SessionLog:
+    """Writes one session: header, inputs and checkpoints, a line each, flushed as they happen."""
+
+    def __init__(self, game, seed, path=None, **config):
+        self.game, self.seed, self.config = game, seed, config
+        if path is None:
+            folder = os.path.join(game_dir(game), SESSION_DIR)
+            os.makedirs(folder, exist_ok=True)
+            prune_sessions(folder, game, KEEP_SESSIONS - 1)
+            path = os.path.join(folder, f"{game}-{time.strftime('%Y%m%d-%H%M%S')}-{seed}.jsonl")
+        self.path = path
+        self._f = open(path, "w") if path else None
+        self._write({"game": game, "seed": seed, "config": config})
+
+    def _write(self, entry):
+        if self._f:
+            self._f.write(json.dumps(entry) + "\n")
+            self._f.flush()
+
+    def input(self, op, *args):
+        self._write({"op": op, "args": list(args)})
+
+    def check(self, state):
+        self._write({"check": state})
+
+    def close(self):
+        if self._f: self._f.close(); self._f = None
+
+
+def prune_sessions(folder, game, keep):
+    """Delete all but the newest `keep` default-named logs of `game` in `folder` (keep < 0: none)."""
+    if keep < 0: return
+    name = re.compile(re.escape(game) + r"-\d{8}-\d{6}-\d+\.jsonl")
+    logs = sorted(f for f in os.listdir(folder) if name.fullmatch(f))   # the timestamp sorts them oldest first
+    for f in logs[:max(0, len(logs) - keep)]:
+        os.remove(os.path.join(folder, f))
+
+
+class NullLog:
+    """Stands in for a SessionLog when recording is off (and during replay)."""
+    def input(self, op, *args): pass
+    def check(self, state): pass
+    def close(self): pass
+
+
+def open_log(game, seed, path=None, **config):
+    return NullLog() if path is False else SessionLog(game, seed, path, **config)
+
+
+def load(path):
+    with open(path) as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    if not entries or "game" not in entries[0]: raise ValueError(f"{path} is not a session log")
+    return entries[0], entries[1:]
+
+
+def game_module(game):
+    folder, module = game_dir(game), GAMES[game][1]
+    if folder not in sys.path: sys.path.insert(0, folder)
+    return importlib.import_module(module)
+
+
+class ReplayResult:
+    def __init__(self, header, inputs, checks, mismatches):
+        self.header, self.inputs, self.checks, self.mismatches = header, inputs, checks, mismatches
+
+    @property
+    def ok(self): return not self.mismatches
+
+    def report(self):
+        lines = [f"{self.header['game']} seed {self.header['seed']}: {self.inputs} inputs, {self.checks} checkpoints"]
+        for index, field, recorded, replayed in self.mismatches[:20]:
+            lines.append(f"  checkpoint {index}: {field} recorded {recorded!r}, replayed {replayed!r}")
+        lines.append("MATCH" if self.ok else f"MISMATCH ({len(self.mismatches)} fields)")
+        return "\n".join(lines)
+
+
+def replay(path, stop_at_first=False):
+    header, entries = load(path)
+    session = game_module(header["game"]).replay_session(header)
+    ops = type(session).INPUTS
+    inputs = checks = 0
+    mismatches = []
+    for entry in entries:
+        if "op" in entry:
+            if entry["op"] not in ops:
+                raise ReplayError(f"{path}: {entry['op']!r} is not an input of {type(session).__name__} "
+                                  f"(game {header['game']!r}); expected one of {', '.join(sorted(ops))}")
+            getattr(session, entry["op"])(*entry["args"])
+            inputs += 1
+            continue
+        state = session.checkpoint()
+        for field, recorded in entry["check"].items():
+            if state.get(field) != recorded:
+                mismatches.append((checks, field, recorded, state.get(field)))
+        checks += 1
+        if mismatches and stop_at_first: break
+    return ReplayResult(header, inputs, checks, mismatches)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Replay recorded game sessions headlessly and check every round")
+    ap.add_argument("logs", nargs="+")
+    args = ap.parse_args()
+    failed = 0
+    for path in args.logs:
+        t0 = time.perf_counter()
+        try: result = replay(path)
+        except ReplayError as e:
+            print(f"{path}\nMISMATCH: {e}")
+            failed += 1
+            continue
+        print(f"{path}\n{result.report()} ({time.perf_counter()-t0:.3f}s)")
+        failed += not result.ok
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__": main()
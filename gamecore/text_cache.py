@@ -0,0 +1,49 @@
+"""
+Shared LRU cache of rendered text surfaces.
+
+Font rasterisation is the most expensive thing the games do per frame, and
+almost every label (credits, bets, symbol names, legends) is the same from
+one frame to the next.  TEXT.render(font, text, antialias, color) returns the
+surface FONT.render would, reusing it while the key is hot.
+
+Cached surfaces are shared: copy one before changing its alpha or pixels.
+"""
+
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 1024
+
+
+class TextCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._surfaces = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        key = (font, text, antialias, tuple(color), background and tuple(background))
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color, background)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self): return len(self._surfaces)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'size': len(self._surfaces), 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'hit_rate': self.hits/lookups if lookups else 0.0}
+
+
+TEXT = TextCache()
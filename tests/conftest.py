@@ -0,0 +1,7 @@
+"""The game modules import each other by name from their own folders, as the scripts do."""
+
+import os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in (ROOT, os.path.join(ROOT, "Baccarat"), os.path.join(ROOT, "SLOTS")):
+    if folder not in sys.path: sys.path.insert(0, folder)
@@ -0,0 +1,44 @@
+"""backtest: a flat bet earns the exact edge, and Martingale busts exactly when it cannot cover the stake."""
+
+import numpy as np
+import pytest
+
+from backtest import FlatBet, Martingale, backtest
+from exact_edge import exact_probabilities, full_shoe
+from paytable import PAYOUTS
+from rules import BANKER, PLAYER, STANDARD
+
+
+def flat_edge(area):
+    """Expected result per unit per hand; Player and Banker lose on a Tie, as backtest settles them."""
+    probs = exact_probabilities(full_shoe(8))
+    if area == BANKER:
+        win = sum(float(p)*pay for p, pay in zip(probs['Banker wins'], STANDARD.banker_pays))
+        return win - (1 - float(probs['Banker']))
+    return float(probs['Player'])*PAYOUTS['Player'] - (1 - float(probs['Player']))
+
+
+@pytest.mark.parametrize("area", [BANKER, PLAYER])
+def test_flat_bet_earns_the_exact_edge(area):
+    unit, players, hands = 5, 4000, 400
+    result = backtest(FlatBet(unit, area), players, hands, bankroll=10**6, seed=area)
+    per_hand = (result.final - 10**6)/hands/unit
+    assert result.risk_of_ruin() == 0
+    assert per_hand.mean() == pytest.approx(flat_edge(area), abs=4*per_hand.std()/players**0.5)
+
+
+def test_martingale_busts_exactly_when_the_stake_exceeds_the_bankroll():
+    unit, hands = 5, 300
+    result = backtest(Martingale(unit), players=500, hands=hands, bankroll=155, seed=9, keep_paths=500)
+    assert 0 < result.risk_of_ruin() < 1
+    for path, bust in zip(result.paths, result.busted_at):
+        stake = unit
+        for h in range(hands):
+            if stake > path[h]:
+                assert bust == h and (path[h:] == path[h]).all()   # out at once, and the bankroll stays put
+                break
+            assert path[h+1] in (path[h] + stake, path[h] - stake)
+            stake = unit if path[h+1] > path[h] else min(2*stake, Martingale(unit).limit)
+        else:
+            assert bust == -1
+    assert np.all(result.final >= 0)
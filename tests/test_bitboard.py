@@ -0,0 +1,72 @@
+"""Bitboard cluster detection against a plain breadth-first search."""
+
+import random
+from collections import deque
+
+from bitboard import Layout
+
+SIZES = [(1, 1), (1, 6), (6, 1), (5, 5), (7, 12), (13, 3), (32, 32), (64, 64)]
+
+
+def bfs_clusters(grid, min_cluster):
+    """The old scan_clusters: one BFS per unvisited tile, None cells skipped."""
+    rows, cols = len(grid), len(grid[0])
+    seen = [[False]*cols for _ in range(rows)]
+    clusters = []
+    for r in range(rows):
+        for c in range(cols):
+            if grid[r][c] is None or seen[r][c]: continue
+            q = deque([(r, c)])
+            seen[r][c] = True
+            blob = []
+            while q:
+                rr, cc = q.popleft()
+                blob.append((rr, cc))
+                for nr, nc in ((rr+1, cc), (rr-1, cc), (rr, cc+1), (rr, cc-1)):
+                    if 0 <= nr < rows and 0 <= nc < cols and not seen[nr][nc] and grid[nr][nc] == grid[r][c]:
+                        seen[nr][nc] = True
+                        q.append((nr, nc))
+            if len(blob) >= min_cluster: clusters.append(blob)
+    return clusters
+
+
+def random_grid(rng, rows, cols, symbols, holes):
+    return [[None if rng.random() < holes else rng.randrange(symbols) for _ in range(cols)] for _ in range(rows)]
+
+
+def as_sets(clusters):
+    return sorted(sorted(blob) for blob in clusters)
+
+
+def test_clusters_match_bfs():
+    rng = random.Random(7)
+    for rows, cols in SIZES:
+        for lanes in (4, 19):                   # 19 lanes at 64x64 takes the union-find path
+            for min_cluster in (2, 3, 5):
+                layout = Layout(rows, cols, min_cluster, lanes)
+                for holes in (0.0, 0.2):
+                    for _ in range(3 if rows*cols > 1000 else 20):
+                        grid = random_grid(rng, rows, cols, 4, holes)
+                        board = layout.pack(grid, {s: s for s in range(lanes)})
+                        expected = as_sets(bfs_clusters(grid, min_cluster))
+                        assert as_sets(layout.clusters(board)) == expected
+                        popped = layout.fold(layout.popped(board))
+                        assert sorted(layout.positions(popped)) == sorted(p for blob in expected for p in blob)
+
+
+def test_collapse_matches_falling_columns():
+    rng = random.Random(8)
+    for rows, cols in SIZES:
+        layout = Layout(rows, cols, 3, 19)
+        for _ in range(5):
+            grid = random_grid(rng, rows, cols, 6, 0.0)
+            popped = [(r, c) for r in range(rows) for c in range(cols) if rng.random() < 0.3]
+            cells = 0
+            for r, c in popped: cells |= layout.bits[r][c]
+            board = layout.collapse(layout.pack(grid, {s: s for s in range(6)}), cells)
+            for r, c in popped: grid[r][c] = None
+            for c in range(cols):              # let the column fall: holes on top
+                stack = [grid[r][c] for r in range(rows) if grid[r][c] is not None]
+                for r in range(rows):
+                    grid[r][c] = None if r < rows - len(stack) else stack[r - (rows - len(stack))]
+            assert board == layout.pack(grid, {s: s for s in range(6)})
@@ -0,0 +1,24 @@
+"""ClusterTracker's incremental rescans against a full scan of the grid."""
+
+import random
+
+from cascade import (LANES, ClusterTracker, make_grid, scan_clusters, pop_clusters, collapse_columns,
+                     fill_empty, layout)
+
+
+def test_tracker_matches_full_rescan():
+    rng = random.Random(9)
+    for rows, cols in ((5, 5), (1, 8), (7, 12), (16, 16), (64, 64)):
+        for _ in range(30 if rows*cols < 1000 else 3):
+            grid = make_grid(rng, rows, cols)
+            tracker = ClusterTracker(grid)
+            clusters = tracker.scan()
+            while True:
+                assert sorted(map(sorted, clusters)) == sorted(map(sorted, scan_clusters(grid)))
+                assert tracker.board == layout(rows, cols).pack(grid, LANES)
+                if not clusters: break
+                tracker.pop(pop_clusters(grid, clusters))
+                collapse_columns(grid)
+                fill_empty(grid, rng)
+                tracker.fill(grid)
+                clusters = tracker.scan()
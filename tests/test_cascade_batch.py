@@ -0,0 +1,70 @@
+"""cascade_batch grid by grid against cascade.py, and its spins against cascade_sim in distribution."""
+
+import math, random
+
+import numpy as np
+import pytest
+
+import cascade_batch
+import cascade_sim
+from cascade import NEIGHBOR_BIAS, SYMBOLS, collapse_columns, scan_clusters
+from cascade_batch import EMPTY, cluster_mask, collapse, fill, label, make_grids
+
+SIZES = ((5, 5), (1, 9), (9, 1), (7, 12), (16, 16))
+
+
+def as_grid(g):
+    return [[None if s == EMPTY else SYMBOLS[s] for s in row] for row in g]
+
+
+@pytest.mark.parametrize("rows, cols", SIZES)
+def test_clusters_match_scan_clusters(rows, cols):
+    grids = make_grids(200, np.random.default_rng(rows*cols), rows, cols)
+    mask, labels = cluster_mask(grids), label(grids)
+    for g, m, lab in zip(grids, mask, labels):
+        clusters = scan_clusters(as_grid(g))
+        assert set(zip(*np.nonzero(m))) == {cell for blob in clusters for cell in blob}
+        for blob in clusters:   # one label per blob, and no cell outside it shares it
+            (blob_label,) = {lab[r, c] for r, c in blob}
+            assert (lab == blob_label).sum() == len(blob)
+
+
+@pytest.mark.parametrize("rows, cols", SIZES)
+def test_collapse_and_fill_match_cascade(rows, cols):
+    rng = np.random.default_rng(rows + cols)
+    grids = make_grids(200, rng, rows, cols)
+    grids[rng.random(grids.shape) < 0.3] = EMPTY
+    fallen = collapse(grids)
+    for g, f in zip(grids, fallen):
+        expected = as_grid(g)
+        collapse_columns(expected)
+        assert as_grid(f) == expected
+    standing = fallen != EMPTY
+    filled = fill(fallen.copy(), rng)
+    assert (filled != EMPTY).all() and (filled[standing] == fallen[standing]).all()
+    if cols == 1: return
+    # a refilled tile copies the tile to its left NEIGHBOR_BIAS of the time, or draws it again by chance
+    refilled = ~standing[:, :, 1:]
+    same = (filled[:, :, 1:] == filled[:, :, :-1])[refilled].mean()
+    expected = NEIGHBOR_BIAS + (1 - NEIGHBOR_BIAS)/len(SYMBOLS)
+    assert abs(same - expected) < 5*math.sqrt(expected*(1-expected)/refilled.sum()), (same, expected)
+
+
+def histogram_mean_se(counts):
+    counts = np.asarray(counts, dtype=float)
+    values = np.arange(counts.size)
+    n = counts.sum()
+    mean = counts @ values / n
+    return mean, math.sqrt((counts @ (values - mean)**2 / n) / n)
+
+
+@pytest.mark.parametrize("rows, cols, batch_spins, exact_spins", [(5, 5, 200_000, 40_000), (8, 8, 40_000, 8_000)])
+def test_batch_matches_the_exact_engine_in_distribution(rows, cols, batch_spins, exact_spins):
+    fast = cascade_batch.simulate(batch_spins, np.random.default_rng(17), 8192, rows, cols)
+    exact = cascade_sim.simulate(exact_spins, random.Random(17), rows, cols)
+    (m1, se1), (m2, se2) = histogram_mean_se(fast.popped), histogram_mean_se(exact.popped)
+    assert abs(m1 - m2) < 5*math.hypot(se1, se2), (m1, m2)
+    for d in range(4):   # share of spins that cascaded d times
+        p, q = fast.depth[d]/fast.spins, exact.depth[d]/exact.spins
+        se = math.sqrt(q*(1-q)/exact.spins + p*(1-p)/fast.spins)
+        assert abs(p - q) < 5*se + 1e-9, (d, p, q)
@@ -0,0 +1,32 @@
+"""resolve_spin against cascade.play_spin, spin for spin on the same RNG."""
+
+import random
+
+from cascade import play_spin
+from cascade_sim import CascadeTally, resolve_spin, simulate
+
+
+def test_resolve_spin_matches_play_spin():
+    for seed in range(200):
+        a, b = random.Random(seed), random.Random(seed)
+        for _ in range(50):
+            popped, cascades, _ = play_spin(1.0, a)
+            assert resolve_spin(b) == (popped, cascades)
+        assert a.getstate() == b.getstate()
+
+
+def test_tally_counts_every_spin():
+    rng = random.Random(1)
+    spins = [play_spin(1.0, rng)[:2] for _ in range(500)]
+    tally = simulate(500, random.Random(1))
+    assert tally.spins == 500 and tally.tiles() == sum(p for p, _ in spins)
+    assert tally + CascadeTally() == tally
+
+
+def test_resolve_spin_matches_play_spin_on_other_grids():
+    for rows, cols in ((6, 7), (8, 8), (3, 12)):
+        a, b = random.Random(rows*cols), random.Random(rows*cols)
+        for _ in range(100):
+            popped, cascades, _ = play_spin(1.0, a, rows, cols)
+            assert resolve_spin(b, rows, cols) == (popped, cascades)
+        assert a.getstate() == b.getstate()
@@ -0,0 +1,33 @@
+"""exact_edge: the published eight-deck figures, and the cache behind exact_probabilities."""
+
+from fractions import Fraction
+
+import pytest
+
+from exact_edge import _exact, exact_probabilities, full_shoe
+
+
+def test_eight_deck_probabilities():
+    probs = exact_probabilities(full_shoe(8))
+    for event, expected in (('Banker', 0.458597), ('Player', 0.446247), ('Tie', 0.095156)):
+        assert isinstance(probs[event], Fraction) and float(probs[event]) == pytest.approx(expected, abs=5e-7)
+    assert probs['Banker'] + probs['Player'] + probs['Tie'] == 1
+    assert sum(probs['Banker wins']) == probs['Banker']
+    assert probs['Player Pair'] == probs['Banker Pair']
+
+
+def test_repeated_composition_hits_the_cache():
+    _exact.cache_clear()
+    shoe = list(full_shoe(8))
+    shoe[0] -= 1                                  # one card out, so the composition is a fresh one
+    first = exact_probabilities(shoe)
+    first['Banker'] = None                        # callers get a copy; the cached entry stays intact
+    again = exact_probabilities(tuple(shoe))
+    info = _exact.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert again['Banker'] == exact_probabilities(shoe)['Banker'] != exact_probabilities(full_shoe(8))['Banker']
+
+
+def test_bad_compositions_are_refused():
+    with pytest.raises(ValueError): exact_probabilities((8,)*51)
+    with pytest.raises(ValueError): exact_probabilities((0,)*50 + (2, 3))
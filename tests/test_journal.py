@@ -0,0 +1,97 @@
+"""Journal recovery: what a reopened journal keeps, cuts off and reports."""
+
+import io, os, struct, zlib
+
+import pytest
+
+from gamecore.journal import HEADER, RECORD, ROUND, Journal
+
+
+def write_rounds(path, n, game="cascade"):
+    journal = Journal(game, path, group=8)
+    for i in range(n): journal.round(1.0, 2.0*(i % 3), 100.0 + i)
+    journal.close()
+    return HEADER.size + n*RECORD.size
+
+
+def record_at(i): return HEADER.size + i*RECORD.size
+
+
+def patch(path, offset, data):
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        f.write(data)
+
+
+def reopen(path, game="cascade"):
+    journal = Journal(game, path)
+    journal.close()
+    return journal
+
+
+def test_clean_journal_reopens_whole(tmp_path):
+    path = str(tmp_path / "j.journal")
+    size = write_rounds(path, 20)
+    journal = reopen(path)
+    assert (journal.seq, journal.dropped, journal.last.credits) == (20, 0, 119.0)
+    assert (journal.wagered, journal.paid) == (20.0, sum(2.0*(i % 3) for i in range(20)))
+    assert os.path.getsize(path) == size and not os.path.exists(journal.bad_path)
+
+
+def test_torn_tail_is_cut_and_kept(tmp_path):
+    path = str(tmp_path / "j.journal")
+    size = write_rounds(path, 20)
+    with open(path, "r+b") as f: f.truncate(size - 10)     # the last write only half made it
+    journal = reopen(path)
+    assert (journal.seq, journal.dropped, journal.last.credits) == (19, RECORD.size - 10, 118.0)
+    assert os.path.getsize(path) == record_at(19)
+    assert os.path.getsize(journal.bad_path) == RECORD.size - 10
+
+
+def test_crc_mismatch_drops_everything_after_it(tmp_path):
+    path = str(tmp_path / "j.journal")
+    size = write_rounds(path, 20)
+    with open(path, "rb") as f: original = f.read()
+    patch(path, record_at(7) + 30, b"\xff")                 # a flipped byte in record 7's payout
+    journal = reopen(path)
+    assert (journal.seq, journal.dropped) == (7, size - record_at(7))
+    with open(journal.bad_path, "rb") as f: bad = f.read()
+    assert bad[RECORD.size:] == original[record_at(8):]     # the good records behind it are kept
+
+
+def test_sequence_gap_stops_the_scan(tmp_path):
+    path = str(tmp_path / "j.journal")
+    size = write_rounds(path, 20)
+    body = RECORD.pack(12, 0.0, ROUND, 0, 1.0, 0.0, 50.0, b"", 0)[:-4]   # seq 12 where 10 belongs
+    patch(path, record_at(10), body + struct.pack("<I", zlib.crc32(body)))
+    journal = reopen(path)
+    assert (journal.seq, journal.dropped, journal.last.credits) == (10, size - record_at(10), 109.0)
+
+
+def test_appending_after_recovery_continues_the_sequence(tmp_path):
+    path = str(tmp_path / "j.journal")
+    write_rounds(path, 20)
+    patch(path, record_at(15), b"\0"*8)
+    journal = Journal("cascade", path)
+    journal.round(5.0, 0.0, 1.0)
+    journal.close()
+    again = reopen(path)
+    assert (again.seq, again.dropped, again.last.credits) == (16, 0, 1.0)
+
+
+def test_another_games_journal_is_refused_untouched(tmp_path):
+    path = str(tmp_path / "j.journal")
+    size = write_rounds(path, 5, game="paylines")
+    with pytest.raises(ValueError, match="paylines"): Journal("cascade", path)
+    assert os.path.getsize(path) == size and not os.path.exists(path + ".bad")
+
+
+def test_warn_dropped(tmp_path):
+    path = str(tmp_path / "j.journal")
+    size = write_rounds(path, 4)
+    out = io.StringIO()
+    reopen(path).warn_dropped(out)
+    assert out.getvalue() == ""
+    with open(path, "r+b") as f: f.truncate(size - 1)
+    reopen(path).warn_dropped(out)
+    assert f"{RECORD.size - 1} bytes after record 3" in out.getvalue() and ".bad" in out.getvalue()
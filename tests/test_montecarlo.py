@@ -0,0 +1,46 @@
+"""The lock-step NumPy dealer against baccarat_round, shoe by shoe."""
+
+import numpy as np
+
+from cards import hand_total, is_perfect_pair, is_player_pair, is_banker_pair
+from montecarlo import NO_HAND, shuffled_shoes, deal_outcomes, deal_shoes
+from rules import VARIANTS, OUTCOME_NAMES, baccarat_round, banker_class, winner
+
+
+def dealt(shoe, rules):
+    """baccarat_round down the shoe to the reshuffle point, as the table deals it."""
+    deck = bytearray(shoe[::-1])   # montecarlo deals from the front, baccarat_round pops the end
+    reshuffle = len(deck)//2
+    while len(deck) >= reshuffle:
+        yield baccarat_round(deck, rules)
+
+
+def test_outcomes_match_baccarat_round():
+    rng = np.random.default_rng(3)
+    for rules in VARIANTS.values():
+        shoes = shuffled_shoes(rng, 16, decks=2)
+        winners, classes, hands = deal_outcomes(shoes, rules)
+        for n, shoe in enumerate(shoes):
+            rounds = list(dealt(shoe.tobytes(), rules))
+            assert hands[n] == len(rounds)
+            assert [OUTCOME_NAMES[w] for w in winners[n, :hands[n]]] == [winner(p, b) for p, b in rounds]
+            assert list(classes[n, :hands[n]]) == [banker_class(hand_total(b), len(b)) for p, b in rounds]
+            assert (winners[n, hands[n]:] == NO_HAND).all()
+
+
+def test_tally_matches_baccarat_round():
+    shoes = shuffled_shoes(np.random.default_rng(4), 32, decks=8)
+    tally = deal_shoes(shoes)
+    counts = dict.fromkeys(tally.counts, 0)
+    hands = 0
+    for shoe in shoes:
+        for p, b in dealt(shoe.tobytes(), VARIANTS['standard']):
+            hands += 1
+            counts[winner(p, b)] += 1
+            counts['Player Pair'] += is_player_pair(p)
+            counts['Banker Pair'] += is_banker_pair(b)
+            counts['Any Pair'] += is_player_pair(p) or is_banker_pair(b)
+            counts['Perfect Pair'] += is_perfect_pair(p) or is_perfect_pair(b)
+            counts['Double Perfect Pair'] += is_perfect_pair(p) and is_perfect_pair(b)
+    assert tally.hands == hands
+    assert tally.counts == counts
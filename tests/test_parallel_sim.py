@@ -0,0 +1,30 @@
+"""parallel_sim: reproducible seed streams, and the two engines against each other."""
+
+import math
+
+from parallel_sim import run_worker, simulate, split_hands, worker_seeds
+
+
+def test_same_seed_and_workers_give_identical_tallies():
+    first = simulate(30_000, workers=2, seed=11)
+    assert simulate(30_000, workers=2, seed=11) == first
+    assert simulate(30_000, workers=2, seed=12) != first
+    # the pool's scheduling order does not matter: the workers' parts, dealt here one by one, add up the same
+    parts = [run_worker(s, q) for s, q in zip(worker_seeds(11, 2), split_hands(30_000, 2))]
+    assert parts[0] + parts[1] == first and first.hands >= 30_000
+
+
+def test_python_engine_is_reproducible():
+    seed = worker_seeds(3, 1)[0]
+    assert run_worker(seed, 2_000, engine='python') == run_worker(seed, 2_000, engine='python')
+
+
+def test_numpy_and_python_engines_agree():
+    fast = simulate(400_000, workers=1, seed=21)
+    slow = simulate(100_000, workers=1, seed=21, engine='python')
+    assert slow.hands >= 100_000
+    for event in fast.counts:
+        p, q = fast.counts[event]/fast.hands, slow.counts[event]/slow.hands
+        pooled = (fast.counts[event] + slow.counts[event])/(fast.hands + slow.hands)
+        se = math.sqrt(pooled*(1-pooled)*(1/fast.hands + 1/slow.hands))
+        assert abs(p - q) < 5*se, (event, p, q)
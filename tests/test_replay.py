@@ -0,0 +1,107 @@
+"""Sessions recorded as each game records them, replayed by gamecore.replay."""
+
+import json, os, random
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from gamecore.replay import ReplayError, SessionLog, replay
+from baccarat_table import BaccaratTable, FlatBetTable
+from paytable import BET_AREAS
+from shoe_provider import ShoeProvider
+from tests.test_scripts import load_script
+
+SEED = 1234
+
+
+def test_dropper_ui_session_replays(tmp_path):
+    m = load_script("SLOTS/DROPPER SLOT.py")
+    m.init_display(6, 7)
+    m.rng.seed(SEED)
+    m.grid[:] = m.make_initial_grid()
+    m.log = SessionLog("cascade", SEED, str(tmp_path / "cascade.jsonl"),
+                       credits=m.credits, bet=m.bet, rows=m.ROWS, cols=m.COLS)
+    now = 0
+    for spin in range(12):
+        if spin % 4 == 3:
+            m.bet = min(m.MAX_BET, m.bet + 1)
+            m.log.input('bet_up')
+        m.log.input('spin')    # the SPIN click, as the main loop handles it
+        m.credits -= m.bet
+        m.start_spin()
+        while m.state != m.STATE_IDLE:
+            now += 16
+            m.update_tiles(16)
+            m.step_cascade(now, 16)
+    m.log.close()
+    result = replay(m.log.path)
+    assert result.ok and (result.inputs, result.checks) == (15, 12), result.report()
+
+
+def test_noname_ui_session_replays(tmp_path):
+    m = load_script("SLOTS/NONAME SLOTS.py")
+    m.rng.seed(SEED)
+    m.credits, m.wager = 100, 10
+    m.log = SessionLog("paylines", SEED, str(tmp_path / "paylines.jsonl"), credits=m.credits, wager=m.wager)
+    for spin in range(12):
+        if m.credits < m.wager:
+            m.credits += 100
+            m.log.input('buy', 100)
+        if spin == 5:
+            m.wager = min(m.wager + 1, m.WAGER_MAX)
+            m.log.input('wager_up')
+        m.log.input('spin')
+        m.credits -= m.wager
+        m.spinning, m.spin_frames = True, 0
+        while m.spinning: m.animate_spin()
+        m.calculate_payout()
+    m.log.close()
+    result = replay(m.log.path)
+    assert result.ok and result.checks == 12, result.report()
+
+
+def record_table(table, game, path, rounds, rng):
+    table.log = SessionLog(game, SEED, path, **table.session_config())
+    for _ in range(rounds):
+        if isinstance(table, FlatBetTable):
+            table.choose(rng.choice(('Player', 'Banker', 'Tie')))
+            if rng.random() < 0.3: table.add_side_bet(rng.choice(BET_AREAS[3:]))
+            table.deal()
+            continue
+        table.select_chip(rng.choice((1, 5, 25)))
+        for area in rng.sample(BET_AREAS, 2): table.place_bet(area)
+        if rng.random() < 0.1: table.clear_bets()
+        if table.deal(): table.settle()
+    table.log.close()
+    return path
+
+
+@pytest.mark.parametrize("cls, game", [(BaccaratTable, "baccarat"), (FlatBetTable, "baccarat-simulator")])
+def test_table_session_replays(tmp_path, cls, game):
+    shoes = ShoeProvider(8, 0.5, 0, rng=random.Random(SEED), background=False)
+    table = cls(decks=8, shoes=shoes)
+    path = record_table(table, game, str(tmp_path / f"{game}.jsonl"), 150, random.Random(7))
+    result = replay(path)
+    assert result.ok and result.checks == table.rounds > 50, result.report()
+
+
+def test_replay_reports_a_changed_round(tmp_path):
+    shoes = ShoeProvider(8, rng=random.Random(SEED), background=False)
+    path = record_table(FlatBetTable(shoes=shoes), "baccarat-simulator", str(tmp_path / "s.jsonl"), 20,
+                        random.Random(7))
+    with open(path) as f: lines = f.readlines()
+    entry = json.loads(lines[-1])
+    entry["check"]["credits"] += 1
+    lines[-1] = json.dumps(entry) + "\n"
+    with open(path, "w") as f: f.writelines(lines)
+    result = replay(path)
+    assert result.mismatches == [(19, 'credits', entry["check"]["credits"], entry["check"]["credits"] - 1)]
+
+
+def test_replay_refuses_an_unknown_op(tmp_path):
+    log = SessionLog("cascade", SEED, str(tmp_path / "c.jsonl"), credits=100.0, bet=5.0)
+    log.input('__init__')
+    log.close()
+    with pytest.raises(ReplayError): replay(log.path)
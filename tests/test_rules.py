@@ -0,0 +1,74 @@
+"""rules.RuleSet tables against the original string-card drawing rules."""
+
+import random
+
+from cards import CARD_NAMES, build_shoe
+from rules import STANDARD, NO_THIRD, baccarat_round, winner
+
+
+# --- the rules as Baccarat 1.1 first shipped them, on "10H"-style strings ---
+def card_value(c): r = c[:-1]; return 0 if r in ["10","J","Q","K"] else 1 if r == "A" else int(r)
+def hand_total(h): return sum(card_value(c) for c in h) % 10
+
+def string_round(deck):
+    player = [deck.pop(), deck.pop()]
+    banker = [deck.pop(), deck.pop()]
+    pt, bt = hand_total(player), hand_total(banker)
+    if pt >= 8 or bt >= 8: return player, banker
+    player_third = None
+    if pt <= 5: player_third = deck.pop(); player.append(player_third)
+    if player_third is None:
+        if bt <= 5: banker.append(deck.pop())
+    else:
+        pv = card_value(player_third)
+        if bt <= 2: banker.append(deck.pop())
+        elif bt == 3 and pv != 8: banker.append(deck.pop())
+        elif bt == 4 and pv in [2,3,4,5,6,7]: banker.append(deck.pop())
+        elif bt == 5 and pv in [4,5,6,7]: banker.append(deck.pop())
+        elif bt == 6 and pv in [6,7]: banker.append(deck.pop())
+    return player, banker
+
+def string_winner(player, banker):
+    pt, bt = hand_total(player), hand_total(banker)
+    return "Player" if pt > bt else "Banker" if bt > pt else "Tie"
+
+
+def test_draw_tables_match_the_tableau():
+    for pt in range(10):
+        assert STANDARD.player_draw[pt] == (pt <= 5)
+    for bt in range(10):
+        assert STANDARD.banker_draw[bt*11 + NO_THIRD] == (bt <= 5)
+        for pv in range(10):
+            draws = (bt <= 2 or (bt == 3 and pv != 8) or (bt == 4 and 2 <= pv <= 7)
+                     or (bt == 5 and 4 <= pv <= 7) or (bt == 6 and pv in (6, 7)))
+            assert STANDARD.banker_draw[bt*11 + pv] == draws, (bt, pv)
+
+
+def test_every_opening_deals_as_the_string_rules():
+    # one card of each value, every four-card opening, then every pair of third cards
+    by_value = {}
+    for code, name in enumerate(CARD_NAMES): by_value.setdefault(card_value(name), code)
+    codes = [by_value[v] for v in range(10)]
+    for p0 in codes:
+        for p1 in codes:
+            for b0 in codes:
+                for b1 in codes:
+                    for c4 in (codes[0], codes[4], codes[7], codes[8]):
+                        for c5 in (codes[2], codes[6], codes[9]):
+                            shoe = bytearray([c5, c4, b1, b0, p1, p0])   # dealt from the end
+                            expected = string_round([CARD_NAMES[c] for c in shoe])
+                            player, banker = baccarat_round(bytearray(shoe))
+                            assert ([CARD_NAMES[c] for c in player], [CARD_NAMES[c] for c in banker]) == expected
+
+
+def test_shoes_deal_the_same_hands():
+    rng = random.Random(11)
+    for _ in range(20):
+        shoe = build_shoe(8)
+        rng.shuffle(shoe)
+        strings = [CARD_NAMES[c] for c in shoe]
+        while len(shoe) > 6:
+            player, banker = baccarat_round(shoe)
+            p, b = string_round(strings)
+            assert [CARD_NAMES[c] for c in player] == p and [CARD_NAMES[c] for c in banker] == b
+            assert winner(player, banker) == string_winner(p, b)
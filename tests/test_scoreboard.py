@@ -0,0 +1,63 @@
+"""The Baccarat roads laid out from fixed result sequences."""
+
+from rules import PLAYER as P, BANKER as B, TIE as T
+from scoreboard import BLUE, RED, Road, Scoreboard, code_winner
+
+
+def layout(road):
+    """{(visible column, row): mark} of a road."""
+    return {(x, y): cell[0] if isinstance(cell, list) else cell for x, y, cell in road.visible()}
+
+
+def play(board, results):
+    for r in results: board.record(r)
+    return board
+
+
+def test_big_road_and_derived_roads():
+    board = play(Scoreboard(), [B, B, P, P, P, B, P, B, B])
+    assert layout(board.big_road) == {(0, 0): B, (0, 1): B, (1, 0): P, (1, 1): P, (1, 2): P,
+                                      (2, 0): B, (3, 0): P, (4, 0): B, (4, 1): B}
+    assert layout(board.derived['Big Eye Boy']) == {(0, 0): RED, (1, 0): BLUE, (1, 1): BLUE, (1, 2): BLUE,
+                                                    (2, 0): RED, (3, 0): BLUE}
+    assert layout(board.derived['Small Road']) == {(0, 0): BLUE, (0, 1): BLUE, (0, 2): BLUE}
+    assert layout(board.derived['Cockroach Pig']) == {(0, 0): BLUE, (1, 0): RED}
+    assert (board.counts, board.longest, board.streak_side, board.streak) == ([4, 5, 0], [3, 2], B, 2)
+
+
+def test_ties_go_on_the_last_cell():
+    board = play(Scoreboard(), [T, B, T, T, P])
+    assert board.big_road.cell(0, 0) == [B, 3]   # the tie before the first hand waits for it
+    assert board.big_road.cell(1, 0) == [P, 0]
+    assert [code_winner(c) for c in board.results] == [T, B, T, T, P]
+    assert layout(board.bead) == {(0, 0): T, (0, 1): B, (0, 2): T, (0, 3): T, (0, 4): P}
+
+
+def test_dragon_tail():
+    board = play(Scoreboard(), [B]*8 + [P]*7 + [B])
+    assert layout(board.big_road) == {
+        **{(0, y): B for y in range(6)}, (1, 5): B, (2, 5): B,      # eight Banker: down, then right along the bottom
+        **{(1, y): P for y in range(5)}, (2, 4): P, (3, 4): P,      # seven Player turn right above that tail
+        (2, 0): B,                                                 # the next run still starts its own column
+    }
+    assert board.longest == [7, 8] and list(board.column_lengths) == [8, 7, 1]
+
+
+def test_scrolling_past_the_last_column():
+    road = Road(rows=6, cols=6)                 # scrolls by two columns
+    for i in range(7): road.add(i % 2)
+    assert road.take_changes() == (True, [])    # the scroll repaints everything
+    assert road.offset == 2 and min(road.columns) == 2
+    assert layout(road) == {(x, 0): (x+2) % 2 for x in range(5)}
+    road.add(1)
+    assert road.take_changes() == (False, [(5, 0)])
+    road.tie()
+    assert road.cell(5, 0) == [1, 1] and road.take_changes() == (False, [(5, 0)])
+
+
+def test_derived_roads_scroll_too():
+    board = play(Scoreboard(road_cols=4, derived_cols=3), [P, B]*20)
+    assert all(len(road.columns) <= road.cols for road in board.roads().values())
+    big = board.big_road
+    assert layout(big) == {(x, 0): (big.offset + x) % 2 for x in range(len(big.columns))}
+    assert set(layout(board.derived['Big Eye Boy']).values()) == {RED}   # a ping-pong shoe repeats itself
@@ -0,0 +1,26 @@
+"""The game scripts, loaded as modules the way the benchmarks load them."""
+
+import importlib.util, os
+
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS = ("Baccarat/Baccarat.py", "Baccarat/Baccarat 1.0.py", "Baccarat/Baccarat 1.1.py",
+           "SLOTS/DROPPER SLOT.py", "SLOTS/NONAME SLOTS.py")
+
+
+def load_script(path):
+    """Import a game script by path without running its main loop."""
+    spec = importlib.util.spec_from_file_location(os.path.basename(path)[:-3].replace(" ", "_"),
+                                                  os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_import_opens_no_window():
+    pygame.quit()
+    for path in SCRIPTS:
+        m = load_script(path)
+        assert callable(m.init_display) and m.screen is None, path
+        assert not pygame.display.get_init(), path
@@ -0,0 +1,26 @@
+"""Batched Settlement against the single-seat settle_bets."""
+
+import random
+
+from baccarat_table import settle_bets
+from cards import build_shoe
+from paytable import PAYOUTS, BET_AREAS
+from rules import VARIANTS, baccarat_round
+from settlement import Settlement, stake_matrix
+
+
+def test_settle_matches_settle_bets():
+    rng = random.Random(5)
+    payouts = [PAYOUTS, dict(PAYOUTS, Tie=9.0, **{'Any Pair': 4.5})]
+    for rules in VARIANTS.values():
+        for table in payouts:
+            seats = Settlement(rules, table)
+            shoe = build_shoe(8)
+            rng.shuffle(shoe)
+            while len(shoe) > 6:
+                player, banker = baccarat_round(shoe, rules)
+                bets = [{area: rng.choice((0, 0, 1, 5, 25, 37, 500)) for area in BET_AREAS} for _ in range(8)]
+                returned = seats.returns(stake_matrix(bets), seats.outcome(player, banker))
+                for seat, stakes in enumerate(bets):
+                    expected = settle_bets(stakes, player, banker, rules, table)
+                    assert dict(zip(BET_AREAS, returned[seat].tolist())) == expected
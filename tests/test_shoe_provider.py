@@ -0,0 +1,27 @@
+"""ShoeProvider: inline by default, and the worker thread stopped by close()."""
+
+import random, threading
+
+from baccarat_table import BaccaratTable, FlatBetTable
+from shoe_provider import ShoeProvider
+
+
+def test_tables_start_no_thread():
+    before = threading.active_count()
+    table, flat = BaccaratTable(), FlatBetTable()
+    table.place_bet('Banker')
+    flat.choose('Player')
+    assert table.deal() and flat.deal() is not None and table.settle() is not None
+    assert table.shoes.ready() and threading.active_count() == before
+
+
+def test_background_deals_the_same_shoes_and_stops_on_close():
+    inline = ShoeProvider(8, burn='value', rng=random.Random(5))
+    worker = ShoeProvider(8, burn='value', rng=random.Random(5), ahead=2, background=True)
+    thread = worker._worker
+    assert thread.is_alive()
+    for _ in range(4):
+        a, b = inline.next_shoe(), worker.next_shoe()
+        assert (a.cards, a.burned, a.shown, a.reshuffle_point) == (b.cards, b.burned, b.shown, b.reshuffle_point)
+    worker.close()
+    assert not thread.is_alive()
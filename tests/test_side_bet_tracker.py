@@ -0,0 +1,37 @@
+"""SideBetTracker updated card by card against a fresh count and exact_edge."""
+
+import random
+
+import pytest
+
+from cards import build_shoe
+from exact_edge import exact_probabilities
+from side_bet_tracker import SideBetTracker
+
+PAIRS = ('Player Pair', 'Banker Pair', 'Any Pair', 'Perfect Pair', 'Double Perfect Pair')
+
+
+def sums(tracker):
+    return [(s.counts, s.s2, s.s4, s.sq) for s in (tracker.cards, tracker.ranks)]
+
+
+def test_removals_match_a_fresh_tracker_and_exact_edge():
+    shoe = build_shoe(8)
+    random.Random(6).shuffle(shoe)
+    tracker = SideBetTracker(shoe)
+    dealt, rest = shoe[:137], shoe[137:]
+    tracker.remove_all(dealt)
+    fresh = SideBetTracker(rest)
+    assert tracker.remaining == fresh.remaining == len(rest)
+    assert sums(tracker) == sums(fresh)
+    assert tracker.probabilities() == fresh.probabilities()
+    exact = exact_probabilities([rest.count(code) for code in range(52)])
+    for event in PAIRS:
+        assert tracker.probabilities()[event] == pytest.approx(float(exact[event]), rel=1e-12), event
+
+
+def test_removing_a_card_that_is_gone():
+    tracker = SideBetTracker([0, 0, 5, 9, 13])
+    tracker.remove_all([0, 0])
+    with pytest.raises(ValueError): tracker.remove(0)
+    assert tracker.remaining == 3 and tracker.probabilities()['Any Pair'] == 0.0
@@ -0,0 +1,111 @@
+"""table_server: bets checked, rounds settled, and stakes refunded when a seat leaves before the deal."""
+
+import asyncio, json, struct
+
+import pytest
+
+from gamecore.journal import REFUND, Journal
+from table_server import Seat, TableService
+
+
+def open_table(service):
+    seat = Seat(0, None)
+    assert service.command(seat, {"op": "join", "table": 0})["ev"] == "joined"
+    service.tables[0].open = True
+    return seat
+
+
+@pytest.mark.parametrize("area, amount", [("Banker", True), ("Banker", -5), ("Banker", 0), ("Banker", 2.5),
+                                          ("Banker", "5"), ("Dragon", 5), (None, 5)])
+def test_bad_stakes_are_refused(area, amount):
+    service = TableService(tables=1, seed=1)
+    seat = open_table(service)
+    assert service.command(seat, {"op": "bet", "area": area, "amount": amount}) == {"ev": "error", "error": "bad bet"}
+    assert seat.stakes is None and seat.credits == 1000 and service.bets == 0
+
+
+def test_bets_need_an_open_table_and_the_credits():
+    service = TableService(tables=2, seed=1)
+    seat = Seat(0, None)
+    assert service.command(seat, {"op": "bet", "area": "Banker", "amount": 5})["error"] == "join a table first"
+    assert service.command(seat, {"op": "join", "table": True})["error"] == "no such table"
+    service.command(seat, {"op": "join", "table": 1})
+    assert service.command(seat, {"op": "bet", "area": "Banker", "amount": 5})["error"] == "betting is closed"
+    service.tables[1].open = True
+    assert service.command(seat, {"op": "bet", "area": "Banker", "amount": 1001})["error"] == "not enough credits"
+    assert service.command(seat, {"op": "bet", "area": "Tie", "amount": 25}) == \
+        {"ev": "bet", "area": "Tie", "amount": 25, "credits": 975}
+    assert service.command(seat, {"op": "join", "table": 0})["error"] == "bets are open on this table"
+
+
+async def session(service, script):
+    """Serve one table on a free port and run script(reader, writer) as a client."""
+    server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+    loop = asyncio.create_task(service.run_table(service.tables[0]))
+    try:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        return await script(reader, writer)
+    finally:
+        loop.cancel()
+        server.close()
+        await server.wait_closed()
+
+
+async def next_event(reader, ev):
+    while True:
+        msg = json.loads(await asyncio.wait_for(reader.readline(), 5))
+        if msg["ev"] == ev: return msg
+
+
+async def until(condition):
+    for _ in range(500):
+        if condition(): return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+async def join_and_bet(reader, writer, amount=25):
+    writer.write(b'{"op": "join", "table": 0}\n')
+    await next_event(reader, "joined")
+    betting = await next_event(reader, "betting")
+    writer.write(json.dumps({"op": "bet", "area": "Banker", "amount": amount}).encode() + b"\n")
+    assert (await next_event(reader, "bet"))["credits"] == 1000 - amount
+    return betting["round"]
+
+
+def test_leaving_before_the_deal_refunds_and_journals(tmp_path):
+    journal = Journal("baccarat-server", str(tmp_path / "server.journal"))
+    service = TableService(tables=1, bet_time=0.5, deal_time=0.1, seed=3, journal=journal)
+
+    async def script(reader, writer):
+        round_ = await join_and_bet(reader, writer)
+        writer.close()                       # gone while betting is still open
+        await until(lambda: service.refunds)
+        return round_
+
+    round_ = asyncio.run(session(service, script))
+    assert service.refunds == 1 and service.rounds == round_ - 1   # the round it bet on was never dealt
+    journal.close()
+    reopened = Journal("baccarat-server", journal.path)
+    reopened.close()
+    entry = reopened.last
+    assert (entry.kind, entry.wager, entry.payout, entry.credits) == (REFUND, 0, 25, 1000)
+    assert struct.unpack_from("<IIQ", entry.detail) == (0, round_, 0)
+
+
+def test_the_deal_settles_and_clears_before_anyone_can_leave():
+    service = TableService(tables=1, bet_time=0.2, deal_time=0.1, seed=4)
+
+    async def script(reader, writer):
+        await join_and_bet(reader, writer, 10)
+        deal = await next_event(reader, "deal")
+        seat = next(iter(service.tables[0].seats.values()))
+        assert seat.stakes is None           # cleared in the same step that settled it
+        writer.close()
+        await until(lambda: not service.tables[0].seats)
+        return deal
+
+    deal = asyncio.run(session(service, script))
+    assert service.refunds == 0 and service.rounds >= 1
+    assert deal["result"] in ("Player", "Banker", "Tie") and len(deal["player"]) >= 2 and len(deal["banker"]) >= 2
+    assert deal["credits"] == 990 + deal["returned"] and deal["returned"] in (0, 10, 19.5)